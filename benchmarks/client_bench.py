@@ -0,0 +1,292 @@
+"""
+  Benchmark suite of the client hot paths.
+
+  The cases cover the circuit serialization, the backend target construction, the decoding of
+  the results of the Qiskit and pytket frontends, the building of the job submissions and the
+  submit-to-result throughput against the local stand-in of the API. The results can be
+  written as JSON and compared with a previous run; the comparison fails if any case is
+  slower than the baseline by more than the tolerance.
+
+  Usage: python benchmarks/client_bench.py [--quick] [--only decode] [--output results.json]
+                                           [--compare baseline.json] [--tolerance 0.2]
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import timeit
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+# pylint: disable=wrong-import-position
+from qiskit import QuantumCircuit  # noqa: E402
+from qiskit.circuit.random import random_circuit  # noqa: E402
+
+from c12_callisto_clients.api.client import Request  # noqa: E402
+from c12_callisto_clients.api.stand_in import StandInServer, DEFAULT_BACKENDS  # noqa: E402
+from c12_callisto_clients.qiskit.c12sim_backend import C12SimBackend  # noqa: E402
+from c12_callisto_clients.qiskit.c12sim_job import C12SimJob  # noqa: E402
+from c12_callisto_clients.pytket.extensions.callisto.backends.callisto import (  # noqa: E402
+    CallistoBackend,
+)
+
+
+# Case: (name, parameters, function returning the seconds of one operation)
+Case = Tuple[str, dict, Callable[[], float]]
+
+
+def _per_call(function: Callable[[], object], repeat: int, min_time: float = 0.2) -> float:
+    """Best time of one call of the function (the number of calls per sample is calibrated)."""
+    number = 1
+    while True:
+        elapsed = timeit.timeit(function, number=number)
+        if elapsed >= min_time or number >= 1_000_000:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+    samples = [elapsed] + timeit.repeat(function, number=number, repeat=repeat - 1)
+    return min(samples) / number
+
+
+def _random_state(n_qubits: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    state = rng.normal(size=2**n_qubits) + 1j * rng.normal(size=2**n_qubits)
+    return state / np.linalg.norm(state)
+
+
+def _json_array(state: np.ndarray) -> List[str]:
+    return [str(value) for value in state.tolist()]
+
+
+class _EncodingRequest(Request):
+    """Request that builds and encodes the bodies without sending them."""
+
+    def do_request(self, url, method, params=None, header=None, **kwargs):
+        self._encode_body(params)
+        return {"job_uuid": "benchmark", "transpiled": params["qasm_str"]}
+
+
+def _backend(request: Request) -> C12SimBackend:
+    properties = DEFAULT_BACKENDS[0]
+    return C12SimBackend(request=request, name=properties["backend_name"], properties=properties)
+
+
+def qasm_cases(quick: bool, repeat: int) -> List[Case]:
+    backend = _backend(Request("token"))
+    cases = []
+    for n_gates in (100, 1000) if quick else (100, 1000, 10000):
+        circuit = random_circuit(10, n_gates // 10, max_operands=2, seed=1)
+
+        def prepare(circuit=circuit):
+            backend._validate_qasm(backend._prepare_qasm_file(circuit))
+
+        cases.append(
+            ("qasm_prepare", {"gates": circuit.size()}, lambda f=prepare: _per_call(f, repeat))
+        )
+    return cases
+
+
+def target_cases(quick: bool, repeat: int) -> List[Case]:
+    cases = []
+    for n_qubits in (5, 20) if quick else (5, 20, 50):
+        properties = {**DEFAULT_BACKENDS[0], "n_qubits": n_qubits}
+        backend = C12SimBackend(
+            request=Request("token"), name=properties["backend_name"], properties=properties
+        )
+        cases.append(
+            (
+                "backend_target",
+                {"qubits": n_qubits},
+                lambda b=backend: _per_call(lambda: b.target, repeat),
+            )
+        )
+    return cases
+
+
+def decode_cases(quick: bool, repeat: int) -> List[Case]:
+    cases = []
+    for n_qubits in (4, 10) if quick else (4, 10, 14, 18):
+        data = _json_array(_random_state(n_qubits))
+        cases.append(
+            (
+                "decode_array",
+                {"qubits": n_qubits},
+                lambda d=data: _per_call(lambda: C12SimJob._convert_json_to_np_array(d), repeat),
+            )
+        )
+    for n_qubits in (4, 6) if quick else (4, 6, 8, 10):
+        state = _random_state(n_qubits)
+        data = [_json_array(row) for row in np.outer(state, state.conj())]
+        cases.append(
+            (
+                "decode_matrix",
+                {"qubits": n_qubits},
+                lambda d=data: _per_call(lambda: C12SimJob._convert_json_to_np_matrix(d), repeat),
+            )
+        )
+    return cases
+
+
+def pytket_cases(quick: bool, repeat: int) -> List[Case]:
+    backend = CallistoBackend("c12sim-iswap", "token")
+    n_qubits = 8
+    state = _random_state(n_qubits)
+    cases = []
+    for shots in (1_000, 100_000) if quick else (1_000, 100_000, 1_000_000):
+        rng = np.random.default_rng(2)
+        outcomes = rng.multinomial(shots, np.abs(state) ** 2)
+        data = {
+            "results": {
+                "counts": {
+                    format(int(index), f"0{n_qubits}b"): int(outcomes[index])
+                    for index in np.flatnonzero(outcomes)
+                },
+                "statevector": _json_array(state),
+                "density_matrix": [_json_array(row) for row in np.outer(state, state.conj())],
+            }
+        }
+        cases.append(
+            (
+                "pytket_convert_result",
+                {"shots": shots, "qubits": n_qubits},
+                lambda d=data: _per_call(lambda: backend._convert_result(d), repeat),
+            )
+        )
+    return cases
+
+
+def submit_cases(quick: bool, repeat: int) -> List[Case]:
+    request = _EncodingRequest("token")
+    qasm = _backend(request)._prepare_qasm_file(random_circuit(10, 100, max_operands=2, seed=1))
+    cases = []
+    for n_qubits in (4, 10) if quick else (4, 10, 14):
+        ini = _random_state(n_qubits)
+        cases.append(
+            (
+                "start_job_ini",
+                {"qubits": n_qubits},
+                lambda i=ini: _per_call(
+                    lambda: request.start_job(qasm, 1024, "counts", "c12sim-iswap", ini=i), repeat
+                ),
+            )
+        )
+    return cases
+
+
+def throughput_cases(quick: bool, repeat: int) -> List[Case]:
+    n_jobs = 10 if quick else 50
+
+    def run(n_qubits: int) -> float:
+        with StandInServer(qubits=n_qubits, seed=3) as server, server.patch_urls():
+            backend = _backend(Request("token"))
+            circuit = QuantumCircuit(2, 2)
+            circuit.h(0)
+            circuit.cx(0, 1)
+            circuit.measure([0, 1], [0, 1])
+
+            best = float("inf")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                jobs = [backend.run(circuit, shots=1024) for _ in range(n_jobs)]
+                for job in jobs:
+                    job.result(wait=0.5)
+                best = min(best, time.perf_counter() - start)
+        return best / n_jobs
+
+    return [
+        ("submit_to_result", {"qubits": n_qubits, "jobs": n_jobs}, lambda q=n_qubits: run(q))
+        for n_qubits in ((2, 10) if quick else (2, 10, 14))
+    ]
+
+
+SUITES = {
+    "qasm": qasm_cases,
+    "target": target_cases,
+    "decode": decode_cases,
+    "pytket": pytket_cases,
+    "submit": submit_cases,
+    "throughput": throughput_cases,
+}
+
+
+def case_key(name: str, params: dict) -> str:
+    """Key of a case in the JSON output, e.g. decode_array[qubits=10]."""
+    return f"{name}[{','.join(f'{key}={value}' for key, value in params.items())}]"
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float) -> List[str]:
+    """
+    Compare the results with a baseline run.
+
+    :param results: results of this run by the case key
+    :param baseline: results of the baseline run by the case key
+    :param tolerance: allowed relative slowdown
+    :return: list of the regressed cases
+    """
+    regressions = []
+    print(f"\n{'case':<48}{'baseline [us]':>15}{'now [us]':>12}{'ratio':>8}")
+    for key, result in results.items():
+        if key not in baseline:
+            continue
+        ratio = result["seconds"] / baseline[key]["seconds"]
+        flag = " REGRESSION" if ratio > 1 + tolerance else ""
+        print(
+            f"{key:<48}{baseline[key]['seconds'] * 1e6:>15.1f}"
+            f"{result['seconds'] * 1e6:>12.1f}{ratio:>8.2f}{flag}"
+        )
+        if flag:
+            regressions.append(key)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="smaller sizes (for CI)")
+    parser.add_argument("--only", nargs="*", choices=sorted(SUITES), help="suites to run")
+    parser.add_argument("--repeat", type=int, default=5, help="repetitions of each measurement")
+    parser.add_argument("--output", help="JSON file the results are written to")
+    parser.add_argument("--compare", help="JSON file of a baseline run")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.2, help="allowed relative slowdown in the comparison"
+    )
+    args = parser.parse_args()
+
+    results = {}
+    print(f"{'case':<48}{'time [us]':>15}")
+    for suite in args.only or SUITES:
+        for name, params, measure in SUITES[suite](args.quick, args.repeat):
+            key = case_key(name, params)
+            results[key] = {"suite": suite, "name": name, "params": params, "seconds": measure()}
+            print(f"{key:<48}{results[key]['seconds'] * 1e6:>15.1f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "created": datetime.now(timezone.utc).isoformat(),
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "results": results,
+                },
+                file,
+                indent=2,
+            )
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"FAILED: {len(regressions)} regressions ({', '.join(regressions)})")
+            sys.exit(1)
+        print("OK: no regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+  Cold import time of the package entry points, measured in fresh interpreters.
+
+  The API client is compared with the cost of its dependencies (requests and NumPy). The
+  script fails if the API client loads Qiskit or pytket or if its overhead exceeds the limit.
+
+  Usage: python benchmarks/import_time_bench.py [--repeat 5] [--max-overhead 0.25]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+# Modules that must not be loaded by the API client
+HEAVY_MODULES = ("qiskit", "pytket", "pydantic", "pydantic_settings")
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+heavy = sorted({{name.split(".")[0] for name in sys.modules}} & set({heavy!r}))
+print(json.dumps({{"seconds": elapsed, "heavy": heavy}}))
+"""
+
+
+def measure(module: str, repeat: int) -> dict:
+    """Median import time of a module (or comma separated modules) in fresh interpreters."""
+    env = {**os.environ, "PYTHONPATH": SRC + os.pathsep + os.environ.get("PYTHONPATH", "")}
+    samples = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(module=module, heavy=HEAVY_MODULES)],
+            check=True,
+            capture_output=True,
+            text=True,
+            env=env,
+        ).stdout
+        samples.append(json.loads(output))
+    return {
+        "seconds": statistics.median(sample["seconds"] for sample in samples),
+        "heavy": samples[0]["heavy"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="interpreters per measurement")
+    parser.add_argument(
+        "--max-overhead",
+        type=float,
+        default=0.25,
+        help="allowed seconds of the API client over requests and NumPy",
+    )
+    args = parser.parse_args()
+
+    modules = {
+        "baseline (requests, numpy)": "requests, numpy",
+        "c12_callisto_clients": "c12_callisto_clients",
+        "c12_callisto_clients.api.client": "c12_callisto_clients.api.client",
+        "c12_callisto_clients.qiskit": "c12_callisto_clients.qiskit",
+        "c12_callisto_clients.pytket": "c12_callisto_clients.pytket",
+    }
+    results = {name: measure(module, args.repeat) for name, module in modules.items()}
+
+    print(f"{'import':<36}{'time [ms]':>12}  heavy modules")
+    for name, result in results.items():
+        heavy = ", ".join(result["heavy"]) or "-"
+        print(f"{name:<36}{result['seconds'] * 1e3:>12.1f}  {heavy}")
+
+    api = results["c12_callisto_clients.api.client"]
+    overhead = api["seconds"] - results["baseline (requests, numpy)"]["seconds"]
+    failures = []
+    if api["heavy"]:
+        failures.append(f"the API client loads {', '.join(api['heavy'])}")
+    if overhead > args.max_overhead:
+        failures.append(f"the API client overhead {overhead:.3f}s exceeds {args.max_overhead}s")
+
+    if failures:
+        print("FAILED: " + "; ".join(failures))
+        sys.exit(1)
+    print(f"OK: API client overhead {overhead * 1e3:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
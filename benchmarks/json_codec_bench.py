@@ -0,0 +1,99 @@
+"""
+  Microbenchmark of the JSON codecs on payloads shaped like the Callisto API traffic.
+
+  Usage: python benchmarks/json_codec_bench.py [--qubits 9] [--gates 20000] [--repeat 5]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from c12_callisto_clients.api.codec import CODECS  # noqa: E402
+
+
+def submission_payload(n_qubits: int, n_gates: int) -> dict:
+    """Body of the start job request with a large transpiled circuit and initial state."""
+    rng = np.random.default_rng(0)
+    lines = ["OPENQASM 2.0;", 'include "qelib1.inc";', f"qreg q[{n_qubits}];"]
+    lines.append(f"creg c[{n_qubits}];")
+    for _ in range(n_gates):
+        qubit, other = rng.choice(n_qubits, 2, replace=False)
+        if rng.random() < 0.3:
+            lines.append(f"iswap q[{qubit}],q[{other}];")
+        else:
+            lines.append(f"rz({rng.uniform(-np.pi, np.pi):.15f}) q[{qubit}];")
+    state = rng.normal(size=2**n_qubits) + 1j * rng.normal(size=2**n_qubits)
+    return {
+        "qasm_str": "\n".join(lines),
+        "num_shots": 1024,
+        "result": "counts,statevector,density_matrix,states",
+        "backend_name": "c12sim-iswap",
+        "inistatevector": np.array2string(state / np.linalg.norm(state), separator=","),
+    }
+
+
+def result_payload(n_qubits: int) -> dict:
+    """Response of the job result endpoint with the final and one mid-circuit state."""
+    rng = np.random.default_rng(1)
+    dim = 2**n_qubits
+    statevector = [str(complex(x, y)) for x, y in rng.normal(size=(dim, 2))]
+    density_matrix = [
+        [str(complex(x, y)) for x, y in row] for row in rng.normal(size=(dim, dim, 2))
+    ]
+    counts = {format(i, f"0{n_qubits}b"): int(c) for i, c in enumerate(rng.integers(0, 50, dim))}
+    return {
+        "status": "FINISHED",
+        "errors": None,
+        "results": {
+            "counts": counts,
+            "statevector": statevector,
+            "density_matrix": density_matrix,
+            "states": {
+                "statevector": {"sv1": statevector},
+                "density_matrix": {"dm1": density_matrix},
+            },
+        },
+    }
+
+
+def status_payload() -> dict:
+    """Response of a status poll."""
+    return {"status": "RUNNING", "results": None, "errors": None}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--qubits", type=int, default=9, help="qubits of the result payload")
+    parser.add_argument("--gates", type=int, default=20000, help="gates of the submitted circuit")
+    parser.add_argument("--repeat", type=int, default=5, help="repetitions of each measurement")
+    args = parser.parse_args()
+
+    reference = CODECS["json"]
+    payloads = {
+        "submission": submission_payload(10, args.gates),
+        f"result ({args.qubits} qubits)": result_payload(args.qubits),
+        "status poll": status_payload(),
+    }
+
+    print(f"{'payload':<24}{'codec':<10}{'size':>10}{'dumps [us]':>14}{'loads [us]':>14}")
+    for payload_name, payload in payloads.items():
+        body = reference.dumps(payload).encode()
+        number = max(1, int(2e6 // len(body)))
+        for codec in CODECS.values():
+            assert codec.loads(codec.dumps(payload)) == payload
+            dumps = min(
+                timeit.repeat(lambda: codec.dumps(payload), number=number, repeat=args.repeat)
+            )
+            loads = min(timeit.repeat(lambda: codec.loads(body), number=number, repeat=args.repeat))
+            print(
+                f"{payload_name:<24}{codec.name:<10}{len(body) / 1024:>8.0f}kB"
+                f"{dumps / number * 1e6:>14.1f}{loads / number * 1e6:>14.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -50,6 +50,7 @@ setup(
         "pytket~=1.33.0",
         "pydantic-settings~=2.5",
     ],
+    extras_require={"fast": ["orjson>=3.8"]},
     python_requires=">=3.7",
     include_package_data=False,
     package_dir={"c12_callisto_clients": "src/c12_callisto_clients"},
@@ -1,5 +1,71 @@
-from c12_callisto_clients.api import *
-from c12_callisto_clients.qiskit import *
-from c12_callisto_clients.pytket import *
-from c12_callisto_clients.pytket.extensions import *
-from c12_callisto_clients.pytket.extensions.callisto import *
+"""
+  C12 Callisto clients.
+
+  The subpackages are imported lazily on the first access, so the API client
+  (c12_callisto_clients.api) can be used without loading Qiskit and pytket.
+"""
+
+import importlib
+
+
+_SUBMODULES = ("api", "qiskit", "qiskit_back", "pytket", "user_configs")
+
+# Names available at the package level and the modules that provide them
+_LAZY_NAMES = {
+    **{
+        name: f"c12_callisto_clients.api.{name}"
+        for name in (
+            "batch",
+            "breaker",
+            "client",
+            "coalesce",
+            "codec",
+            "configs",
+            "dispatch",
+            "estimator",
+            "exceptions",
+            "execution",
+            "journal",
+            "loadtest",
+            "metrics",
+            "profiling",
+            "results",
+            "retry",
+            "sparse",
+            "storage",
+            "streaming",
+            "tracing",
+        )
+    },
+    **{
+        name: f"c12_callisto_clients.qiskit.{name}"
+        for name in (
+            "c12sim_backend",
+            "c12sim_job",
+            "c12sim_local",
+            "c12sim_provider",
+            "c12sim_sweep",
+        )
+    },
+}
+_LAZY_ATTRIBUTES = {
+    "CallistoBackend": "c12_callisto_clients.pytket.extensions.callisto.backends.callisto",
+}
+
+
+def __getattr__(name: str):
+    if name in _SUBMODULES:
+        value = importlib.import_module(f"{__name__}.{name}")
+    elif name in _LAZY_NAMES:
+        value = importlib.import_module(_LAZY_NAMES[name])
+    elif name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *_SUBMODULES, *_LAZY_NAMES, *_LAZY_ATTRIBUTES})
@@ -1,3 +1,20 @@
 from . import client
 from . import configs
+from . import codec
 from . import exceptions
+from . import metrics
+from . import results
+from . import estimator
+from . import storage
+from . import sparse
+from . import streaming
+from . import tracing
+from . import retry
+from . import breaker
+from . import coalesce
+from . import execution
+from . import profiling
+from . import batch
+from . import loadtest
+from . import journal
+from . import dispatch
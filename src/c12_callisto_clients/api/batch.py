@@ -0,0 +1,248 @@
+"""
+  Batch execution of QASM files.
+
+  The inputs are QASM files given by paths, directories (all the .qasm files in them), glob
+  patterns or manifests. A manifest (.txt, .jsonl) has one input per line, either a path or
+  a JSON object with the path and the optional shots, outputs and physical_params of the job
+  (the relative paths are relative to the manifest). The jobs are run concurrently, at most
+  as many as the user can run at once, and each finished job is written as a JSON line to
+  the output as soon as it finishes. A partial output can be resumed: the inputs whose jobs
+  already finished are skipped.
+"""
+
+import glob
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, Callable, Dict, Iterable, List, Optional, Set
+
+from c12_callisto_clients.api.execution import Executor
+
+
+# Statuses of the jobs that are not run again when the output is resumed
+DONE_STATUSES = ("FINISHED", "ERROR", "CANCELLED")
+
+# Status of the records of the jobs that failed on the client side (they are run again)
+FAILED = "FAILED"
+
+_MANIFEST_EXTENSIONS = (".txt", ".jsonl")
+
+
+class BatchItem:
+    """Single QASM file of a batch and the options of its job."""
+
+    def __init__(
+        self,
+        path: str,
+        shots: int = 1024,
+        outputs: str = "counts",
+        physical_params: Optional[str] = None,
+    ):
+        """
+        :param path: path of the QASM file (also the key of the item in the output)
+        :param shots: number of shots
+        :param outputs: comma separated outputs of the job (counts, statevector,
+                        density_matrix, states)
+        :param physical_params: stringify json with physical parameters
+        """
+        self.path = path
+        self.shots = shots
+        self.outputs = outputs
+        self.physical_params = physical_params
+
+    def __repr__(self):
+        return f"BatchItem({self.path!r}, shots={self.shots}, outputs={self.outputs!r})"
+
+
+def _manifest_items(manifest: str, defaults: dict) -> List[BatchItem]:
+    """Items of a manifest file."""
+    base = os.path.dirname(manifest)
+    items = []
+    with open(manifest, encoding="utf-8") as file:
+        for line in file:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            entry = json.loads(line) if line.startswith("{") else {"path": line}
+            options = {**defaults, **{key: value for key, value in entry.items() if key != "path"}}
+            if isinstance(options.get("physical_params"), dict):
+                options["physical_params"] = json.dumps(options["physical_params"])
+            items.append(BatchItem(os.path.join(base, entry["path"]), **options))
+    return items
+
+
+def collect_items(
+    sources: Iterable[str],
+    shots: int = 1024,
+    outputs: str = "counts",
+    physical_params: Optional[str] = None,
+) -> List[BatchItem]:
+    """
+    Collect the QASM files of a batch.
+
+    :param sources: paths of QASM files, directories, glob patterns or manifests
+    :param shots: default number of shots of the jobs
+    :param outputs: default outputs of the jobs
+    :param physical_params: default physical parameters of the jobs
+    :return: list of items in the order of the sources (each path only once)
+    :raises FileNotFoundError: if a source does not match any file
+    """
+    defaults = {"shots": shots, "outputs": outputs, "physical_params": physical_params}
+    items: Dict[str, BatchItem] = {}
+    for source in sources:
+        if os.path.isdir(source):
+            paths = sorted(glob.glob(os.path.join(source, "**", "*.qasm"), recursive=True))
+            found = [BatchItem(path, **defaults) for path in paths]
+        elif os.path.isfile(source) and source.endswith(_MANIFEST_EXTENSIONS):
+            found = _manifest_items(source, defaults)
+        elif os.path.isfile(source):
+            found = [BatchItem(source, **defaults)]
+        else:
+            paths = sorted(glob.glob(source, recursive=True))
+            found = [BatchItem(path, **defaults) for path in paths]
+
+        if not found:
+            raise FileNotFoundError(f"No QASM files found for {source}")
+        for item in found:
+            items.setdefault(item.path, item)
+    return list(items.values())
+
+
+def read_done(output: str) -> Set[str]:
+    """
+    Get the paths of the items whose jobs are already done in a partial output.
+
+    :param output: path of the JSON lines output (a missing file means no item is done)
+    :return: set of paths
+    """
+    done = set()
+    if not os.path.exists(output):
+        return done
+    with open(output, encoding="utf-8") as file:
+        for line in file:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # The last line of an interrupted run can be incomplete
+                continue
+            if record.get("status") in DONE_STATUSES:
+                done.add(record["path"])
+    return done
+
+
+def open_output(output: str, resume: bool = False) -> IO[str]:
+    """
+    Open the output of a batch.
+
+    :param output: path of the JSON lines output
+    :param resume: if the records are appended to an existing output
+    :return: file opened for writing
+    """
+    if not resume or not os.path.exists(output):
+        return open(output, "w", encoding="utf-8")
+
+    incomplete = False
+    with open(output, "rb") as file:
+        if file.seek(0, os.SEEK_END) > 0:
+            file.seek(-1, os.SEEK_END)
+            incomplete = file.read(1) != b"\n"
+    stream = open(output, "a", encoding="utf-8")  # pylint: disable=consider-using-with
+    if incomplete:
+        try:
+            # The incomplete last line of an interrupted run is terminated
+            stream.write("\n")
+        except BaseException:
+            stream.close()
+            raise
+    return stream
+
+
+class BatchRunner:
+    """Concurrent execution of a batch of QASM files."""
+
+    def __init__(
+        self,
+        executor: Executor,
+        max_workers: Optional[int] = None,
+        wait: float = 2,
+        timeout: Optional[float] = None,
+    ):
+        """
+        :param executor: executor of the jobs (with the request and the backend name)
+        :param max_workers: maximum number of the jobs in flight (the maximum number of the
+                            user jobs if None)
+        :param wait: seconds between the status queries of a job
+        :param timeout: seconds to wait for a job (if None wait forever)
+        """
+        self.executor = executor
+        self.max_workers = max_workers
+        self.wait = wait
+        self.timeout = timeout
+        self._lock = threading.Lock()
+
+    def run_item(self, item: BatchItem) -> dict:
+        """
+        Run the job of a single item and wait for it.
+
+        :param item: item of the batch
+        :return: record of the job (path, job_id, status, shots, outputs, results, errors and
+                 seconds), the status is FAILED if the job could not be run
+        """
+        start = time.perf_counter()
+        record = {"path": item.path, "job_id": None, "shots": item.shots, "outputs": item.outputs}
+        try:
+            with open(item.path, encoding="utf-8") as file:
+                qasm = file.read()
+            submission = self.executor.submit(
+                qasm, item.shots, item.outputs, physical_params=item.physical_params
+            )
+            record["job_id"] = submission.job_id
+            data = self.executor.wait(
+                submission.job_id, timeout=self.timeout, wait=self.wait, output_data=item.outputs
+            )
+            record.update(status=data["status"], results=data.get("results"))
+            record["errors"] = data.get("errors") or None
+        except Exception as err:  # pylint: disable=broad-except
+            record.update(status=FAILED, results=None, errors=f"{type(err).__name__}: {err}")
+        record["seconds"] = round(time.perf_counter() - start, 6)
+        return record
+
+    def run(
+        self,
+        items: List[BatchItem],
+        output: IO[str],
+        on_record: Optional[Callable[[dict], None]] = None,
+    ) -> Dict[str, int]:
+        """
+        Run the jobs of the items concurrently and write their records as JSON lines as soon
+        as they finish.
+
+        :param items: items of the batch
+        :param output: file the records are written to
+        :param on_record: function called with each record (e.g. to report the progress)
+        :return: number of the jobs by their status
+        """
+        if len(items) == 0:
+            return {}
+
+        max_workers = self.max_workers
+        if max_workers is None:
+            max_workers = self.executor.request.get_maxjobs()
+        max_workers = max(min(max_workers, len(items)), 1)
+
+        summary: Dict[str, int] = {}
+
+        def process(item: BatchItem) -> None:
+            record = self.run_item(item)
+            with self._lock:
+                output.write(json.dumps(record) + "\n")
+                output.flush()
+                summary[record["status"]] = summary.get(record["status"], 0) + 1
+                if on_record is not None:
+                    on_record(record)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            list(pool.map(process, items))
+        return summary
@@ -0,0 +1,225 @@
+"""
+  Circuit breaker of the API endpoints.
+
+  The breaker tracks the failure rate of the recent requests of each endpoint. When the rate
+  exceeds the threshold, the endpoint is opened: the requests fail immediately with
+  CircuitOpenError instead of waiting for a degraded server. After the reset timeout the
+  endpoint is half-open and a limited number of probe requests is let through; a successful
+  probe closes the endpoint again, a failed one opens it for another reset timeout.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+
+from c12_callisto_clients.api.configs import (
+    BREAKER_WINDOW,
+    BREAKER_MIN_REQUESTS,
+    BREAKER_FAILURE_RATE,
+    BREAKER_RESET_TIMEOUT,
+)
+from c12_callisto_clients.api.exceptions import CircuitOpenError
+
+
+# States of an endpoint
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class _Endpoint:
+    """Outcomes and the state of a single endpoint."""
+
+    def __init__(self, window: int):
+        self.outcomes = deque(maxlen=window)  # True for the failed requests
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.probes = 0  # requests in flight in the half-open state
+
+
+class CircuitBreaker:
+    """Failure-rate based circuit breaker shared by the Request instances."""
+
+    def __init__(
+        self,
+        window: Optional[int] = None,
+        min_requests: Optional[int] = None,
+        failure_rate: Optional[float] = None,
+        reset_timeout: Optional[float] = None,
+        half_open_requests: int = 1,
+    ):
+        """
+        :param window: number of the recent requests of an endpoint the failure rate is
+                       computed from, C12_BREAKER_WINDOW if None
+        :param min_requests: minimum number of the requests in the window before the endpoint
+                             can be opened, C12_BREAKER_MIN_REQUESTS if None
+        :param failure_rate: rate of the failed requests (0-1] that opens the endpoint,
+                             C12_BREAKER_FAILURE_RATE if None
+        :param reset_timeout: seconds the endpoint stays open before the probe requests are
+                              let through, C12_BREAKER_RESET_TIMEOUT if None
+        :param half_open_requests: number of the concurrent probe requests
+        """
+        self.window = BREAKER_WINDOW if window is None else window
+        self.min_requests = BREAKER_MIN_REQUESTS if min_requests is None else min_requests
+        self.failure_rate = BREAKER_FAILURE_RATE if failure_rate is None else failure_rate
+        self.reset_timeout = BREAKER_RESET_TIMEOUT if reset_timeout is None else reset_timeout
+        self.half_open_requests = half_open_requests
+        if self.window < 1 or not 0 < self.failure_rate <= 1:
+            raise ValueError(
+                f"Wrong breaker parameters (window={self.window}, "
+                f"failure_rate={self.failure_rate})"
+            )
+
+        self._endpoints: Dict[str, _Endpoint] = {}
+        self._lock = threading.Lock()
+
+    def _endpoint(self, endpoint: str) -> _Endpoint:
+        if endpoint not in self._endpoints:
+            self._endpoints[endpoint] = _Endpoint(self.window)
+        return self._endpoints[endpoint]
+
+    def _update_state(self, item: _Endpoint, now: float) -> None:
+        if item.state == OPEN and now - item.opened_at >= self.reset_timeout:
+            item.state = HALF_OPEN
+            item.probes = 0
+
+    def _open(self, item: _Endpoint, now: float) -> None:
+        item.state = OPEN
+        item.opened_at = now
+        item.outcomes.clear()
+
+    def state(self, endpoint: str) -> str:
+        """
+        Get the state of an endpoint.
+
+        :param endpoint: endpoint (host and path)
+        :return: CLOSED, OPEN or HALF_OPEN
+        """
+        with self._lock:
+            item = self._endpoint(endpoint)
+            self._update_state(item, time.monotonic())
+            return item.state
+
+    def retry_in(self, endpoint: str) -> float:
+        """
+        Get the time until the requests of an open endpoint are let through again.
+
+        :param endpoint: endpoint (host and path)
+        :return: seconds (0 if the endpoint is not open)
+        """
+        with self._lock:
+            item = self._endpoint(endpoint)
+            if item.state != OPEN:
+                return 0.0
+            return max(item.opened_at + self.reset_timeout - time.monotonic(), 0.0)
+
+    def allow(self, endpoint: str) -> None:
+        """
+        Check if a request to an endpoint can be made.
+
+        :param endpoint: endpoint (host and path)
+        :return: None
+        :raises CircuitOpenError: if the endpoint is open (or half-open with all the probe
+                                  requests in flight)
+        """
+        with self._lock:
+            now = time.monotonic()
+            item = self._endpoint(endpoint)
+            self._update_state(item, now)
+
+            if item.state == CLOSED:
+                return
+            if item.state == HALF_OPEN and item.probes < self.half_open_requests:
+                item.probes += 1
+                return
+
+            retry_in = 0.0
+            if item.state == OPEN:
+                retry_in = max(item.opened_at + self.reset_timeout - now, 0.0)
+            raise CircuitOpenError(
+                f"Endpoint {endpoint} is unavailable (circuit {item.state})", retry_in
+            )
+
+    def record(self, endpoint: str, failed: bool) -> None:
+        """
+        Record the outcome of a request to an endpoint.
+
+        :param endpoint: endpoint (host and path)
+        :param failed: if the request failed (connection error, 429 or 5xx status)
+        :return: None
+        """
+        with self._lock:
+            now = time.monotonic()
+            item = self._endpoint(endpoint)
+
+            if item.state == HALF_OPEN:
+                item.probes = max(item.probes - 1, 0)
+                if failed:
+                    self._open(item, now)
+                else:
+                    item.state = CLOSED
+                    item.outcomes.clear()
+                return
+            if item.state == OPEN:
+                # A request that was let through before the endpoint was opened
+                return
+
+            item.outcomes.append(failed)
+            failures = sum(item.outcomes)
+            if (
+                len(item.outcomes) >= self.min_requests
+                and failures >= self.failure_rate * len(item.outcomes)
+                and failures > 0
+            ):
+                self._open(item, now)
+
+    def release(self, endpoint: str) -> None:
+        """
+        Give back the permission of a request whose outcome says nothing about the endpoint
+        (e.g. it was interrupted), a half-open endpoint lets another probe through.
+
+        :param endpoint: endpoint (host and path)
+        :return: None
+        """
+        with self._lock:
+            item = self._endpoint(endpoint)
+            if item.state == HALF_OPEN:
+                item.probes = max(item.probes - 1, 0)
+
+    def reset(self, endpoint: Optional[str] = None) -> None:
+        """
+        Close an endpoint and forget its outcomes.
+
+        :param endpoint: endpoint (host and path), all the endpoints if None
+        :return: None
+        """
+        with self._lock:
+            if endpoint is None:
+                self._endpoints.clear()
+            else:
+                self._endpoints.pop(endpoint, None)
+
+    def __repr__(self):
+        return (
+            f"CircuitBreaker(window={self.window}, min_requests={self.min_requests}, "
+            f"failure_rate={self.failure_rate}, reset_timeout={self.reset_timeout})"
+        )
+
+
+# Breaker shared by the Request instances that are not given their own
+_shared_breaker: Optional[CircuitBreaker] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_breaker() -> CircuitBreaker:
+    """
+    Get the circuit breaker shared by all the Request instances of the process.
+
+    :return: CircuitBreaker instance
+    """
+    global _shared_breaker  # pylint: disable=global-statement
+    with _shared_lock:
+        if _shared_breaker is None:
+            _shared_breaker = CircuitBreaker()
+        return _shared_breaker
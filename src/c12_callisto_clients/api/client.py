@@ -1,6 +1,13 @@
-from typing import Optional, Union
+from typing import Callable, Dict, Optional, Union, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import copy
+from urllib.parse import urlsplit
+import gzip
+import logging
+import reprlib
 import time
-import json
+import uuid
+import zlib
 import numpy as np
 import requests
 from c12_callisto_clients.api.configs import (
@@ -11,21 +18,197 @@ from c12_callisto_clients.api.configs import (
     API_USER_JOBS,
     API_GET_JOB,
     API_PARAMS_URL,
+    SUBMIT_WORKERS,
+    STREAM_CHUNK_SIZE,
+    REQUEST_COMPRESSION,
+    COMPRESS_MIN_BYTES,
+    ACCEPT_ENCODING,
+    TIMEOUT_CATEGORIES,
+    TIMEOUTS,
+    COALESCE_TTL,
 )
-from c12_callisto_clients.api.exceptions import ApiError
+from c12_callisto_clients.api.breaker import CircuitBreaker, get_shared_breaker
+from c12_callisto_clients.api.codec import JsonCodec, get_codec
+from c12_callisto_clients.api.coalesce import SingleFlight
+from c12_callisto_clients.api.exceptions import (
+    ApiError,
+    CircuitOpenError,
+    NotFoundError,
+    SubmissionError,
+)
+from c12_callisto_clients.api.dispatch import DispatchQueue
+from c12_callisto_clients.api.journal import SubmissionJournal, get_journal, request_hash
+from c12_callisto_clients.api.metrics import (
+    InstrumentedAdapter,
+    MetricsHook,
+    RequestRecord,
+    collect_timings,
+)
+from c12_callisto_clients.api.retry import CONNECTION_ERROR, RetryPolicy
+from c12_callisto_clients.api.streaming import StreamingDecoder
+
+# Compression level of the request bodies (a balance between the speed and the ratio)
+COMPRESS_LEVEL = 6
+
+# Statuses of the jobs that do not change anymore
+_FINAL_STATUSES = ("FINISHED", "ERROR", "CANCELLED")
+
+# Statuses returned by the servers that do not understand a compressed request body
+_COMPRESSION_REJECTED_STATUSES = (400, 415, 422)
+
+# Verbose output shows only the beginning of the (possibly huge) bodies
+_VERBOSE_REPR = reprlib.Repr()
+_VERBOSE_REPR.maxlist = _VERBOSE_REPR.maxdict = 10
+_VERBOSE_REPR.maxstring = _VERBOSE_REPR.maxother = 200
+_VERBOSE_REPR.maxlevel = 4
+
+logger = logging.getLogger(__name__)
+
+# Timeout of a request: seconds (connect and read) or a tuple (connect, read)
+Timeout = Union[float, Tuple[float, float]]
+
+
+def _as_timeout(timeout: Timeout) -> Tuple[float, float]:
+    """Convert a timeout into the tuple (connect, read)."""
+    if isinstance(timeout, (int, float)):
+        timeout = (timeout, timeout)
+    connect, read = timeout
+    if connect <= 0 or read <= 0:
+        raise ValueError(f"Timeouts have to be positive ({timeout})")
+    return float(connect), float(read)
+
+
+def _received_bytes(response: requests.Response) -> int:
+    """Size of the response body as it was transferred (before decompression)."""
+    raw = getattr(response, "raw", None)
+    if raw is not None and hasattr(raw, "tell"):
+        return raw.tell()
+    return len(response.content)
+
+
+def start_concurrently(
+    start: Callable[[dict], tuple], jobs: List[dict], max_workers: int
+) -> List[tuple]:
+    """
+    Start several jobs in parallel. If some of them could not be started, the started ones are
+    not lost: the raised error carries them, so they can be reattached or cancelled.
+
+    :param start: function starting a job, dict -> tuple (job uuid, transpiled qasm str)
+    :param jobs: keyword arguments of the jobs
+    :param max_workers: maximum number of parallel submissions
+    :return: list of tuples (job uuid, transpiled qasm str) in the order of the jobs
+    :raises SubmissionError: if some of the jobs were started and the others were not
+    :raises Exception: the error of the first job if none of the jobs was started
+    """
+    if max_workers < 1:
+        raise ValueError(f"Parameter max_workers has to be positive ({max_workers})")
+
+    started: List[Optional[tuple]] = []
+    errors = []
+    if max_workers == 1 or len(jobs) == 1:
+        # The jobs after a failed one are not started
+        for job in jobs:
+            try:
+                started.append(start(job))
+            except Exception as err:  # pylint: disable=broad-except
+                errors.append(err)
+                break
+        started += [None] * (len(jobs) - len(started))
+    else:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(jobs))) as executor:
+            futures = [executor.submit(start, job) for job in jobs]
+        for future in futures:
+            try:
+                started.append(future.result())
+            except Exception as err:  # pylint: disable=broad-except
+                started.append(None)
+                errors.append(err)
+
+    if len(errors) == 0:
+        return started
+    if all(item is None for item in started):
+        raise errors[0]
+    count = sum(item is None for item in started)
+    raise SubmissionError(
+        f"{count} of {len(jobs)} jobs could not be started: {errors[0]}", started
+    ) from errors[0]
 
 
 class Request:
     """Facade for the API requests to the C12 simulator backend."""
 
-    def __init__(self, auth_token: str, verbose: bool = False):
+    def __init__(
+        self,
+        auth_token: str,
+        verbose: bool = False,
+        codec: Union[str, JsonCodec, None] = None,
+        compression: Optional[str] = None,
+        compress_min_bytes: Optional[int] = None,
+        accept_encoding: Optional[str] = None,
+        hooks: Optional[List[MetricsHook]] = None,
+        retry: Optional[RetryPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        timeouts: Optional[Dict[str, Timeout]] = None,
+        coalesce_ttl: Optional[float] = None,
+        journal: Union[str, SubmissionJournal, None] = None,
+        dispatch: Optional[DispatchQueue] = None,
+    ):
         """
         :param auth_token: authorisation token of a user that is used for access
                            to the C12 APIs
         :param verbose: if detailed printing is active
+        :param codec: JSON codec (instance or name) of the request bodies and the responses,
+                      if None it is selected by C12_JSON_CODEC (the fastest available by default)
+        :param compression: compression of the POST bodies ("gzip", "deflate" or "none"),
+                            C12_REQUEST_COMPRESSION if None (off by default)
+        :param compress_min_bytes: bodies smaller than this are sent uncompressed,
+                                   C12_COMPRESS_MIN_BYTES if None
+        :param accept_encoding: Accept-Encoding header of the requests ("identity" to receive
+                                uncompressed responses), C12_ACCEPT_ENCODING if None
+        :param hooks: metrics hooks that receive a RequestRecord of every API call
+        :param retry: retry policy of the transient failures (429, 5xx and connection errors),
+                      the default policy (configured by the C12_RETRY_* variables) if None
+        :param breaker: circuit breaker of the endpoints, the breaker shared by all the
+                        Request instances of the process if None
+        :param timeouts: timeouts of the categories of the API calls (metadata, submit, status,
+                         result), seconds or tuples (connect, read), the missing ones are
+                         taken from the C12_*_TIMEOUT variables
+        :param coalesce_ttl: seconds a non-final job status is reused by the identical
+                             status and job queries (the concurrent identical queries always
+                             share one request), C12_COALESCE_TTL if None
+        :param journal: journal the job submissions are recorded to and reattached from
+                        (instance or path of the file), C12_JOURNAL if None (no journal if
+                        not set)
+        :param dispatch: queue the job submissions wait in for a free job slot (by priority
+                         and tenant), the submissions are sent right away if None
         """
         self._auth_token = auth_token
         self._verbose = verbose
+        self._codec = codec if isinstance(codec, JsonCodec) else get_codec(codec)
+
+        compression = REQUEST_COMPRESSION if compression is None else compression
+        if compression not in ("gzip", "deflate", "none"):
+            raise ValueError(f"Wrong parameter for compression argument: {compression}")
+        self._compression = None if compression == "none" else compression
+        self._compress_min_bytes = (
+            COMPRESS_MIN_BYTES if compress_min_bytes is None else compress_min_bytes
+        )
+        self._accept_encoding = ACCEPT_ENCODING if accept_encoding is None else accept_encoding
+        self._hooks = list(hooks) if hooks is not None else []
+        self._retry = RetryPolicy() if retry is None else retry
+        self._breaker = get_shared_breaker() if breaker is None else breaker
+        self._timeouts = dict(TIMEOUTS)
+        self._timeouts.update(self._check_timeouts(timeouts or {}))
+        self._coalesce_ttl = COALESCE_TTL if coalesce_ttl is None else coalesce_ttl
+        self._flights = SingleFlight()
+        self._journal = get_journal(journal)
+        self._dispatch = dispatch
+
+        # Session keeps the connections alive, its adapter measures the connect and tls time
+        self._session = requests.Session()
+        adapter = InstrumentedAdapter()
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
 
         # Setting the header with a token
         self._auth_header = {"Authorization": "Bearer " + self._auth_token}
@@ -44,7 +227,279 @@ class Request:
         self._auth_token = auth_token
         self._auth_header = {"Authorization": "Bearer " + self._auth_token}
 
-    def do_request(self, url: str, method: str, params: dict = None, header: dict = None) -> object:
+    @property
+    def journal(self) -> Optional[SubmissionJournal]:
+        """
+        Getter for the journal of the job submissions.
+
+        :return: SubmissionJournal instance or None if the submissions are not recorded
+        """
+        return self._journal
+
+    @property
+    def dispatch(self) -> Optional[DispatchQueue]:
+        """
+        Getter for the dispatch queue of the job submissions.
+
+        :return: DispatchQueue instance or None if the submissions are not queued
+        """
+        return self._dispatch
+
+    def _observe_status(self, job_uuid: str, status: Optional[str]) -> None:
+        """Pass a job status to the dispatch queue (a final status frees the job slot)."""
+        if self._dispatch is not None:
+            self._dispatch.observe(job_uuid, status)
+
+    @property
+    def codec(self) -> JsonCodec:
+        """
+        Getter for the JSON codec of the requests.
+
+        :return: JsonCodec instance
+        """
+        return self._codec
+
+    @property
+    def compression(self) -> Optional[str]:
+        """
+        Getter for the compression of the request bodies.
+
+        :return: "gzip", "deflate" or None if the bodies are not compressed
+        """
+        return self._compression
+
+    @property
+    def retry(self) -> RetryPolicy:
+        """
+        Getter for the retry policy of the requests.
+
+        :return: RetryPolicy instance
+        """
+        return self._retry
+
+    @property
+    def breaker(self) -> CircuitBreaker:
+        """
+        Getter for the circuit breaker of the endpoints.
+
+        :return: CircuitBreaker instance
+        """
+        return self._breaker
+
+    @property
+    def timeouts(self) -> Dict[str, Tuple[float, float]]:
+        """
+        Getter for the timeouts of the categories of the API calls.
+
+        :return: dictionary category -> (connect, read) in seconds
+        """
+        return dict(self._timeouts)
+
+    @staticmethod
+    def _check_timeouts(timeouts: Dict[str, Timeout]) -> Dict[str, Tuple[float, float]]:
+        unknown = set(timeouts) - set(TIMEOUT_CATEGORIES)
+        if unknown:
+            raise ValueError(
+                f"Unknown timeout categories {sorted(unknown)}, "
+                f"available: {', '.join(TIMEOUT_CATEGORIES)}"
+            )
+        return {category: _as_timeout(timeout) for category, timeout in timeouts.items()}
+
+    def with_timeouts(self, timeouts: Dict[str, Timeout]) -> "Request":
+        """
+        Get a copy of the instance with different timeouts. The copy shares the connections,
+        the hooks and the circuit breaker with the original.
+
+        :param timeouts: timeouts of the categories of the API calls to override
+        :return: Request instance
+        """
+        request = copy.copy(self)
+        request._timeouts = {**self._timeouts, **self._check_timeouts(timeouts)}
+        return request
+
+    def _status_ttl(self, status: Optional[str]) -> float:
+        """Seconds the response with a job status can be reused (0 for the final statuses)."""
+        if status is None or str(status).upper() in _FINAL_STATUSES:
+            return 0.0
+        return self._coalesce_ttl
+
+    def _coalesced(
+        self,
+        key: tuple,
+        decoder: Optional[StreamingDecoder],
+        fetch: Callable[[], dict],
+        status: Callable[[dict], Optional[str]],
+    ) -> dict:
+        """
+        Perform a job query shared by the concurrent identical queries.
+
+        :param key: key of the query
+        :param decoder: decoder of the response (the queries with decoders allocating their
+                        own arrays are not shared)
+        :param fetch: function performing the query
+        :param status: function response -> job status (selects the time of the reuse)
+        :return: response of the query
+        """
+        if decoder is not None:
+            if decoder.key is None:
+                return fetch()
+            key = key + decoder.key
+        return self._flights.do(key, fetch, ttl=lambda data: self._status_ttl(status(data)))
+
+    def _timeout(self, category: str, timeout: Optional[Timeout]) -> Tuple[float, float]:
+        """
+        Get the timeout of a call.
+
+        :param category: category of the API call
+        :param timeout: timeout of the call overriding the one of the category
+        :return: tuple (connect, read) in seconds
+        """
+        if timeout is not None:
+            return _as_timeout(timeout)
+        if category not in self._timeouts:
+            raise ValueError(f"Unknown timeout category {category}")
+        return self._timeouts[category]
+
+    @property
+    def hooks(self) -> List[MetricsHook]:
+        """
+        Getter for the metrics hooks.
+
+        :return: list of MetricsHook
+        """
+        return self._hooks
+
+    def add_hook(self, hook: MetricsHook) -> None:
+        """
+        Register a metrics hook that receives the records of the API calls.
+
+        :param hook: MetricsHook instance
+        :return: None
+        """
+        self._hooks.append(hook)
+
+    def _emit(self, record: RequestRecord) -> None:
+        for hook in self._hooks:
+            try:
+                hook.record(record)
+            except Exception:  # pylint: disable=broad-except
+                logger.exception("Metrics hook %r failed", hook)
+
+    def _encode_body(self, params: dict, compress: bool = True) -> Tuple[bytes, dict]:
+        """
+        Serialize (and compress) the body of a request.
+
+        :param params: body of the request
+        :param compress: if the body can be compressed
+        :return: tuple with the body and the additional headers
+        """
+        body = self._codec.dumps(params)
+        if isinstance(body, str):
+            body = body.encode()
+        headers = {"Content-Type": "application/json"}
+
+        if not compress or self._compression is None or len(body) < self._compress_min_bytes:
+            return body, headers
+
+        if self._compression == "gzip":
+            body = gzip.compress(body, compresslevel=COMPRESS_LEVEL, mtime=0)
+        else:
+            body = zlib.compress(body, COMPRESS_LEVEL)
+        return body, {**headers, "Content-Encoding": self._compression}
+
+    def _send(
+        self,
+        url: str,
+        method: str,
+        params: Optional[dict],
+        headers: dict,
+        timeout: Tuple[float, float],
+    ) -> Tuple[requests.Response, int, int]:
+        """
+        Send the request. The response body is not read.
+
+        :param url: the endpoint url of the API
+        :param method: http method
+        :param params: query parameters or the body (for post) of the request
+        :param headers: headers of the request
+        :param timeout: tuple (connect, read) in seconds
+        :return: tuple with the response, the size of the sent body and the number of retries
+        """
+        if method != "post":
+            response = self._session.request(
+                method=method,
+                url=url,
+                params=params,
+                headers=headers,
+                timeout=timeout,
+                stream=True,
+            )
+            return response, 0, 0
+
+        body, body_headers = self._encode_body(params)
+        response = self._session.request(
+            method=method,
+            url=url,
+            data=body,
+            headers={**body_headers, **headers},
+            timeout=timeout,
+            stream=True,
+        )
+
+        if (
+            "Content-Encoding" not in body_headers
+            or response.status_code not in _COMPRESSION_REJECTED_STATUSES
+        ):
+            return response, len(body), 0
+
+        # The server might not accept compressed bodies, so the request is repeated
+        # uncompressed and the compression is switched off if that succeeds
+        response.close()
+        body, body_headers = self._encode_body(params, compress=False)
+        response = self._session.request(
+            method=method,
+            url=url,
+            data=body,
+            headers={**body_headers, **headers},
+            timeout=timeout,
+            stream=True,
+        )
+        if 200 <= response.status_code < 300:
+            self._compression = None
+        return response, len(body), 1
+
+    def _retry_delay(
+        self, kind: str, attempts: dict, url: str, retry_after: Optional[str] = None
+    ) -> Optional[float]:
+        """
+        Get the delay before the next attempt of a failed request.
+
+        :param kind: kind of the failure (see the retry module)
+        :param attempts: retries of the request done so far by the failure kind (updated)
+        :param url: the endpoint url of the API
+        :param retry_after: value of the Retry-After header of the response
+        :return: seconds to wait or None if the request should not be repeated
+        """
+        delay = self._retry.delay(kind, attempts.get(kind, 0), retry_after)
+        if delay is None:
+            return None
+
+        attempts[kind] = attempts.get(kind, 0) + 1
+        logger.info("Retrying %s (%s) in %.2fs", url, kind, delay)
+        if self._verbose:
+            print(f"Retrying {url} ({kind}) in {delay:.2f}s")
+        return delay
+
+    def do_request(
+        self,
+        url: str,
+        method: str,
+        params: dict = None,
+        header: dict = None,
+        decoder: Optional[StreamingDecoder] = None,
+        category: str = "metadata",
+        timeout: Optional[Timeout] = None,
+    ) -> object:
         """
         Generic function for performing the API request.
 
@@ -52,9 +507,18 @@ class Request:
         :param method: http method ("get", "put", "post", "patch", "delete")
         :param params: query parameters of the request (dictionary)
         :param header: additional header options
+        :param decoder: if given, the response body is streamed and parsed incrementally by
+                        the decoder instead of being loaded at once
+        :param category: category of the call that selects its timeouts (metadata, submit,
+                         status, result)
+        :param timeout: timeout overriding the one of the category, seconds or a tuple
+                        (connect, read)
         :return: object (json)
         :raises ValueError: if some parameters are in the work fmt
-        :raises HTTPError: if some Error occurred during the execution of the api request
+        :raises ApiError: if the request failed (after the retries of the transient failures)
+        :raises NotFoundError: if the API does not know the requested resource
+        :raises CircuitOpenError: if the circuit breaker of the endpoint is open
+        :raises ConnectionError: if the connection failed (after the retries)
         :raises PermissionError: if the user do not have enough permission for the execution of
                                  the API
         """
@@ -62,36 +526,101 @@ class Request:
             headers = self._auth_header
         else:
             headers = {**header, **self._auth_header}
+        headers = {"Accept-Encoding": self._accept_encoding, **headers}
         if method not in ("get", "put", "post", "patch", "delete"):
             raise ValueError(f"Wrong parameter for method argument: {method}")
+        timeout = self._timeout(category, timeout)
 
         if self._verbose:
-            print(f"Calling API {method}:{url} with params {params}")
-
-        if method == "post":
-            response = requests.request(
-                method=method, url=url, data=json.dumps(params), headers=headers, timeout=60
+            print(f"Calling API {method}:{url} with params {_VERBOSE_REPR.repr(params)}")
+
+        parts = urlsplit(url)
+        endpoint = parts.netloc + parts.path  # key of the circuit breaker
+        record = RequestRecord(parts.path, method)
+        attempts = {}  # retries by the kind of the failure
+        start = time.perf_counter()
+        try:
+            while True:
+                self._breaker.allow(endpoint)
+                attempt_start = time.perf_counter()
+                try:
+                    with collect_timings() as connection_timings:
+                        response, record.bytes_sent, fallback_retries = self._send(
+                            url, method, params, headers, timeout
+                        )
+                except requests.RequestException as err:
+                    self._breaker.record(endpoint, failed=True)
+                    if not isinstance(err, requests.ConnectionError):
+                        raise
+                    delay = self._retry_delay(CONNECTION_ERROR, attempts, url)
+                    if delay is None:
+                        raise
+                    record.retries += 1
+                    time.sleep(delay)
+                    continue
+                except BaseException:
+                    # Not a failure of the endpoint, a probe of a half-open one is given back
+                    self._breaker.release(endpoint)
+                    raise
+
+                record.retries += fallback_retries
+                record.status = status = response.status_code
+                self._breaker.record(endpoint, failed=status == 429 or status >= 500)
+                kind = self._retry.classify(status)
+                delay = None
+                if kind is not None:
+                    retry_after = response.headers.get("Retry-After")
+                    delay = self._retry_delay(kind, attempts, url, retry_after)
+                if delay is None:
+                    break
+
+                response.close()
+                record.retries += 1
+                time.sleep(delay)
+
+            record.timings.update(connection_timings)
+            record.timings["wait"] = max(
+                time.perf_counter() - attempt_start - sum(connection_timings.values()), 0.0
             )
-        else:
-            response = requests.request(
-                method=method, url=url, params=params, headers=headers, timeout=60
-            )
-        status = response.status_code
-
-        if self._verbose:
-            print(f"Response {response.status_code}")
 
-        if status == 401:
-            raise PermissionError(
-                "You do not have a proper credentials to access the requested endpoint."
-            )
-
-        if status < 200 or status >= 300:
-            raise ApiError(f"Error occurred during the execution of the request: {status}")
+            with response:
+                if self._verbose:
+                    print(f"Response {response.status_code}")
+
+                if status == 401:
+                    raise PermissionError(
+                        "You do not have a proper credentials to access the requested endpoint."
+                    )
+
+                if status == 404:
+                    raise NotFoundError(
+                        f"Error occurred during the execution of the request: {status}"
+                    )
+
+                if status < 200 or status >= 300:
+                    raise ApiError(f"Error occurred during the execution of the request: {status}")
+
+                transfer_start = time.perf_counter()
+                if decoder is not None:
+                    # The streamed body is decoded while it is transferred
+                    data = decoder.decode(response.iter_content(chunk_size=STREAM_CHUNK_SIZE))
+                    record.timings["transfer"] = time.perf_counter() - transfer_start
+                else:
+                    content = response.content
+                    decode_start = time.perf_counter()
+                    record.timings["transfer"] = decode_start - transfer_start
+                    data = self._codec.loads(content)
+                    record.timings["decode"] = time.perf_counter() - decode_start
+                record.bytes_received = _received_bytes(response)
+        except Exception as err:
+            record.error = type(err).__name__
+            raise
+        finally:
+            record.timings["total"] = time.perf_counter() - start
+            self._emit(record)
 
         if self._verbose:
-            print(f"Response body: {response.json()}")
-        data = response.json()
+            print(f"Response body: {_VERBOSE_REPR.repr(data)}")
 
         if data is None:
             raise ApiError("Error occurred during the execution of the request")
@@ -104,6 +633,9 @@ class Request:
         output_data: str = None,
         timeout: Optional[float] = None,
         wait: float = 5,
+        decoder: Optional[StreamingDecoder] = None,
+        on_status: Optional[Callable[[str], None]] = None,
+        request_timeout: Optional[Timeout] = None,
     ) -> object:
         """
          Wait for the job state is finished or an error during the job execution
@@ -115,6 +647,12 @@ class Request:
                 If no value is specified the one from the DB will be used.
         :param timeout: seconds to wait for a job (if None wait forever)
         :param wait: seconds between queries
+        :param decoder: if given, the responses are streamed and parsed by the decoder
+        :param on_status: function called with the job status after each query
+                          (while the circuit breaker of the endpoint is open, the queries
+                          are postponed until it lets the requests through again)
+        :param request_timeout: timeout of each query overriding the one of the result
+                                category, seconds or a tuple (connect, read)
         :return: json with job information (dict)
         :raises ApiError: if error in API communication occurred
         :raises TimeoutError: if timeout is exceeded
@@ -128,8 +666,37 @@ class Request:
         if self._verbose:
             print("Getting job result... ")
         while True:
-            data = self.do_request(API_QUERY_URL, method="get", params=params)
+            try:
+                data = self._coalesced(
+                    ("result", job_uuid, output_data),
+                    decoder,
+                    lambda: self.do_request(
+                        API_QUERY_URL,
+                        method="get",
+                        params=params,
+                        decoder=decoder,
+                        category="result",
+                        timeout=request_timeout,
+                    ),
+                    lambda data: data.get("status"),
+                )
+            except CircuitOpenError as err:
+                time_diff = time.time() - start
+                if timeout is not None and time_diff >= timeout:
+                    raise TimeoutError(f"Timeout while waiting for job {job_uuid}") from err
+                # The poller backs off while the endpoint is unavailable
+                delay = max(wait, err.retry_in)
+                if timeout is not None:
+                    delay = min(delay, timeout - time_diff)
+                if self._verbose:
+                    print(f"{time_diff:.3}s : API unavailable, next query in {delay:.3}s")
+                time.sleep(delay)
+                continue
+
             job_status = data["status"]
+            self._observe_status(job_uuid, job_status)
+            if on_status is not None:
+                on_status(job_status)
 
             time_diff = time.time() - start
             if self._verbose:
@@ -152,10 +719,19 @@ class Request:
         ini_noise: bool = False,
         ini: Union[str, list[np.complexfloating]] = None,
         physical_params: str = None,
+        idempotency_key: Optional[str] = None,
+        request_timeout: Optional[Timeout] = None,
+        tenant: Optional[str] = None,
+        priority: Union[str, int, None] = None,
     ) -> tuple:
         """
         Call the API to start the job.
 
+        With a journal the submission is recorded before the request is sent and the job
+        uuid before the method returns. A submission already recorded in the journal is
+        reattached to its job instead of being sent again. With a dispatch queue the request
+        is sent once the queue gives the submission a free job slot.
+
         :param qasm_str: QASM string with transpiled quantum circuit
         :param shots: Number of shots for the simulation
         :param result: what is desired output (statevector, counts, density_matrix)
@@ -163,6 +739,14 @@ class Request:
         :param ini_noise: specify if we want to apply a noise to the initialisation of the circuit
         :param ini: initial state of the circuit as a string (label) or array of complex numbers
         :param physical_params: stringify json with physical parameters
+        :param idempotency_key: key that identifies the submission, the retries of the request
+                                carry the same key, so they cannot create duplicate jobs
+                                (a random key if None)
+        :param request_timeout: timeout overriding the one of the submit category, seconds or
+                                a tuple (connect, read)
+        :param tenant: tenant the job is dispatched for (with a dispatch queue)
+        :param priority: priority class of the job, interactive, normal or batch (with a
+                         dispatch queue)
         :return: tuple str (job uuid) and transpiled qasm str
         :raises ApiError: if unexpected API error happened
         """
@@ -186,13 +770,69 @@ class Request:
         if physical_params is not None:
             params["physical_params"] = physical_params
 
-        data = self.do_request(API_QUERY_URL, method="post", params=params)
+        entry = None
+        if self._journal is not None:
+            entry = self._journal.claim(
+                request_hash(params),
+                idempotency_key,
+                backend_name=backend_name,
+                shots=shots,
+                result=result,
+            )
+            if entry.is_started:
+                return entry.job_uuid, entry.transpiled
+            # A submission sent before a crash is sent again with its key
+            idempotency_key = entry.key
+
+        if idempotency_key is None:
+            idempotency_key = str(uuid.uuid4())
+
+        ticket = None
+        if self._dispatch is not None:
+            ticket = self._dispatch.acquire(self, tenant, priority)
+
+        try:
+            data = self.do_request(
+                API_QUERY_URL,
+                method="post",
+                params=params,
+                header={"Idempotency-Key": idempotency_key},
+                category="submit",
+                timeout=request_timeout,
+            )
+
+            if "job_uuid" not in data or "transpiled" not in data:
+                raise ApiError("Unexpected error when starting a job")
+        except BaseException:
+            if ticket is not None:
+                self._dispatch.release(ticket)
+            raise
+
+        if ticket is not None:
+            self._dispatch.started(ticket, data["job_uuid"])
 
-        if "job_uuid" not in data or "transpiled" not in data:
-            raise ApiError("Unexpected error when starting a job")
+        if entry is not None:
+            self._journal.started(entry, data["job_uuid"], data["transpiled"])
 
         return data["job_uuid"], data["transpiled"]
 
+    def start_jobs(self, jobs: List[dict], max_workers: Optional[int] = None) -> List[tuple]:
+        """
+        Start several jobs concurrently.
+
+        :param jobs: list of dictionaries with the keyword arguments of the start_job method
+        :param max_workers: maximum number of parallel submissions (C12_SUBMIT_WORKERS if None)
+        :return: list of tuples (job uuid, transpiled qasm str) in the order of the input jobs
+        :raises SubmissionError: if some of the jobs were started and the others were not (the
+                                 error carries the started ones)
+        :raises ApiError: if unexpected API error happened for all the jobs
+        """
+        if len(jobs) == 0:
+            return []
+
+        max_workers = SUBMIT_WORKERS if max_workers is None else max_workers
+        return start_concurrently(lambda job: self.start_job(**job), jobs, max_workers)
+
     def get_maxjobs(self) -> int:
         """
         Call to the API to get the maximum number of jobs per user.
@@ -234,34 +874,73 @@ class Request:
             raise ApiError("Unexpected error getting available system backends.")
         return data["backends"]
 
-    def get_job_status(self, job_uuid: str) -> str:
+    def get_job_status(self, job_uuid: str, request_timeout: Optional[Timeout] = None) -> str:
         """
-        Get the status of a running job.
+        Get the status of a running job. The concurrent identical queries share one request,
+        a non-final status is reused for coalesce_ttl seconds.
 
         :param job_uuid: job uuid
+        :param request_timeout: timeout overriding the one of the status category, seconds or
+                                a tuple (connect, read)
         :return: status of a job
         """
         params = {"job_uuid": job_uuid}
-        data = self.do_request(API_JOB_STATUS_URL, method="get", params=params)
+        data = self._coalesced(
+            ("status", job_uuid),
+            None,
+            lambda: self.do_request(
+                API_JOB_STATUS_URL,
+                method="get",
+                params=params,
+                category="status",
+                timeout=request_timeout,
+            ),
+            lambda data: data.get("status"),
+        )
 
         if "status" not in data:
             raise ApiError("Unexpected error getting available system backends.")
 
+        self._observe_status(job_uuid, data["status"])
         return data["status"]
 
-    def get_job(self, job_uuid: str) -> dict:
+    def get_job(
+        self,
+        job_uuid: str,
+        decoder: Optional[StreamingDecoder] = None,
+        request_timeout: Optional[Timeout] = None,
+    ) -> dict:
         """
-        Get a specific job with a given uuid.
+        Get a specific job with a given uuid. The concurrent identical queries share one
+        request (and the returned dictionary), a job with a non-final status is reused for
+        coalesce_ttl seconds.
 
         :param job_uuid: job_id
+        :param decoder: if given, the response is streamed and parsed by the decoder
+        :param request_timeout: timeout overriding the one of the result category, seconds or
+                                a tuple (connect, read)
         :return: dict of job data
         """
         params = {"job_uuid": job_uuid}
-        data = self.do_request(API_GET_JOB, method="get", params=params)
+        data = self._coalesced(
+            ("job", job_uuid),
+            decoder,
+            lambda: self.do_request(
+                API_GET_JOB,
+                method="get",
+                params=params,
+                decoder=decoder,
+                category="result",
+                timeout=request_timeout,
+            ),
+            lambda data: (data.get("job") or {}).get("status"),
+        )
 
         if "job" not in data:
             raise ApiError("Unexpected error getting available system backends.")
 
+        if data["job"] is not None:
+            self._observe_status(job_uuid, data["job"].get("status"))
         return data["job"]
 
     def get_user_jobs(self, limit: int, offset: int) -> list:
@@ -0,0 +1,102 @@
+"""
+  Coalescing of the identical API calls.
+
+  Concurrent identical calls share a single request: the first caller performs it and the
+  others wait for its outcome. The outcome can be kept for a short time (micro-TTL), so the
+  callers that come right after also reuse it.
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+
+class _Call:
+    """Request in flight."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Group of the coalesced calls."""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._cache: Dict[Hashable, Tuple[object, float]] = {}
+        self._lock = threading.Lock()
+
+    def do(
+        self,
+        key: Hashable,
+        function: Callable[[], object],
+        ttl: Optional[Callable[[object], float]] = None,
+    ) -> object:
+        """
+        Call a function unless an identical call is in flight or its result is still fresh.
+
+        :param key: key identifying the identical calls
+        :param function: function performing the call
+        :param ttl: function result -> seconds the result is reused for (0 or None to share it
+                    only with the concurrent calls)
+        :return: result of the function
+        :raises Exception: the error raised by the function (also to the waiting callers)
+        """
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and cached[1] > time.monotonic():
+                return cached[0]
+
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        seconds = 0
+        try:
+            try:
+                call.result = function()
+                if ttl is not None:
+                    seconds = ttl(call.result)
+            except BaseException as err:
+                call.error = err
+                raise
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                    if seconds > 0 and call.error is None:
+                        self._purge()
+                        self._cache[key] = (call.result, time.monotonic() + seconds)
+                    else:
+                        self._cache.pop(key, None)
+        finally:
+            # The waiting callers are woken up whatever happened to the leader
+            call.done.set()
+
+        return call.result
+
+    def _purge(self) -> None:
+        now = time.monotonic()
+        for key in [key for key, (_, expires) in self._cache.items() if expires <= now]:
+            del self._cache[key]
+
+    def forget(self, key: Optional[Hashable] = None) -> None:
+        """
+        Drop a cached result.
+
+        :param key: key of the call, all the results if None
+        :return: None
+        """
+        with self._lock:
+            if key is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(key, None)
@@ -0,0 +1,98 @@
+"""
+  JSON codecs used for the request bodies and the responses of the C12 sim APIs.
+
+  The fastest available codec is selected automatically (orjson if it is installed,
+  otherwise the standard library json module). The choice can be overridden with the
+  C12_JSON_CODEC environment variable or per Request instance.
+"""
+
+import json
+from typing import Dict, Optional, Union
+
+from c12_callisto_clients.api.configs import JSON_CODEC
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+class JsonCodec:
+    """Standard library JSON codec, also the base class of the other codecs."""
+
+    name = "json"
+
+    def dumps(self, obj: object) -> Union[str, bytes]:
+        """
+        Serialize an object into a JSON document.
+
+        :param obj: object to serialize
+        :return: JSON document (str or UTF-8 encoded bytes)
+        """
+        return json.dumps(obj)
+
+    def loads(self, data: Union[str, bytes]) -> object:
+        """
+        Parse a JSON document.
+
+        :param data: JSON document (str or UTF-8 encoded bytes)
+        :return: parsed object
+        """
+        return json.loads(data)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}()"
+
+
+class OrjsonCodec(JsonCodec):
+    """JSON codec based on the orjson package."""
+
+    name = "orjson"
+
+    def dumps(self, obj: object) -> bytes:
+        return orjson.dumps(obj)
+
+    def loads(self, data: Union[str, bytes]) -> object:
+        return orjson.loads(data)
+
+
+# Available codecs, in the order of preference of the automatic selection
+CODECS: Dict[str, JsonCodec] = {}
+if orjson is not None:
+    CODECS[OrjsonCodec.name] = OrjsonCodec()
+CODECS[JsonCodec.name] = JsonCodec()
+
+
+def register_codec(codec: JsonCodec, preferred: bool = False) -> None:
+    """
+    Make a codec available for the selection.
+
+    :param codec: codec instance
+    :param preferred: if True the codec is preferred by the automatic selection
+    :return: None
+    """
+    if preferred:
+        others = {name: item for name, item in CODECS.items() if name != codec.name}
+        CODECS.clear()
+        CODECS.update({codec.name: codec, **others})
+    else:
+        CODECS[codec.name] = codec
+
+
+def get_codec(name: Optional[str] = None) -> JsonCodec:
+    """
+    Get a JSON codec by name.
+
+    :param name: name of the codec ("orjson", "json") or "auto" for the fastest available one
+                 (C12_JSON_CODEC if None)
+    :return: JsonCodec instance
+    :raises ValueError: if the codec is not available
+    """
+    name = JSON_CODEC if name is None else name
+    if name == "auto":
+        return next(iter(CODECS.values()))
+    if name not in CODECS:
+        raise ValueError(
+            f"JSON codec {name} is not available, available codecs: {', '.join(CODECS)}"
+        )
+    return CODECS[name]
@@ -3,23 +3,120 @@
 """
 
 import os
+from typing import Dict, Optional
 
 
 HOST_URL = os.getenv("C12_HOST_URL", "api.callisto.c12qe.net")
 PORT = os.getenv("C12_PORT", None)
 PROTOCOL = os.getenv("C12_PROTOCOL", "https")
 
-API_BASE_URL = f"{PROTOCOL}://{HOST_URL}{'' if PORT is None else ':'+str(PORT)}/api"
 
+def api_urls(protocol: str, host_url: str, port: Optional[str] = None) -> Dict[str, str]:
+    """
+    Build the URLs of the API endpoints of a host.
 
-API_SIMULATOR_URL = API_BASE_URL + "/c12sim"
-API_HEALTH_URL = API_BASE_URL + "/health"
+    :param protocol: http or https
+    :param host_url: host name (or address) of the API
+    :param port: port of the API (the default port of the protocol if None)
+    :return: dictionary with the names of the URL constants of this module and the URLs
+    """
+    base_url = f"{protocol}://{host_url}{'' if port is None else ':'+str(port)}/api"
+    simulator_url = base_url + "/c12sim"
+    query_url = simulator_url + "/query"
+    return {
+        "API_BASE_URL": base_url,
+        "API_SIMULATOR_URL": simulator_url,
+        "API_HEALTH_URL": base_url + "/health",
+        "API_QUERY_URL": query_url,
+        "API_BACKENDS_URL": simulator_url + "/backends",
+        "API_PARAMS_URL": simulator_url + "/params",
+        "API_MAXJOBS_URL": simulator_url + "/maxjobs",
+        "API_JOB_STATUS_URL": query_url + "/status",
+        "API_USER_JOBS": simulator_url + "/jobs",
+        "API_GET_JOB": simulator_url + "/job",
+    }
 
 
-API_QUERY_URL = API_SIMULATOR_URL + "/query"
-API_BACKENDS_URL = API_SIMULATOR_URL + "/backends"
-API_PARAMS_URL = API_SIMULATOR_URL + "/params"
-API_MAXJOBS_URL = API_SIMULATOR_URL + "/maxjobs"
-API_JOB_STATUS_URL = API_QUERY_URL + "/status"
-API_USER_JOBS = API_SIMULATOR_URL + "/jobs"
-API_GET_JOB = API_SIMULATOR_URL + "/job"
+_URLS = api_urls(PROTOCOL, HOST_URL, PORT)
+
+API_BASE_URL = _URLS["API_BASE_URL"]
+
+
+API_SIMULATOR_URL = _URLS["API_SIMULATOR_URL"]
+API_HEALTH_URL = _URLS["API_HEALTH_URL"]
+
+
+API_QUERY_URL = _URLS["API_QUERY_URL"]
+API_BACKENDS_URL = _URLS["API_BACKENDS_URL"]
+API_PARAMS_URL = _URLS["API_PARAMS_URL"]
+API_MAXJOBS_URL = _URLS["API_MAXJOBS_URL"]
+API_JOB_STATUS_URL = _URLS["API_JOB_STATUS_URL"]
+API_USER_JOBS = _URLS["API_USER_JOBS"]
+API_GET_JOB = _URLS["API_GET_JOB"]
+
+
+# Number of parallel submissions used when a batch of jobs is started at once
+SUBMIT_WORKERS = int(os.getenv("C12_SUBMIT_WORKERS", "8"))
+
+# Limits used by the pre-flight job estimation (in bytes)
+MAX_RESPONSE_BYTES = int(os.getenv("C12_MAX_RESPONSE_BYTES", str(512 * 1024**2)))
+MAX_DECODE_BYTES = int(os.getenv("C12_MAX_DECODE_BYTES", str(4 * 1024**3)))
+
+# JSON codec of the API requests and responses ("auto", "orjson" or "json")
+JSON_CODEC = os.getenv("C12_JSON_CODEC", "auto")
+
+# Compression of the request bodies ("gzip", "deflate" or "none"), bodies smaller than
+# C12_COMPRESS_MIN_BYTES are sent uncompressed. It is off by default, it should be turned on
+# only for the servers known to accept the compressed bodies.
+REQUEST_COMPRESSION = os.getenv("C12_REQUEST_COMPRESSION", "none")
+COMPRESS_MIN_BYTES = int(os.getenv("C12_COMPRESS_MIN_BYTES", "16384"))
+# Encodings of the responses that are accepted from the server ("identity" for none)
+ACCEPT_ENCODING = os.getenv("C12_ACCEPT_ENCODING", "gzip, deflate")
+
+# Size of the chunks in which the streamed responses are read (in bytes)
+STREAM_CHUNK_SIZE = int(os.getenv("C12_STREAM_CHUNK_SIZE", str(1024**2)))
+
+# Retries of the transient failures (rate limiting, 5xx statuses and connection errors) and
+# the exponential backoff between them (in seconds)
+RETRY_RATE_LIMITED = int(os.getenv("C12_RETRY_RATE_LIMITED", "5"))
+RETRY_SERVER_ERRORS = int(os.getenv("C12_RETRY_SERVER_ERRORS", "3"))
+RETRY_CONNECTION_ERRORS = int(os.getenv("C12_RETRY_CONNECTION_ERRORS", "3"))
+RETRY_BACKOFF = float(os.getenv("C12_RETRY_BACKOFF", "0.5"))
+RETRY_MAX_BACKOFF = float(os.getenv("C12_RETRY_MAX_BACKOFF", "60"))
+
+# Circuit breaker: an endpoint is opened when at least C12_BREAKER_FAILURE_RATE of the last
+# C12_BREAKER_WINDOW requests failed (with at least C12_BREAKER_MIN_REQUESTS of them), the
+# requests are let through again after C12_BREAKER_RESET_TIMEOUT seconds
+BREAKER_WINDOW = int(os.getenv("C12_BREAKER_WINDOW", "20"))
+BREAKER_MIN_REQUESTS = int(os.getenv("C12_BREAKER_MIN_REQUESTS", "10"))
+BREAKER_FAILURE_RATE = float(os.getenv("C12_BREAKER_FAILURE_RATE", "0.5"))
+BREAKER_RESET_TIMEOUT = float(os.getenv("C12_BREAKER_RESET_TIMEOUT", "30"))
+
+# Connect and read timeouts (in seconds) of the categories of the API calls: metadata
+# (backends, parameters, limits), submit (start of a job), status (job status checks) and
+# result (job data and results), e.g. C12_STATUS_CONNECT_TIMEOUT and C12_RESULT_READ_TIMEOUT
+TIMEOUT_CATEGORIES = ("metadata", "submit", "status", "result")
+_DEFAULT_TIMEOUTS = {
+    "metadata": (5.0, 10.0),
+    "submit": (5.0, 60.0),
+    "status": (2.0, 5.0),
+    "result": (5.0, 300.0),
+}
+TIMEOUTS = {
+    category: (
+        float(os.getenv(f"C12_{category.upper()}_CONNECT_TIMEOUT", str(connect))),
+        float(os.getenv(f"C12_{category.upper()}_READ_TIMEOUT", str(read))),
+    )
+    for category, (connect, read) in _DEFAULT_TIMEOUTS.items()
+}
+
+# Seconds a non-final job status is reused by the identical status and job queries
+# (0 to coalesce only the concurrent queries)
+COALESCE_TTL = float(os.getenv("C12_COALESCE_TTL", "0.25"))
+
+# Directory the cProfile statistics of the submissions and the result processing are written
+# to (the profiling is off if not set)
+PROFILE_DIR = os.getenv("C12_PROFILE_DIR", None)
+
+# Path of the journal the job submissions are recorded to (the journaling is off if not set)
+JOURNAL = os.getenv("C12_JOURNAL", None)
@@ -0,0 +1,338 @@
+"""
+  Client-side dispatch queue of the job submissions.
+
+  The submissions of all the users of a Request (e.g. several teams of a service sharing one
+  token) wait in a queue until one of the job slots of the token is free; the number of slots
+  is the maximum number of the user jobs (get_maxjobs). A slot is taken when the submission is
+  sent and freed when a final status of its job is seen, either by the status queries of the
+  frontends or by the queue itself while submissions are waiting.
+
+  The free slots go to the waiting submissions of the highest priority class first
+  (interactive, normal, batch). Within a class the tenants share the slots in proportion to
+  their weights (start-time fair queuing), so a large sweep of one tenant does not delay the
+  jobs of the others by more than their share.
+
+  A job that is not found by the API (e.g. it was deleted) keeps its slot only until a given
+  number of consecutive status queries did not find it. Other failures of the status queries
+  (e.g. an outage of the API) do not free the slots.
+"""
+
+import itertools
+import threading
+import time
+from typing import Dict, List, Optional, Union
+
+from c12_callisto_clients.api.exceptions import ApiError, CircuitOpenError, NotFoundError
+
+
+# Priority classes, the lower rank is dispatched first
+PRIORITIES = {"interactive": 0, "normal": 1, "batch": 2}
+
+# Tenant of the submissions that do not specify one
+DEFAULT_TENANT = "default"
+
+_FINAL_STATUSES = ("FINISHED", "ERROR", "CANCELLED")
+
+
+def priority_rank(priority: Union[str, int, None]) -> int:
+    """
+    Get the rank of a priority class.
+
+    :param priority: name of the class (interactive, normal, batch), its rank or None (normal)
+    :return: rank, the lower rank is dispatched first
+    :raises ValueError: if the class is unknown
+    """
+    if priority is None:
+        return PRIORITIES["normal"]
+    if isinstance(priority, int):
+        return priority
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown priority {priority} (use {', '.join(PRIORITIES)})")
+    return PRIORITIES[priority]
+
+
+class DispatchTicket:
+    """Submission waiting for or holding a job slot."""
+
+    def __init__(self, tenant: str, rank: int, seq: int, tag: float, cost: float = 1.0):
+        """
+        :param tenant: tenant of the submission
+        :param rank: rank of the priority class
+        :param seq: order of arrival
+        :param tag: virtual start time of the submission within its class
+        :param cost: virtual time of the submission (inverse of the weight of the tenant)
+        """
+        self.tenant = tenant
+        self.rank = rank
+        self.seq = seq
+        self.tag = tag
+        self.cost = cost
+        self.granted = False
+        self.job_uuid: Optional[str] = None
+
+    def __repr__(self):
+        state = self.job_uuid or ("granted" if self.granted else "waiting")
+        return f"DispatchTicket({self.tenant}, rank={self.rank}, {state})"
+
+
+class DispatchQueue:
+    """Priority and weighted fair share queue of the job submissions."""
+
+    def __init__(
+        self,
+        capacity: Optional[int] = None,
+        weights: Optional[Dict[str, float]] = None,
+        refresh_interval: float = 2.0,
+        max_status_failures: int = 5,
+    ):
+        """
+        :param capacity: number of the job slots, the maximum number of the user jobs
+                         (get_maxjobs) if None
+        :param weights: weights of the tenants (1 for the tenants not given)
+        :param refresh_interval: seconds between the status queries of the jobs in flight
+                                 while submissions are waiting for a slot
+        :param max_status_failures: number of the consecutive status queries not finding a job
+                                    (e.g. a deleted job) after which its slot is freed
+        """
+        if max_status_failures < 1:
+            raise ValueError(
+                f"Parameter max_status_failures has to be positive ({max_status_failures})"
+            )
+        self._capacity = capacity
+        self._weights = dict(weights or {})
+        self._refresh_interval = refresh_interval
+        self._max_status_failures = max_status_failures
+        self._cond = threading.Condition()
+        self._waiting: List[DispatchTicket] = []
+        self._slots = 0  # granted tickets whose jobs did not finish yet
+        self._jobs: Dict[str, DispatchTicket] = {}
+        self._status_failures: Dict[str, int] = {}  # consecutive queries not finding a job
+        self._clock: Dict[int, float] = {}  # virtual time of each priority class
+        self._finish: Dict[tuple, float] = {}  # last virtual finish time of (rank, tenant)
+        self._seq = itertools.count()
+        self._refreshing = False
+        self._next_refresh = 0.0
+
+    @property
+    def capacity(self) -> Optional[int]:
+        """
+        Getter for the number of the job slots.
+
+        :return: number of slots or None if it was not obtained from the API yet
+        """
+        return self._capacity
+
+    @property
+    def in_flight(self) -> int:
+        """
+        Getter for the number of the taken slots.
+
+        :return: number of the submissions being sent and the jobs not known to be finished
+        """
+        with self._cond:
+            return self._slots
+
+    def waiting(self) -> Dict[str, int]:
+        """
+        Get the number of the waiting submissions of each tenant.
+
+        :return: dictionary tenant -> number of submissions
+        """
+        with self._cond:
+            counts: Dict[str, int] = {}
+            for ticket in self._waiting:
+                counts[ticket.tenant] = counts.get(ticket.tenant, 0) + 1
+            return counts
+
+    def set_weight(self, tenant: str, weight: float) -> None:
+        """
+        Set the weight of a tenant (its share of the slots relative to the other tenants).
+
+        :param tenant: tenant
+        :param weight: positive weight
+        :return: None
+        """
+        if weight <= 0:
+            raise ValueError(f"Weight has to be positive ({weight})")
+        with self._cond:
+            self._weights[tenant] = weight
+
+    def _grant(self) -> None:
+        """Give the free slots to the waiting submissions (called with the lock held)."""
+        granted = False
+        while self._waiting and self._slots < self._capacity:
+            ticket = min(self._waiting, key=lambda item: (item.rank, item.tag, item.seq))
+            self._waiting.remove(ticket)
+            self._clock[ticket.rank] = max(self._clock.get(ticket.rank, 0.0), ticket.tag)
+            ticket.granted = True
+            self._slots += 1
+            granted = True
+        if granted:
+            self._cond.notify_all()
+
+    def _free(self) -> None:
+        """Free a slot (called with the lock held)."""
+        self._slots -= 1
+        self._grant()
+
+    def _withdraw(self, ticket: DispatchTicket) -> None:
+        """Remove a waiting ticket and give its virtual time back (called with the lock held)."""
+        self._waiting.remove(ticket)
+        key = (ticket.rank, ticket.tenant)
+        # The later submissions of the tenant were queued behind the withdrawn one
+        for other in self._waiting:
+            if (other.rank, other.tenant) == key and other.tag > ticket.tag:
+                other.tag -= ticket.cost
+        self._finish[key] -= ticket.cost
+
+    def acquire(
+        self,
+        client,
+        tenant: Optional[str] = None,
+        priority: Union[str, int, None] = None,
+        timeout: Optional[float] = None,
+    ) -> DispatchTicket:
+        """
+        Wait for a job slot.
+
+        :param client: Request used to get the maximum number of the user jobs and the
+                       statuses of the jobs in flight
+        :param tenant: tenant of the submission (DEFAULT_TENANT if None)
+        :param priority: priority class of the submission (normal if None)
+        :param timeout: seconds to wait for the slot (if None wait forever)
+        :return: granted ticket, passed to started() or release() after the submission
+        :raises TimeoutError: if timeout is exceeded
+        :raises ApiError: if the maximum number of the user jobs could not be obtained
+        """
+        rank = priority_rank(priority)
+        tenant = DEFAULT_TENANT if tenant is None else tenant
+        if self._capacity is None:
+            capacity = client.get_maxjobs()
+            with self._cond:
+                if self._capacity is None:
+                    self._capacity = max(int(capacity), 1)
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            key = (rank, tenant)
+            start = max(self._clock.get(rank, 0.0), self._finish.get(key, 0.0))
+            cost = 1.0 / self._weights.get(tenant, 1.0)
+            self._finish[key] = start + cost
+            ticket = DispatchTicket(tenant, rank, next(self._seq), start, cost)
+            self._waiting.append(ticket)
+
+        try:
+            while True:
+                with self._cond:
+                    self._grant()
+                    if ticket.granted:
+                        return ticket
+
+                    now = time.monotonic()
+                    if deadline is not None and now >= deadline:
+                        raise TimeoutError("Timeout while waiting for a free job slot")
+
+                    refresh = not self._refreshing and now >= self._next_refresh
+                    if refresh:
+                        self._refreshing = True
+                    else:
+                        delay = max(self._next_refresh - now, 0.05)
+                        if deadline is not None:
+                            delay = min(delay, deadline - now)
+                        self._cond.wait(delay)
+                        continue
+
+                # The statuses are queried outside the lock, the other waiters keep waiting
+                interval = self._refresh_interval
+                try:
+                    interval = self.refresh(client)
+                finally:
+                    with self._cond:
+                        self._refreshing = False
+                        self._next_refresh = time.monotonic() + interval
+        except BaseException:
+            # The caller gave up (timeout, failed status query, interrupt), so the ticket must
+            # neither wait for nor hold a slot
+            with self._cond:
+                if ticket in self._waiting:
+                    self._withdraw(ticket)
+            self.release(ticket)
+            raise
+
+    def started(self, ticket: DispatchTicket, job_uuid: str) -> None:
+        """
+        Record the job started with a slot, the slot is freed when the job finishes.
+
+        :param ticket: granted ticket
+        :param job_uuid: uuid of the started job
+        :return: None
+        """
+        with self._cond:
+            ticket.job_uuid = job_uuid
+            self._jobs[job_uuid] = ticket
+
+    def release(self, ticket: DispatchTicket) -> None:
+        """
+        Free the slot of a submission that did not start a job.
+
+        :param ticket: granted ticket
+        :return: None
+        """
+        with self._cond:
+            if ticket.granted and ticket.job_uuid is None:
+                ticket.granted = False
+                self._free()
+
+    def observe(self, job_uuid: str, status: Optional[str]) -> None:
+        """
+        Record a status of a job, a final status frees the slot of the job.
+
+        :param job_uuid: job uuid
+        :param status: API status of the job
+        :return: None
+        """
+        if status is None:
+            return
+        with self._cond:
+            self._status_failures.pop(job_uuid, None)
+            if str(status).upper() not in _FINAL_STATUSES:
+                return
+            ticket = self._jobs.pop(job_uuid, None)
+            if ticket is not None:
+                self._free()
+
+    def refresh(self, client) -> float:
+        """
+        Query the statuses of the jobs in flight and free the slots of the finished ones and
+        of the ones that were not found max_status_failures times in a row. The jobs keep their
+        slots while the statuses cannot be queried (e.g. an outage of the API).
+
+        :param client: Request used to get the statuses
+        :return: seconds to wait before the next query of the statuses
+        """
+        with self._cond:
+            job_uuids = list(self._jobs)
+        for job_uuid in job_uuids:
+            try:
+                self.observe(job_uuid, client.get_job_status(job_uuid))
+            except NotFoundError:
+                # The job keeps its slot until its status is known or it seems to be gone
+                with self._cond:
+                    failures = self._status_failures.get(job_uuid, 0) + 1
+                    if failures < self._max_status_failures:
+                        self._status_failures[job_uuid] = failures
+                    else:
+                        self._status_failures.pop(job_uuid, None)
+                        if self._jobs.pop(job_uuid, None) is not None:
+                            self._free()
+            except CircuitOpenError as err:
+                # The statuses are queried again when the endpoint lets the requests through
+                return max(self._refresh_interval, err.retry_in)
+            except ApiError:
+                # A transient failure of the API (after the retries of the client), the other
+                # queries would most likely fail too
+                return self._refresh_interval
+        return self._refresh_interval
+
+    def __repr__(self):
+        return f"DispatchQueue(capacity={self._capacity}, in_flight={self._slots})"
@@ -0,0 +1,204 @@
+"""
+  Pre-flight estimation of the size and the cost of a job.
+"""
+
+import math
+import warnings
+from typing import List, Optional, Union
+import numpy as np
+
+from c12_callisto_clients.api.configs import MAX_RESPONSE_BYTES, MAX_DECODE_BYTES
+from c12_callisto_clients.api.exceptions import JobTooLargeError
+
+
+# Approximate size of a single complex number in the JSON payload, e.g. "(-0.7073+5.77e-05j)"
+BYTES_PER_JSON_AMPLITUDE = 48
+# Approximate size of a single complex number produced by np.array2string in the request
+BYTES_PER_INI_AMPLITUDE = 28
+# Memory of a Python string object holding a complex number during the decoding
+BYTES_PER_DECODED_STRING = 100
+# Memory of a decoded complex128 number
+BYTES_PER_COMPLEX = 16
+
+# Order in which the outputs are dropped when a cheaper output set is suggested
+_EXPENSIVE_OUTPUTS = ("density_matrix", "states", "statevector")
+
+
+def parse_outputs(outputs: Union[str, List[str]]) -> List[str]:
+    """
+    Function to normalise the requested outputs of a job.
+
+    :param outputs: comma separated string or list of outputs
+    :return: list of outputs
+    """
+    if isinstance(outputs, str):
+        outputs = outputs.split(",")
+    return [output.strip() for output in outputs if output.strip()]
+
+
+class JobEstimate:
+    """
+    Estimate of the resources needed for a job. All sizes are in bytes and they are
+    rough upper bounds based on the JSON format of the C12 API. The relative cost is
+    a unitless number that can be used to compare jobs with each other.
+    """
+
+    def __init__(
+        self,
+        n_qubits: int,
+        shots: int,
+        outputs: Union[str, List[str]],
+        n_barriers: int = 0,
+        n_operations: int = 0,
+        ini: Union[str, list, np.ndarray, None] = None,
+    ):
+        """
+        :param n_qubits: number of qubits of the circuit
+        :param shots: number of shots
+        :param outputs: requested outputs (counts, statevector, density_matrix, states)
+        :param n_barriers: number of barriers (mid-circuit states are returned for each)
+        :param n_operations: number of operations of the circuit
+        :param ini: initial state of the circuit (label or statevector)
+        """
+        self.n_qubits = n_qubits
+        self.shots = shots
+        self.outputs = parse_outputs(outputs)
+        self.n_barriers = n_barriers
+        self.n_operations = n_operations
+
+        dim = 2**n_qubits
+        n_amplitudes = 0
+        if "statevector" in self.outputs:
+            n_amplitudes += dim
+        if "density_matrix" in self.outputs:
+            n_amplitudes += dim**2
+        if "states" in self.outputs:
+            n_amplitudes += n_barriers * (dim + dim**2)
+        self.n_amplitudes = n_amplitudes
+
+        counts_bytes = 0
+        if "counts" in self.outputs:
+            counts_bytes = min(shots, dim) * (n_qubits + 6 + len(str(shots)))
+
+        self.response_bytes = counts_bytes + n_amplitudes * BYTES_PER_JSON_AMPLITUDE
+
+        self.request_bytes = 0
+        if ini is not None and not isinstance(ini, str):
+            self.request_bytes = len(ini) * BYTES_PER_INI_AMPLITUDE
+
+        # Raw body, the decoded JSON strings and the final arrays are all alive at the peak
+        self.decode_memory_bytes = self.response_bytes + n_amplitudes * (
+            BYTES_PER_DECODED_STRING + BYTES_PER_COMPLEX
+        )
+
+        # Density matrix outputs require the simulation of the full density matrix
+        density = "density_matrix" in self.outputs or "states" in self.outputs
+        state_size = dim**2 if density else dim
+        self.relative_cost = max(n_operations, 1) * state_size + shots
+
+    def problems(
+        self,
+        max_response_bytes: Optional[int] = None,
+        max_decode_bytes: Optional[int] = None,
+    ) -> List[str]:
+        """
+        Check the estimate against the limits.
+
+        :param max_response_bytes: maximum size of the response (C12_MAX_RESPONSE_BYTES if None)
+        :param max_decode_bytes: maximum client decode memory (C12_MAX_DECODE_BYTES if None)
+        :return: list of descriptions of the exceeded limits, empty if none
+        """
+        if max_response_bytes is None:
+            max_response_bytes = MAX_RESPONSE_BYTES
+        max_decode_bytes = MAX_DECODE_BYTES if max_decode_bytes is None else max_decode_bytes
+
+        problems = []
+        if self.response_bytes > max_response_bytes:
+            problems.append(
+                f"response size {_format_bytes(self.response_bytes)} exceeds "
+                f"{_format_bytes(max_response_bytes)}"
+            )
+        if self.decode_memory_bytes > max_decode_bytes:
+            problems.append(
+                f"decode memory {_format_bytes(self.decode_memory_bytes)} exceeds "
+                f"{_format_bytes(max_decode_bytes)}"
+            )
+        return problems
+
+    def suggest_outputs(
+        self,
+        max_response_bytes: Optional[int] = None,
+        max_decode_bytes: Optional[int] = None,
+    ) -> Optional[str]:
+        """
+        Suggest a cheaper set of outputs that fits into the limits, by dropping the most
+        expensive outputs first.
+
+        :return: comma separated outputs or None if even the counts do not fit
+        """
+        outputs = list(self.outputs)
+        for output in _EXPENSIVE_OUTPUTS:
+            if output not in outputs:
+                continue
+            outputs.remove(output)
+            if not outputs:
+                break
+            estimate = JobEstimate(
+                self.n_qubits, self.shots, outputs, self.n_barriers, self.n_operations
+            )
+            if not estimate.problems(max_response_bytes, max_decode_bytes):
+                return ",".join(outputs)
+
+        if "counts" not in self.outputs:
+            estimate = JobEstimate(self.n_qubits, self.shots, "counts")
+            if not estimate.problems(max_response_bytes, max_decode_bytes):
+                return "counts"
+        return None
+
+    def check(
+        self,
+        mode: str = "warn",
+        max_response_bytes: Optional[int] = None,
+        max_decode_bytes: Optional[int] = None,
+    ) -> None:
+        """
+        Warn or refuse if the job exceeds the limits.
+
+        :param mode: "warn" to emit a warning or "error" to raise an exception
+        :param max_response_bytes: maximum size of the response (C12_MAX_RESPONSE_BYTES if None)
+        :param max_decode_bytes: maximum client decode memory (C12_MAX_DECODE_BYTES if None)
+        :raises JobTooLargeError: if mode is "error" and the limits are exceeded
+        :raises ValueError: if the mode is unknown
+        """
+        if mode not in ("warn", "error"):
+            raise ValueError(f"Wrong parameter for mode argument: {mode}")
+
+        problems = self.problems(max_response_bytes, max_decode_bytes)
+        if not problems:
+            return
+
+        message = f"Job on {self.n_qubits} qubits with outputs {','.join(self.outputs)}: "
+        message += "; ".join(problems)
+        suggestion = self.suggest_outputs(max_response_bytes, max_decode_bytes)
+        if suggestion is not None:
+            message += f". Consider requesting only: {suggestion}"
+
+        if mode == "error":
+            raise JobTooLargeError(message)
+        warnings.warn(message, stacklevel=3)
+
+    def __repr__(self):
+        return (
+            f"JobEstimate(n_qubits={self.n_qubits}, outputs={','.join(self.outputs)}, "
+            f"response={_format_bytes(self.response_bytes)}, "
+            f"decode_memory={_format_bytes(self.decode_memory_bytes)}, "
+            f"relative_cost={self.relative_cost:.3g})"
+        )
+
+
+def _format_bytes(size: int) -> str:
+    if size <= 0:
+        return "0 B"
+    units = ("B", "kB", "MB", "GB", "TB", "PB")
+    power = min(int(math.log(size, 1024)), len(units) - 1)
+    return f"{size / 1024**power:.1f} {units[power]}"
@@ -5,3 +5,40 @@ class ApiError(Exception):
     """
 
     pass
+
+
+class JobTooLargeError(ApiError):
+    """Error raised when the estimated size of a job exceeds the allowed limits."""
+
+    pass
+
+
+class NotFoundError(ApiError):
+    """Error raised when the API does not know the requested resource (e.g. a deleted job)."""
+
+    pass
+
+
+class CircuitOpenError(ApiError):
+    """Error raised without calling an endpoint whose circuit breaker is open."""
+
+    def __init__(self, message: str, retry_in: float = 0.0):
+        """
+        :param message: error message
+        :param retry_in: seconds until the endpoint lets the requests through again
+        """
+        super().__init__(message)
+        self.retry_in = retry_in
+
+
+class SubmissionError(ApiError):
+    """Error raised when some of several jobs could not be started."""
+
+    def __init__(self, message: str, started: list):
+        """
+        :param message: error message
+        :param started: tuples (job uuid, transpiled qasm str) of the started jobs and None for
+                        the ones that were not started, in the order of the submitted jobs
+        """
+        super().__init__(message)
+        self.started = started
@@ -0,0 +1,540 @@
+"""
+  Framework-agnostic execution core shared by the Qiskit and pytket frontends.
+
+  The core starts the jobs of a circuit (splitting its shots if requested), waits for them,
+  downloads their data and decodes the results. The frontends only convert their circuits
+  into QASM and the decoded results into their own result classes, so the optimizations of
+  the job lifecycle are implemented once for all of them.
+"""
+
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from c12_callisto_clients.api.client import Request, start_concurrently
+from c12_callisto_clients.api.configs import SUBMIT_WORKERS
+from c12_callisto_clients.api.dispatch import DispatchQueue
+from c12_callisto_clients.api.exceptions import ApiError
+from c12_callisto_clients.api.results import (
+    complex_dtype,
+    decode_array,
+    decode_matrix,
+    merge_counts,
+    split_shots,
+)
+from c12_callisto_clients.api.sparse import SparseState, is_sparse_payload
+from c12_callisto_clients.api.storage import ArrayStore
+from c12_callisto_clients.api.streaming import StreamingDecoder
+from c12_callisto_clients.api.tracing import Timeline
+
+
+# Outputs of the jobs of a split circuit after the first one, only its states are used
+CHUNK_OUTPUTS = "counts"
+
+
+class Submission:
+    """Jobs started for a single circuit (several if its shots are split)."""
+
+    def __init__(
+        self,
+        qasm: str,
+        started: List[Tuple[str, str]],
+        shots: List[int],
+        timeline: Timeline,
+        outputs: List[str],
+    ):
+        """
+        :param qasm: submitted QASM string
+        :param started: list of tuples (job uuid, transpiled qasm) of the started jobs
+        :param shots: shots of each job
+        :param timeline: timeline of the lifecycle of the jobs
+        :param outputs: outputs of each job (counts, statevector, density_matrix, states)
+        """
+        self.qasm = qasm
+        self.job_ids = [job_uuid for job_uuid, _ in started]
+        self.transpiled = [transpiled for _, transpiled in started]
+        self.shots = list(shots)
+        self.timeline = timeline
+        self.outputs = list(outputs)
+
+    @property
+    def job_id(self) -> str:
+        """
+        Getter for the id representing the submission (id of the first job).
+
+        :return: job uuid
+        """
+        return self.job_ids[0]
+
+    @property
+    def is_split(self) -> bool:
+        """
+        Check if the shots of the circuit are split into several jobs.
+
+        :return: True if there are several jobs
+        """
+        return len(self.job_ids) > 1
+
+    def __repr__(self):
+        return f"Submission({self.job_ids}, shots={self.shots})"
+
+
+class Executor:
+    """Submission and polling of the jobs of a backend."""
+
+    def __init__(
+        self,
+        request: Request,
+        backend_name: Optional[str] = None,
+        tenant: Optional[str] = None,
+        priority: Union[str, int, None] = None,
+    ):
+        """
+        :param request: Request API object
+        :param backend_name: name of the backend the jobs are started on
+        :param tenant: tenant the jobs are dispatched for (with a dispatch queue)
+        :param priority: priority class of the jobs, interactive, normal or batch (with a
+                         dispatch queue)
+        """
+        self.request = request
+        self.backend_name = backend_name
+        self.tenant = tenant
+        self.priority = priority
+
+    def _job(
+        self,
+        qasm: str,
+        shots: int,
+        result: str,
+        ini_noise: bool,
+        physical_params: Optional[str],
+    ) -> dict:
+        return {
+            "qasm_str": qasm,
+            "shots": shots,
+            "result": result,
+            "backend_name": self.backend_name,
+            "ini_noise": ini_noise,
+            "physical_params": physical_params,
+            "tenant": self.tenant,
+            "priority": self.priority,
+        }
+
+    def submit(
+        self,
+        qasm: str,
+        shots: int,
+        result: str,
+        ini_noise: bool = False,
+        physical_params: Optional[str] = None,
+        max_shots_per_job: Optional[int] = None,
+        timeline: Optional[Timeline] = None,
+    ) -> Submission:
+        """
+        Start the jobs of a circuit. With max_shots_per_job the shots are split into several
+        concurrent jobs; only the first one returns all the outputs, the others return just
+        the counts (CHUNK_OUTPUTS). At most the maximum number of user jobs are in flight at
+        once: if there are more chunks, the remaining ones are started as the earlier ones
+        finish, so the method blocks until the last chunk is started (with a dispatch queue of
+        the request the queue limits the jobs in flight instead).
+
+        :param qasm: QASM string of the circuit
+        :param shots: number of shots
+        :param result: outputs of the jobs (counts, statevector, density_matrix, states)
+        :param ini_noise: if the noise is applied to the initialisation of the circuit
+        :param physical_params: stringify json with physical parameters
+        :param max_shots_per_job: maximum number of shots of a single job
+        :param timeline: timeline the submission is recorded to (a new one if None)
+        :return: Submission instance
+        :raises SubmissionError: if some of the split jobs could not be started (the error
+                                 carries the started ones)
+        :raises ApiError: if a job could not be started
+        """
+        timeline = Timeline() if timeline is None else timeline
+
+        if max_shots_per_job is None or shots <= max_shots_per_job:
+            with timeline.span("submit") as span:
+                started = [
+                    self.request.start_job(
+                        qasm_str=qasm,
+                        shots=shots,
+                        result=result,
+                        backend_name=self.backend_name,
+                        ini_noise=ini_noise,
+                        physical_params=physical_params,
+                        tenant=self.tenant,
+                        priority=self.priority,
+                    )
+                ]
+                span.attributes["job_id"] = started[0][0]
+            chunks = [shots]
+            outputs = [result]
+        else:
+            chunks = split_shots(shots, max_shots_per_job)
+            outputs = [result] + [CHUNK_OUTPUTS] * (len(chunks) - 1)
+            jobs = [
+                self._job(qasm, chunk_shots, chunk_outputs, ini_noise, physical_params)
+                for chunk_shots, chunk_outputs in zip(chunks, outputs)
+            ]
+            with timeline.span("submit", jobs=len(chunks)):
+                started = self._start(jobs, max_workers=len(jobs))
+
+        for job_uuid, _ in started:
+            timeline.observe_status("QUEUED", job_id=job_uuid)
+        return Submission(qasm, started, chunks, timeline, outputs)
+
+    def _start(self, jobs: List[dict], max_workers: Optional[int] = None) -> List[tuple]:
+        """
+        Start jobs in parallel keeping at most the maximum number of user jobs in flight, the
+        remaining ones are started as the earlier ones finish (with a dispatch queue of the
+        request the queue limits the jobs in flight instead).
+        """
+        max_workers = SUBMIT_WORKERS if max_workers is None else max_workers
+        if len(jobs) <= 1 or self.request.dispatch is not None:
+            return self.request.start_jobs(jobs, max_workers=max_workers)
+
+        max_jobs = max(self.request.get_maxjobs(), 1)
+        max_workers = min(max_workers, max_jobs)
+        if len(jobs) <= max_jobs:
+            return self.request.start_jobs(jobs, max_workers=max_workers)
+
+        queue = DispatchQueue(capacity=max_jobs)
+
+        def start(job: dict) -> tuple:
+            ticket = queue.acquire(self.request, job["tenant"], job["priority"])
+            try:
+                started = self.request.start_job(**job)
+            except BaseException:
+                queue.release(ticket)
+                raise
+            queue.started(ticket, started[0])
+            return started
+
+        return start_concurrently(start, jobs, max_workers)
+
+    def submit_batch(
+        self,
+        qasms: List[str],
+        shots: int,
+        result: str,
+        ini_noise: bool = False,
+        physical_params: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        timeline: Optional[Timeline] = None,
+    ) -> List[Submission]:
+        """
+        Start a job for each of several circuits in parallel. At most the maximum number of
+        user jobs are in flight at once (see submit).
+
+        :param qasms: QASM strings of the circuits
+        :param shots: number of shots of each circuit
+        :param result: outputs of the jobs
+        :param ini_noise: if the noise is applied to the initialisation of the circuits
+        :param physical_params: stringify json with physical parameters
+        :param max_workers: maximum number of parallel submissions (C12_SUBMIT_WORKERS if None)
+        :param timeline: timeline shared by the jobs (a new one if None)
+        :return: list of Submission instances in the order of the circuits
+        :raises SubmissionError: if some of the jobs could not be started (the error carries
+                                 the started ones)
+        :raises ApiError: if none of the jobs could be started
+        """
+        timeline = Timeline() if timeline is None else timeline
+
+        with timeline.span("submit", jobs=len(qasms)):
+            started = self._start(
+                [self._job(qasm, shots, result, ini_noise, physical_params) for qasm in qasms],
+                max_workers=max_workers,
+            )
+
+        for job_uuid, _ in started:
+            timeline.observe_status("QUEUED", job_id=job_uuid)
+        return [
+            Submission(qasm, [item], [shots], timeline, [result])
+            for qasm, item in zip(qasms, started)
+        ]
+
+    def wait(
+        self,
+        job_id: str,
+        timeout: Optional[float] = None,
+        wait: float = 5,
+        output_data: Optional[str] = None,
+        decoder: Optional[StreamingDecoder] = None,
+        timeline: Optional[Timeline] = None,
+    ) -> dict:
+        """
+        Wait until a job reaches a final status.
+
+        :param job_id: job uuid
+        :param timeout: seconds to wait for the job (if None wait forever)
+        :param wait: seconds between queries
+        :param output_data: outputs returned with the final status (all if None)
+        :param decoder: if given, the responses are streamed and parsed by the decoder
+        :param timeline: timeline the observed statuses are recorded to
+        :return: last response of the job result query (status, results and errors)
+        :raises ApiError: if error in API communication occurred
+        :raises TimeoutError: if timeout is exceeded
+        """
+        on_status = (
+            (lambda status: timeline.observe_status(status, job_id=job_id))
+            if timeline is not None
+            else None
+        )
+        data = self.request.get_job_result(
+            job_id, output_data, timeout, wait, decoder=decoder, on_status=on_status
+        )
+        if data is None:
+            raise ApiError(f"Unable to retrieve job {job_id}")
+        return data
+
+    def fetch(
+        self,
+        job_id: str,
+        decoder: Optional[StreamingDecoder] = None,
+        timeline: Optional[Timeline] = None,
+    ) -> Optional[dict]:
+        """
+        Download the data of a job (task, options, status, errors and results).
+
+        :param job_id: job uuid
+        :param decoder: if given, the response is streamed and parsed by the decoder
+        :param timeline: timeline the download and the job status are recorded to
+        :return: job data or None
+        :raises ApiError: if error in API communication occurred
+        """
+        timeline = Timeline() if timeline is None else timeline
+        with timeline.span("download", job_id=job_id):
+            job = self.request.get_job(job_id, decoder=decoder)
+        if job is not None:
+            timeline.observe_status(job["status"], job_id=job_id)
+        return job
+
+    def status(self, job_id: str, timeline: Optional[Timeline] = None) -> str:
+        """
+        Get the current status of a job.
+
+        :param job_id: job uuid
+        :param timeline: timeline the status is recorded to
+        :return: API status of the job
+        :raises ApiError: if error in API communication occurred
+        """
+        status = self.request.get_job_status(job_id)
+        if timeline is not None:
+            timeline.observe_status(status, job_id=job_id)
+        return status
+
+
+class DecodedResult:
+    """Results of a job decoded into numpy arrays (or SparseState)."""
+
+    def __init__(
+        self,
+        counts: Dict[str, int],
+        statevector,
+        density_matrix: Optional[np.ndarray] = None,
+        states: Optional[dict] = None,
+    ):
+        """
+        :param counts: measured counts
+        :param statevector: final statevector (numpy array or SparseState)
+        :param density_matrix: final density matrix (if it was requested)
+        :param states: mid-circuit statevectors (sv{n}) and density matrices (dm{n})
+        """
+        self.counts = counts
+        self.statevector = statevector
+        self.density_matrix = density_matrix
+        self.states = states or {}
+
+    @property
+    def is_sparse(self) -> bool:
+        """
+        Check if the final statevector is kept in the sparse form.
+
+        :return: True for SparseState
+        """
+        return isinstance(self.statevector, SparseState)
+
+
+class ResultDecoder:
+    """Decoding of the job results into the requested precision and representation."""
+
+    def __init__(
+        self,
+        precision: str = "double",
+        sparse: bool = False,
+        stream: bool = False,
+        storage: Optional[ArrayStore] = None,
+    ):
+        """
+        :param precision: precision of the decoded amplitudes, "double" (complex128) or
+                          "single" (complex64)
+        :param sparse: if the statevectors are decoded into SparseState
+        :param stream: if the job data is parsed incrementally while it is downloaded
+        :param storage: if given, the decoded arrays are stored in memory-mapped files
+        """
+        self.dtype = complex_dtype(precision)
+        self.sparse = sparse
+        self.stream = stream
+        self.storage = storage
+
+    @classmethod
+    def for_dtype(cls, dtype: type, **kwargs) -> "ResultDecoder":
+        """
+        Create a decoder for a numpy complex type.
+
+        :param dtype: numpy complex type of the decoded amplitudes
+        :param kwargs: other arguments of the constructor
+        :return: ResultDecoder instance
+        """
+        precision = "single" if np.dtype(dtype) == np.complex64 else "double"
+        return cls(precision, **kwargs)
+
+    def streaming_decoder(self) -> Optional[StreamingDecoder]:
+        """
+        Create the decoder of the streamed job data.
+
+        :return: StreamingDecoder or None if the job data is not streamed
+        """
+        if not self.stream:
+            return None
+        allocate = None if self.storage is None else self.storage.allocate
+        return StreamingDecoder(self.dtype, allocate=allocate)
+
+    def decode(self, name: str, data, matrix: bool = False) -> np.ndarray:
+        """
+        Decode the json string data either in memory or directly into a memory-mapped file.
+
+        :param name: name of the array (statevector, density_matrix, sv{n}, dm{n})
+        :param data: json string data or an array already decoded by the streaming decoder
+        :param matrix: if the data is a matrix
+        :return: numpy array or memory-mapped view of the array
+        """
+        store = self.storage
+        if isinstance(data, np.ndarray):
+            if store is None:
+                return data.astype(self.dtype, copy=False)
+            if isinstance(data, np.memmap):
+                # Already decoded into the store by the streaming decoder
+                data.flush()
+                return store.load(name)
+            return store.save(name, data.astype(self.dtype, copy=False))
+
+        if store is None:
+            if matrix:
+                return decode_matrix(data, dtype=self.dtype)
+            return decode_array(data, dtype=self.dtype)
+
+        if matrix:
+            shape = (len(data), len(data[0]) if len(data) > 0 else 0)
+        else:
+            shape = (data["dim"],) if is_sparse_payload(data) else (len(data),)
+        out = store.allocate(name, shape, self.dtype)
+        if matrix:
+            decode_matrix(data, out=out)
+        else:
+            decode_array(data, out=out)
+        out.flush()
+        del out
+        return store.load(name)
+
+    def decode_statevector(self, name: str, data):
+        """
+        Decode a statevector into the dense or the sparse form.
+
+        :param name: name of the statevector (statevector, sv{n})
+        :param data: json string data or an already decoded array
+        :return: numpy array or SparseState
+        """
+        if isinstance(data, SparseState):
+            return data
+        if self.sparse:
+            return SparseState.from_json(data, self.dtype)
+        return self.decode(name, data)
+
+    def spill(self, results: Optional[dict], density_matrix: bool = False) -> Optional[dict]:
+        """
+        Decode the arrays of the job results into the storage, so that the json string data
+        does not have to be kept in memory until the results are requested.
+
+        :param results: results of the job as returned by the API
+        :param density_matrix: if the final density matrix is kept (it is dropped otherwise)
+        :return: results with the decoded arrays instead of the json string data (the results
+                 unchanged if there is no storage)
+        """
+        if self.storage is None or not results:
+            return results
+
+        spilled = {key: value for key, value in results.items() if key != "density_matrix"}
+        if results.get("statevector") is not None:
+            spilled["statevector"] = self.decode_statevector("statevector", results["statevector"])
+        if density_matrix and results.get("density_matrix") is not None:
+            spilled["density_matrix"] = self.decode(
+                "density_matrix", results["density_matrix"], matrix=True
+            )
+
+        mid_states = results.get("states")
+        if mid_states and "density_matrix" in mid_states and "statevector" in mid_states:
+            spilled["states"] = {
+                "density_matrix": {
+                    key: self.decode(key, value, matrix=True)
+                    for key, value in mid_states["density_matrix"].items()
+                },
+                "statevector": {
+                    key: self.decode_statevector(key, value)
+                    for key, value in mid_states["statevector"].items()
+                },
+            }
+        return spilled
+
+    def decode_results(self, results: dict, density_matrix: bool = False) -> DecodedResult:
+        """
+        Decode the results of a job.
+
+        :param results: results of the job as returned by the API
+        :param density_matrix: if the final density matrix is decoded
+        :return: DecodedResult instance
+        :raises ApiError: if the results are in a wrong format
+        """
+        if "counts" not in results or "statevector" not in results:
+            raise ApiError("Result is in a wrong format")
+        if density_matrix and "density_matrix" not in results:
+            raise ApiError("Result is in a wrong format")
+
+        states = {}
+        mid_states = results["states"] if "states" in results else None
+        if mid_states and "density_matrix" in mid_states and "statevector" in mid_states:
+            for key, value in mid_states["density_matrix"].items():
+                states[key] = self.decode(key, value, matrix=True)
+            for key, value in mid_states["statevector"].items():
+                states[key] = self.decode_statevector(key, value)
+
+        return DecodedResult(
+            counts=results["counts"],
+            statevector=self.decode_statevector("statevector", results["statevector"]),
+            density_matrix=(
+                self.decode("density_matrix", results["density_matrix"], matrix=True)
+                if density_matrix
+                else None
+            ),
+            states=states,
+        )
+
+
+def merge_results(
+    results: List[dict], job_ids: List[str], shots: List[Optional[int]]
+) -> Tuple[dict, List[dict]]:
+    """
+    Merge the results of the jobs a circuit was split into. The counts are summed, while the
+    statevector, the density matrix and the mid-circuit states are taken from the first job.
+
+    :param results: results of the jobs as returned by the API
+    :param job_ids: ids of the jobs
+    :param shots: shots of each job
+    :return: tuple with the merged results and the list of the chunks (job_id, shots, counts)
+    """
+    chunks = [
+        {"job_id": job_id, "shots": chunk_shots, "counts": item["counts"]}
+        for job_id, chunk_shots, item in zip(job_ids, shots, results)
+    ]
+    merged = {**results[0], "counts": merge_counts([chunk["counts"] for chunk in chunks])}
+    return merged, chunks
@@ -0,0 +1,229 @@
+"""
+  Crash-safe journal of the job submissions.
+
+  Every start_job request is recorded in an append-only JSON lines file twice: before it is
+  sent (its hash and idempotency key) and after the job is started (its uuid and transpiled
+  circuit). Both lines are flushed to the disk before start_job returns, so the uuids of the
+  submitted jobs survive a crash of the process.
+
+  When the same submissions are made again with the same journal (e.g. the driver script is
+  run again after a crash), they are reattached to the recorded jobs instead of starting new
+  ones: the n-th identical request of the process is matched with the n-th recorded one. A
+  request that was sent but whose response was not recorded is sent again with the same
+  idempotency key, so the API does not start a duplicate job.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional
+
+from c12_callisto_clients.api.configs import JOURNAL
+
+
+def request_hash(params: dict) -> str:
+    """
+    Get the hash of a job submission.
+
+    :param params: body of the start_job request
+    :return: hex digest of the SHA-256 of the canonical JSON of the body
+    """
+    body = json.dumps(params, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+class JournalEntry:
+    """Single job submission of the journal."""
+
+    def __init__(
+        self,
+        key: str,
+        params_hash: str,
+        created: float,
+        job_uuid: Optional[str] = None,
+        transpiled: Optional[str] = None,
+        **info,
+    ):
+        """
+        :param key: idempotency key of the submission
+        :param params_hash: hash of the start_job request
+        :param created: time the submission was recorded (seconds since the epoch)
+        :param job_uuid: uuid of the started job (None until the response is recorded)
+        :param transpiled: transpiled circuit returned with the job uuid
+        :param info: parameters of the job (backend_name, shots, result)
+        """
+        self.key = key
+        self.request_hash = params_hash
+        self.created = created
+        self.job_uuid = job_uuid
+        self.transpiled = transpiled
+        self.info = info
+
+    @property
+    def is_started(self) -> bool:
+        """
+        Check if the job of the submission was started.
+
+        :return: True if the job uuid was recorded
+        """
+        return self.job_uuid is not None
+
+    def __repr__(self):
+        return f"JournalEntry({self.key}, job_uuid={self.job_uuid}, {self.info})"
+
+
+class SubmissionJournal:
+    """Append-only journal of the job submissions."""
+
+    def __init__(self, path: str, fsync: bool = True):
+        """
+        :param path: path of the JSON lines file (created if it does not exist)
+        :param fsync: if each record is synced to the disk (only flushed to the operating
+                      system if False)
+        """
+        self.path = path
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._entries: Dict[str, JournalEntry] = {}
+        self._by_hash: Dict[str, List[JournalEntry]] = {}
+        self._claimed: Dict[str, int] = {}
+        self._load()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding="utf-8") as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # The last line written before a crash can be incomplete
+                    continue
+                if record.get("event") == "submit":
+                    entry = JournalEntry(
+                        record["key"], record["hash"], record["time"], **record.get("info", {})
+                    )
+                    self._entries[entry.key] = entry
+                    self._by_hash.setdefault(entry.request_hash, []).append(entry)
+                elif record.get("event") == "started" and record.get("key") in self._entries:
+                    entry = self._entries[record["key"]]
+                    entry.job_uuid = record["job_uuid"]
+                    entry.transpiled = record.get("transpiled")
+
+    def _append(self, record: dict) -> None:
+        """Append a record to the file (called with the lock held)."""
+        line = (json.dumps(record) + "\n").encode("utf-8")
+        with open(self.path, "a+b") as file:
+            if file.seek(0, os.SEEK_END) > 0:
+                file.seek(-1, os.SEEK_END)
+                if file.read(1) != b"\n":
+                    # A crash can leave the last line incomplete, the record starts on a new line
+                    line = b"\n" + line
+            file.write(line)
+            file.flush()
+            if self.fsync:
+                os.fsync(file.fileno())
+
+    def claim(self, params_hash: str, key: Optional[str] = None, **info) -> JournalEntry:
+        """
+        Get the entry of a submission: the next recorded entry with the same hash that was not
+        claimed yet by this process, or a new entry recorded to the journal.
+
+        :param params_hash: hash of the start_job request (see request_hash)
+        :param key: idempotency key of a new entry (a random key if None)
+        :param info: parameters of the job recorded with a new entry
+        :return: JournalEntry (started if the job of a recorded entry was already started)
+        """
+        with self._lock:
+            entries = self._by_hash.setdefault(params_hash, [])
+            index = self._claimed.get(params_hash, 0)
+            self._claimed[params_hash] = index + 1
+            if index < len(entries):
+                return entries[index]
+
+            entry = JournalEntry(key or str(uuid.uuid4()), params_hash, time.time(), **info)
+            self._append(
+                {
+                    "event": "submit",
+                    "key": entry.key,
+                    "hash": params_hash,
+                    "time": entry.created,
+                    "info": info,
+                }
+            )
+            self._entries[entry.key] = entry
+            entries.append(entry)
+            return entry
+
+    def started(self, entry: JournalEntry, job_uuid: str, transpiled: Optional[str]) -> None:
+        """
+        Record the job started by a submission.
+
+        :param entry: entry of the submission
+        :param job_uuid: uuid of the started job
+        :param transpiled: transpiled circuit returned with the job uuid
+        :return: None
+        """
+        with self._lock:
+            self._append(
+                {
+                    "event": "started",
+                    "key": entry.key,
+                    "job_uuid": job_uuid,
+                    "transpiled": transpiled,
+                    "time": time.time(),
+                }
+            )
+            entry.job_uuid = job_uuid
+            entry.transpiled = transpiled
+
+    def entries(
+        self, backend_name: Optional[str] = None, started: Optional[bool] = None
+    ) -> List[JournalEntry]:
+        """
+        Get the recorded submissions.
+
+        :param backend_name: if given, only the submissions to the backend
+        :param started: if given, only the submissions whose job was (True) or was not (False)
+                        started
+        :return: list of entries in the order they were recorded
+        """
+        with self._lock:
+            entries = list(self._entries.values())
+        return [
+            entry
+            for entry in entries
+            if (backend_name is None or entry.info.get("backend_name") == backend_name)
+            and (started is None or entry.is_started == started)
+        ]
+
+    def job_ids(self, backend_name: Optional[str] = None) -> List[str]:
+        """
+        Get the uuids of the started jobs.
+
+        :param backend_name: if given, only the jobs of the backend
+        :return: list of job uuids in the order they were submitted
+        """
+        return [entry.job_uuid for entry in self.entries(backend_name, started=True)]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return f"SubmissionJournal({self.path!r}, {len(self)} submissions)"
+
+
+def get_journal(journal=None) -> Optional[SubmissionJournal]:
+    """
+    Get the journal of a Request.
+
+    :param journal: SubmissionJournal instance or path of the journal file, C12_JOURNAL if None
+    :return: SubmissionJournal instance or None if the journaling is off
+    """
+    if isinstance(journal, SubmissionJournal):
+        return journal
+    journal = JOURNAL if journal is None else journal
+    return SubmissionJournal(journal) if journal else None
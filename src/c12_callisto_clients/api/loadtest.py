@@ -0,0 +1,309 @@
+"""
+  Load test of the C12 API.
+
+  Jobs of a configurable mix of circuits, numbers of qubits, shots and outputs are submitted
+  at a target rate (open loop: a slow API does not lower the submission rate, the jobs wait
+  for a free worker instead and the delay is recorded as lag). Each job goes through the same
+  phases as a job of the frontends (submit, queued, running, download, decode) and the
+  durations of the phases are the samples of the test. The summary reports the percentiles
+  of the samples and the throughput.
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, IO, List, Optional, Sequence
+
+import numpy as np
+
+from c12_callisto_clients.api.execution import Executor, ResultDecoder
+from c12_callisto_clients.api.tracing import Timeline
+
+
+# Phases of a job whose durations are sampled
+PHASES = ("submit", "queued", "running", "download", "decode")
+
+# Percentiles of the report
+PERCENTILES = (50, 90, 95, 99)
+
+# Built-in circuit families
+CIRCUITS = ("ghz", "random")
+
+
+def circuit_qasm(circuit: str, n_qubits: int, seed: int = 0) -> str:
+    """
+    Get the QASM string of a circuit of the mix.
+
+    :param circuit: name of a built-in family (ghz, random) or path of a QASM file
+    :param n_qubits: number of qubits of the built-in circuits
+    :param seed: seed of the random circuits
+    :return: QASM string
+    :raises ValueError: if the circuit is neither a built-in family nor a file
+    """
+    if os.path.isfile(circuit):
+        with open(circuit, encoding="utf-8") as file:
+            return file.read()
+    if circuit not in CIRCUITS:
+        raise ValueError(f"Unknown circuit {circuit} (use {', '.join(CIRCUITS)} or a QASM file)")
+
+    lines = ["OPENQASM 2.0;", 'include "qelib1.inc";', f"qreg q[{n_qubits}];"]
+    lines.append(f"creg c[{n_qubits}];")
+    if circuit == "ghz":
+        lines.append("h q[0];")
+        lines += [f"cx q[{qubit - 1}],q[{qubit}];" for qubit in range(1, n_qubits)]
+    else:
+        rng = random.Random(seed)
+        for _ in range(n_qubits):
+            for qubit in range(n_qubits):
+                gate = rng.choice(("rx", "ry", "rz"))
+                lines.append(f"{gate}({rng.uniform(0, 2 * np.pi):.6f}) q[{qubit}];")
+            qubits = list(range(n_qubits))
+            rng.shuffle(qubits)
+            lines += [f"cx q[{a}],q[{b}];" for a, b in zip(qubits[::2], qubits[1::2])]
+    lines.append("measure q -> c;")
+    return "\n".join(lines) + "\n"
+
+
+class JobSpec:
+    """Single job of the load test."""
+
+    def __init__(self, index: int, circuit: str, qubits: int, shots: int, outputs: str):
+        """
+        :param index: position of the job in the test
+        :param circuit: built-in circuit family or path of a QASM file
+        :param qubits: number of qubits of the built-in circuits
+        :param shots: number of shots
+        :param outputs: comma separated outputs of the job
+        """
+        self.index = index
+        self.circuit = circuit
+        self.qubits = qubits
+        self.shots = shots
+        self.outputs = outputs
+
+    def __repr__(self):
+        return (
+            f"JobSpec({self.index}, {self.circuit}, qubits={self.qubits}, shots={self.shots},"
+            f" outputs={self.outputs!r})"
+        )
+
+
+def job_mix(
+    n_jobs: int,
+    circuits: Sequence[str] = ("ghz",),
+    qubits: Sequence[int] = (2,),
+    shots: Sequence[int] = (1024,),
+    outputs: Sequence[str] = ("counts",),
+    seed: Optional[int] = None,
+) -> List[JobSpec]:
+    """
+    Draw the jobs of a load test uniformly from the mix.
+
+    :param n_jobs: number of jobs
+    :param circuits: circuit families or paths of QASM files
+    :param qubits: numbers of qubits
+    :param shots: numbers of shots
+    :param outputs: outputs of the jobs (e.g. "counts", "counts,statevector")
+    :param seed: seed of the draw
+    :return: list of jobs
+    """
+    rng = random.Random(seed)
+    return [
+        JobSpec(
+            index,
+            rng.choice(circuits),
+            rng.choice(qubits),
+            rng.choice(shots),
+            rng.choice(outputs),
+        )
+        for index in range(n_jobs)
+    ]
+
+
+class LoadTest:
+    """Open loop load test of the job lifecycle."""
+
+    def __init__(
+        self,
+        executor: Executor,
+        rate: float,
+        max_in_flight: int = 64,
+        wait: float = 0.5,
+        timeout: Optional[float] = None,
+        decoder: Optional[ResultDecoder] = None,
+    ):
+        """
+        :param executor: executor of the jobs (with the request and the backend name)
+        :param rate: target number of submitted jobs per second
+        :param max_in_flight: maximum number of jobs in flight on the client side
+        :param wait: seconds between the status queries of a job
+        :param timeout: seconds to wait for a job (if None wait forever)
+        :param decoder: decoder of the results (double precision dense arrays if None)
+        """
+        if rate <= 0:
+            raise ValueError(f"Rate has to be positive ({rate})")
+        self.executor = executor
+        self.rate = rate
+        self.max_in_flight = max_in_flight
+        self.wait = wait
+        self.timeout = timeout
+        self.decoder = ResultDecoder() if decoder is None else decoder
+        self._lock = threading.Lock()
+
+    def run_job(self, spec: JobSpec, scheduled: float) -> dict:
+        """
+        Run a single job through all the phases.
+
+        :param spec: job of the test
+        :param scheduled: time the job was scheduled to be submitted (time.time())
+        :return: sample with the job parameters, the status, the lag behind the schedule and
+                 the seconds of each phase (None if the phase was not reached)
+        """
+        start = time.time()
+        sample = {
+            "index": spec.index,
+            "circuit": spec.circuit,
+            "qubits": spec.qubits,
+            "shots": spec.shots,
+            "outputs": spec.outputs,
+            "job_id": None,
+            "status": None,
+            "error": None,
+            "scheduled": scheduled,
+            "lag": start - scheduled,
+        }
+        timeline = Timeline()
+        try:
+            qasm = circuit_qasm(spec.circuit, spec.qubits, seed=spec.index)
+            submission = self.executor.submit(qasm, spec.shots, spec.outputs, timeline=timeline)
+            sample["job_id"] = submission.job_id
+            # The status is polled with the smallest output, the data is downloaded once
+            data = self.executor.wait(
+                submission.job_id,
+                timeout=self.timeout,
+                wait=self.wait,
+                output_data="counts",
+                timeline=timeline,
+            )
+            sample["status"] = data["status"]
+            if data["status"] == "FINISHED":
+                job = self.executor.fetch(submission.job_id, timeline=timeline)
+                results = job["result"] if job is not None else None
+                with timeline.span("decode"):
+                    if results and "statevector" in results:
+                        self.decoder.decode_results(
+                            results, density_matrix="density_matrix" in results
+                        )
+            else:
+                sample["error"] = data.get("errors") or None
+        except Exception as err:  # pylint: disable=broad-except
+            sample["error"] = f"{type(err).__name__}: {err}"
+
+        durations = timeline.durations()
+        sample.update({phase: durations.get(phase) for phase in PHASES})
+        sample["total"] = time.time() - start
+        return sample
+
+    def run(self, specs: List[JobSpec], samples: Optional[IO[str]] = None) -> List[dict]:
+        """
+        Submit the jobs at the target rate and wait for all of them.
+
+        :param specs: jobs of the test
+        :param samples: if given, each sample is written to it as a JSON line when its job ends
+        :return: samples in the order of the jobs
+        """
+        results: List[Optional[dict]] = [None] * len(specs)
+
+        def process(position: int, spec: JobSpec, scheduled: float) -> None:
+            sample = self.run_job(spec, scheduled)
+            results[position] = sample
+            if samples is not None:
+                with self._lock:
+                    samples.write(json.dumps(sample) + "\n")
+                    samples.flush()
+
+        start = time.time()
+        with ThreadPoolExecutor(max_workers=max(self.max_in_flight, 1)) as pool:
+            for position, spec in enumerate(specs):
+                scheduled = start + position / self.rate
+                delay = scheduled - time.time()
+                if delay > 0:
+                    time.sleep(delay)
+                pool.submit(process, position, spec, scheduled)
+        return results
+
+
+def summarize(samples: List[dict]) -> Dict[str, dict]:
+    """
+    Summarize the samples of a load test.
+
+    :param samples: samples of the jobs
+    :return: dictionary with the percentiles (and the mean and the maximum) of the lag, of
+             each phase and of the total time, and with the counts of the job statuses, the
+             submission rate and the throughput of the finished jobs
+    """
+    summary: Dict[str, dict] = {}
+    for metric in ("lag",) + PHASES + ("total",):
+        values = np.array([s[metric] for s in samples if s.get(metric) is not None], dtype=float)
+        if len(values) == 0:
+            continue
+        summary[metric] = {
+            **{f"p{q}": float(np.percentile(values, q)) for q in PERCENTILES},
+            "mean": float(values.mean()),
+            "max": float(values.max()),
+            "n": len(values),
+        }
+
+    statuses: Dict[str, int] = {}
+    for sample in samples:
+        status = sample["status"] or "FAILED"
+        statuses[status] = statuses.get(status, 0) + 1
+
+    # The jobs are submitted when their workers start them, behind the schedule by the lag
+    submitted = [s["scheduled"] + s["lag"] for s in samples]
+    begin = min((s["scheduled"] for s in samples), default=0.0)
+    end = max((s["scheduled"] + s["lag"] + s["total"] for s in samples), default=0.0)
+    first_submitted, last_submitted = min(submitted, default=0.0), max(submitted, default=0.0)
+    elapsed = end - begin
+    summary["jobs"] = {
+        "statuses": statuses,
+        "seconds": elapsed,
+        "submission_rate": (
+            (len(samples) - 1) / (last_submitted - first_submitted)
+            if last_submitted > first_submitted
+            else None
+        ),
+        "throughput": statuses.get("FINISHED", 0) / elapsed if elapsed > 0 else None,
+    }
+    return summary
+
+
+def format_summary(summary: Dict[str, dict]) -> str:
+    """
+    Format the summary of a load test as a table.
+
+    :param summary: summary returned by summarize()
+    :return: table with milliseconds of each metric, the job statuses and the throughput
+    """
+    columns = [f"p{q}" for q in PERCENTILES] + ["mean", "max"]
+    lines = [f"{'metric [ms]':<12}" + "".join(f"{column:>10}" for column in columns) + f"{'n':>7}"]
+    for metric, values in summary.items():
+        if metric == "jobs":
+            continue
+        lines.append(
+            f"{metric:<12}"
+            + "".join(f"{values[column] * 1e3:>10.1f}" for column in columns)
+            + f"{values['n']:>7}"
+        )
+
+    jobs = summary["jobs"]
+    statuses = ", ".join(f"{status}: {count}" for status, count in sorted(jobs["statuses"].items()))
+    lines.append(f"jobs: {statuses} in {jobs['seconds']:.2f}s")
+    if jobs["submission_rate"] is not None:
+        lines.append(f"submission rate: {jobs['submission_rate']:.2f} jobs/s")
+    if jobs["throughput"] is not None:
+        lines.append(f"throughput: {jobs['throughput']:.2f} finished jobs/s")
+    return "\n".join(lines)
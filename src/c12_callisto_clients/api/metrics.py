@@ -0,0 +1,428 @@
+"""
+  Instrumentation of the API requests.
+
+  Every call made by Request produces a RequestRecord (endpoint, method, status, bytes
+  and timing of the phases) that is passed to the registered metrics hooks. The module
+  provides hooks that keep in-memory histograms, write the records to the logging module
+  and export the metrics in the Prometheus text format.
+"""
+
+import bisect
+import logging
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+
+# Phases of a request. The connect phase includes the DNS resolution, connect and tls are
+# None when a kept-alive connection is reused, decode is None for the streamed responses
+# (they are decoded while they are transferred).
+PHASES = ("connect", "tls", "wait", "transfer", "decode", "total")
+
+# Upper bounds (in seconds) of the buckets of the duration histograms
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, math.inf)
+
+
+class RequestRecord:
+    """Measurements of a single API call."""
+
+    def __init__(
+        self,
+        endpoint: str,
+        method: str,
+        status: Optional[int] = None,
+        bytes_sent: int = 0,
+        bytes_received: int = 0,
+        timings: Optional[Dict[str, Optional[float]]] = None,
+        retries: int = 0,
+        error: Optional[str] = None,
+    ):
+        """
+        :param endpoint: path of the endpoint (e.g. /api/c12sim/query)
+        :param method: http method
+        :param status: http status of the response (None if no response was received)
+        :param bytes_sent: size of the request body as sent (after compression)
+        :param bytes_received: size of the response body as received (before decompression)
+        :param timings: durations of the phases in seconds (see PHASES)
+        :param retries: number of times the request was repeated
+        :param error: name of the exception if the call failed
+        """
+        self.endpoint = endpoint
+        self.method = method
+        self.status = status
+        self.bytes_sent = bytes_sent
+        self.bytes_received = bytes_received
+        self.timings = {phase: None for phase in PHASES}
+        self.timings.update(timings or {})
+        self.retries = retries
+        self.error = error
+
+    def to_dict(self) -> dict:
+        """
+        Convert the record into a dictionary.
+
+        :return: dictionary with the fields of the record
+        """
+        return {
+            "endpoint": self.endpoint,
+            "method": self.method,
+            "status": self.status,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "timings": dict(self.timings),
+            "retries": self.retries,
+            "error": self.error,
+        }
+
+    def __repr__(self):
+        total = self.timings["total"]
+        duration = "?" if total is None else f"{total * 1e3:.1f}ms"
+        return f"RequestRecord({self.method.upper()} {self.endpoint} {self.status} {duration})"
+
+
+class MetricsHook:
+    """Base class of the hooks that receive the records of the API calls."""
+
+    def record(self, record: RequestRecord) -> None:
+        """
+        Process the record of a finished API call.
+
+        :param record: RequestRecord instance
+        :return: None
+        """
+        raise NotImplementedError
+
+
+class Histogram:
+    """Histogram with fixed buckets."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        :param buckets: sorted upper bounds of the buckets (the last one should be infinity)
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """
+        Add a value to the histogram.
+
+        :param value: observed value
+        :return: None
+        """
+        index = min(bisect.bisect_left(self.buckets, value), len(self.buckets) - 1)
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+
+    @property
+    def mean(self) -> Optional[float]:
+        """
+        Mean of the observed values.
+
+        :return: mean or None if there are no observations
+        """
+        return self.sum / self.count if self.count else None
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Upper bound of the bucket that contains the q-quantile.
+
+        :param q: quantile between 0 and 1
+        :return: upper bound or None if there are no observations
+        """
+        if not self.count:
+            return None
+        target = q * self.count
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            if cumulative >= target:
+                return bound
+        return self.buckets[-1]
+
+
+class InMemoryMetrics(MetricsHook):
+    """Hook that aggregates the records into in-memory histograms per endpoint and method."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS, keep_records: int = 1000):
+        """
+        :param buckets: upper bounds of the buckets of the duration histograms
+        :param keep_records: number of the most recent records that are kept
+        """
+        self._buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self.records = deque(maxlen=keep_records)
+        self.histograms: Dict[Tuple[str, str, str], Histogram] = {}
+        self.requests: Dict[Tuple[str, str, str], int] = {}
+        self.bytes_sent: Dict[Tuple[str, str], int] = {}
+        self.bytes_received: Dict[Tuple[str, str], int] = {}
+        self.retries: Dict[Tuple[str, str], int] = {}
+
+    def record(self, record: RequestRecord) -> None:
+        key = (record.endpoint, record.method)
+        status = str(record.status) if record.status is not None else (record.error or "error")
+        with self._lock:
+            self.records.append(record)
+            self.requests[key + (status,)] = self.requests.get(key + (status,), 0) + 1
+            self.bytes_sent[key] = self.bytes_sent.get(key, 0) + record.bytes_sent
+            self.bytes_received[key] = self.bytes_received.get(key, 0) + record.bytes_received
+            self.retries[key] = self.retries.get(key, 0) + record.retries
+            for phase, value in record.timings.items():
+                if value is None:
+                    continue
+                if key + (phase,) not in self.histograms:
+                    self.histograms[key + (phase,)] = Histogram(self._buckets)
+                self.histograms[key + (phase,)].observe(value)
+
+    def histogram(
+        self, endpoint: str, method: str = "get", phase: str = "total"
+    ) -> Optional[Histogram]:
+        """
+        Get the duration histogram of an endpoint.
+
+        :param endpoint: path of the endpoint
+        :param method: http method
+        :param phase: phase of the requests (see PHASES)
+        :return: Histogram or None if there are no records
+        """
+        return self.histograms.get((endpoint, method, phase))
+
+    def summary(self) -> List[dict]:
+        """
+        Summary of the requests per endpoint and method.
+
+        :return: list of dictionaries with the counts, bytes and mean durations of the phases
+        """
+        with self._lock:
+            rows = []
+            for endpoint, method in sorted(self.bytes_sent):
+                key = (endpoint, method)
+                total = self.histograms.get(key + ("total",))
+                rows.append(
+                    {
+                        "endpoint": endpoint,
+                        "method": method,
+                        "count": sum(
+                            count for item, count in self.requests.items() if item[:2] == key
+                        ),
+                        "bytes_sent": self.bytes_sent[key],
+                        "bytes_received": self.bytes_received[key],
+                        "retries": self.retries[key],
+                        "p95": total.quantile(0.95) if total is not None else None,
+                        "mean": {
+                            phase: self.histograms[key + (phase,)].mean
+                            for phase in PHASES
+                            if key + (phase,) in self.histograms
+                        },
+                    }
+                )
+            return rows
+
+
+class LoggingMetrics(MetricsHook):
+    """Hook that writes each record to the logging module."""
+
+    def __init__(self, logger_name: str = __name__, level: int = logging.DEBUG):
+        """
+        :param logger_name: name of the logger
+        :param level: level of the log messages
+        """
+        self._logger = logging.getLogger(logger_name)
+        self._level = level
+
+    def record(self, record: RequestRecord) -> None:
+        if not self._logger.isEnabledFor(self._level):
+            return
+        timings = " ".join(
+            f"{phase}={value * 1e3:.1f}ms"
+            for phase, value in record.timings.items()
+            if value is not None
+        )
+        self._logger.log(
+            self._level,
+            "%s %s status=%s sent=%dB received=%dB retries=%d %s",
+            record.method.upper(),
+            record.endpoint,
+            record.status if record.status is not None else record.error,
+            record.bytes_sent,
+            record.bytes_received,
+            record.retries,
+            timings,
+            extra={"c12_request": record.to_dict()},
+        )
+
+
+class PrometheusMetrics(InMemoryMetrics):
+    """Hook that exports the aggregated metrics in the Prometheus text exposition format."""
+
+    def __init__(self, prefix: str = "c12", buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        :param prefix: prefix of the metric names
+        :param buckets: upper bounds of the buckets of the duration histograms
+        """
+        super().__init__(buckets=buckets, keep_records=0)
+        self._prefix = prefix
+        self._server = None
+
+    @staticmethod
+    def _labels(**labels: str) -> str:
+        escaped = (
+            str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+            for value in labels.values()
+        )
+        return "{" + ",".join(f'{name}="{value}"' for name, value in zip(labels, escaped)) + "}"
+
+    def render(self) -> str:
+        """
+        Render the metrics in the Prometheus text format.
+
+        :return: text of the metrics
+        """
+        name = f"{self._prefix}_requests_total"
+        lines = [f"# HELP {name} API requests.", f"# TYPE {name} counter"]
+        with self._lock:
+            for (endpoint, method, status), count in sorted(self.requests.items()):
+                labels = self._labels(endpoint=endpoint, method=method, status=status)
+                lines.append(f"{name}{labels} {count}")
+
+            for metric, values in (
+                ("request_bytes_sent_total", self.bytes_sent),
+                ("response_bytes_received_total", self.bytes_received),
+                ("request_retries_total", self.retries),
+            ):
+                name = f"{self._prefix}_{metric}"
+                lines += [f"# TYPE {name} counter"]
+                for (endpoint, method), value in sorted(values.items()):
+                    lines.append(f"{name}{self._labels(endpoint=endpoint, method=method)} {value}")
+
+            name = f"{self._prefix}_request_duration_seconds"
+            lines += [
+                f"# HELP {name} Duration of the API request phases.",
+                f"# TYPE {name} histogram",
+            ]
+            for (endpoint, method, phase), histogram in sorted(self.histograms.items()):
+                labels = {"endpoint": endpoint, "method": method, "phase": phase}
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    le = "+Inf" if math.isinf(bound) else repr(float(bound))
+                    lines.append(f"{name}_bucket{self._labels(**labels, le=le)} {cumulative}")
+                lines.append(f"{name}_sum{self._labels(**labels)} {histogram.sum}")
+                lines.append(f"{name}_count{self._labels(**labels)} {histogram.count}")
+
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port: int = 9464, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """
+        Expose the metrics at http://host:port/metrics in a background thread.
+
+        :param port: port of the server (0 for any free port)
+        :param host: address of the server
+        :return: the HTTP server (use shutdown() to stop it)
+        """
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip("/") != "/metrics":
+                    self.send_error(404)
+                    return
+                body = exporter.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self._server
+
+
+# Connection timings of the request currently executed by the thread
+_local = threading.local()
+
+
+def _record_timing(phase: str, value: float) -> None:
+    timings = getattr(_local, "timings", None)
+    if timings is not None:
+        timings[phase] = timings.get(phase, 0.0) + value
+
+
+@contextmanager
+def collect_timings() -> Iterator[Dict[str, float]]:
+    """
+    Collect the connection timings (connect, tls) of the requests made by the current thread
+    through the InstrumentedAdapter.
+
+    :return: context manager yielding the dictionary the timings are added to
+    """
+    timings = {}
+    _local.timings = timings
+    try:
+        yield timings
+    finally:
+        _local.timings = None
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    def _new_conn(self):
+        start = time.perf_counter()
+        try:
+            return super()._new_conn()
+        finally:
+            _record_timing("connect", time.perf_counter() - start)
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def _new_conn(self):
+        start = time.perf_counter()
+        try:
+            return super()._new_conn()
+        finally:
+            _record_timing("connect", time.perf_counter() - start)
+
+    def connect(self):
+        # The handshake is the part of connect() after the socket is created in _new_conn()
+        start = time.perf_counter()
+        timings = getattr(_local, "timings", None)
+        connect_before = timings.get("connect", 0.0) if timings is not None else 0.0
+        try:
+            super().connect()
+        finally:
+            if timings is not None:
+                connect = timings.get("connect", 0.0) - connect_before
+                _record_timing("tls", time.perf_counter() - start - connect)
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class InstrumentedAdapter(HTTPAdapter):
+    """Transport adapter whose connections report the connect and tls timings."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
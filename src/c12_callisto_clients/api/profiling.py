@@ -0,0 +1,95 @@
+"""
+  Opt-in profiling of the submission and result processing.
+
+  When a profile directory is set (the C12_PROFILE_DIR variable, the profile_dir field of
+  UserConfigs or the profile_dir argument of the backends), every call of the profiled
+  methods is run under cProfile and its statistics are written to the directory as
+  {time}-{operation}-{job ids}.prof files. The files can be read with pstats or snakeviz.
+  A profiled call nested in another one is part of the outer profile.
+"""
+
+import cProfile
+import functools
+import os
+import re
+import threading
+import time
+from typing import Callable, List, Optional
+
+from c12_callisto_clients.api.configs import PROFILE_DIR
+
+
+# Maximum number of job ids in the name of a profile file
+MAX_FILE_JOB_IDS = 3
+
+_active = threading.local()  # if a profiled call is running in the thread
+
+
+def resolve_profile_dir(directory: Optional[str] = None) -> Optional[str]:
+    """
+    Get the profile directory.
+
+    :param directory: directory given by the user, C12_PROFILE_DIR if None
+    :return: directory or None if the profiling is off
+    """
+    directory = PROFILE_DIR if directory is None else directory
+    return directory or None
+
+
+def profile_path(directory: str, operation: str, job_ids: List[str]) -> str:
+    """
+    Get the path of the profile of a call.
+
+    :param directory: profile directory
+    :param operation: name of the profiled operation
+    :param job_ids: ids of the jobs of the call
+    :return: path of the .prof file
+    """
+    ids = [re.sub(r"[^\w.-]", "_", str(job_id)) for job_id in job_ids[:MAX_FILE_JOB_IDS]]
+    if len(job_ids) > MAX_FILE_JOB_IDS:
+        ids.append(f"and{len(job_ids) - MAX_FILE_JOB_IDS}more")
+    stamp = time.strftime("%Y%m%dT%H%M%S") + f"{time.time() % 1:.6f}"[1:]
+    name = "-".join([stamp, operation] + (ids or ["nojob"]))
+    return os.path.join(directory, f"{name}.prof")
+
+
+def profiled(operation: str, job_ids: Callable[..., List[str]]):
+    """
+    Decorator of the methods that are profiled if the profile directory of the instance (its
+    profile_dir attribute) is set.
+
+    :param operation: name of the operation in the profile file names
+    :param job_ids: function (instance, args, kwargs, result) -> ids of the jobs of the call,
+                    the result is None if the call failed
+    :return: decorator
+    """
+
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            directory = getattr(self, "profile_dir", None)
+            if directory is None or getattr(_active, "running", False):
+                return method(self, *args, **kwargs)
+
+            profiler = cProfile.Profile()
+            result = None
+            _active.running = True
+            try:
+                profiler.enable()
+                try:
+                    result = method(self, *args, **kwargs)
+                finally:
+                    profiler.disable()
+                return result
+            finally:
+                _active.running = False
+                try:
+                    ids = job_ids(self, args, kwargs, result)
+                except Exception:  # pylint: disable=broad-except
+                    ids = []
+                os.makedirs(directory, exist_ok=True)
+                profiler.dump_stats(profile_path(directory, operation, ids))
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,136 @@
+"""
+  Helpers for working with the job results returned by the C12 sim APIs.
+"""
+
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+
+from c12_callisto_clients.api.sparse import is_sparse_payload
+
+
+# Statuses of a job as returned by the API (in upper case)
+FINAL_STATUSES = ("ERROR", "FINISHED", "CANCELLED")
+
+# Numpy types of the decoded amplitudes for the supported precisions
+PRECISIONS = {"double": np.complex128, "single": np.complex64}
+
+
+def complex_dtype(precision: str) -> type:
+    """
+    Get the numpy type of the decoded amplitudes for a given precision.
+
+    :param precision: "double" (complex128) or "single" (complex64)
+    :return: numpy complex type
+    :raises ValueError: if the precision is not supported
+    """
+    if precision not in PRECISIONS:
+        raise ValueError(f"Wrong parameter for precision argument: {precision}")
+    return PRECISIONS[precision]
+
+
+def split_shots(shots: int, max_shots_per_job: int) -> List[int]:
+    """
+    Split the number of shots into balanced chunks that are not larger than max_shots_per_job.
+
+    :param shots: total number of shots
+    :param max_shots_per_job: maximum number of shots of a single chunk
+    :return: list with the number of shots of each chunk
+    :raises ValueError: if the arguments are not positive
+    """
+    if shots < 1 or max_shots_per_job < 1:
+        raise ValueError(
+            f"Shots ({shots}) and shots per job ({max_shots_per_job}) must be positive"
+        )
+
+    n_chunks = -(-shots // max_shots_per_job)
+    base, rest = divmod(shots, n_chunks)
+    return [base + 1 if i < rest else base for i in range(n_chunks)]
+
+
+def merge_counts(counts_list: List[Dict[str, int]]) -> Dict[str, int]:
+    """
+    Merge the counts of several jobs that ran the same circuit.
+
+    :param counts_list: list of counts dictionaries
+    :return: dictionary with summed counts
+    """
+    merged: Dict[str, int] = {}
+    for counts in counts_list:
+        for key, value in counts.items():
+            merged[key] = merged.get(key, 0) + value
+    return merged
+
+
+def combine_statuses(statuses: List[str]) -> str:
+    """
+    Combine the statuses of the jobs that form a single logical job.
+
+    :param statuses: list of API job statuses
+    :return: API status of the whole group
+    """
+    statuses = [status.upper().strip() for status in statuses]
+    for status in ("ERROR", "CANCELLED", "RUNNING"):
+        if status in statuses:
+            return status
+    if statuses and all(status == "FINISHED" for status in statuses):
+        return "FINISHED"
+    if "FINISHED" in statuses:
+        return "RUNNING"
+    return "QUEUED"
+
+
+def decode_array(
+    data: Sequence[str], out: Optional[np.ndarray] = None, dtype: type = np.complex128
+) -> np.ndarray:
+    """
+    Function to convert the JSON list of complex number strings to a numpy array.
+
+    :param data: list of strings as "(0.5+0.1j)", the sparse statevector payload or an array
+                 already decoded by the StreamingDecoder
+    :param out: optional preallocated array the values are written to
+    :param dtype: numpy complex type of the array (if out is not given)
+    :return: complex numpy array
+    """
+    if isinstance(data, np.ndarray):
+        if out is None:
+            return data.astype(dtype, copy=False)
+        out[...] = data
+        return out
+
+    if is_sparse_payload(data):
+        if out is None:
+            out = np.zeros(data["dim"], dtype=dtype)
+        else:
+            out[...] = 0
+        for index, item in zip(data["indices"], data["values"]):
+            out[index] = complex(item)
+        return out
+
+    if out is None:
+        return np.fromiter((complex(item) for item in data), dtype=dtype, count=len(data))
+
+    for i, item in enumerate(data):
+        out[i] = complex(item)
+    return out
+
+
+def decode_matrix(
+    data: Sequence[Sequence[str]], out: Optional[np.ndarray] = None, dtype: type = np.complex128
+) -> np.ndarray:
+    """
+    Function to convert the JSON matrix of complex number strings to a numpy matrix.
+
+    :param data: list of rows with strings as "(0.5+0.1j)" or an already decoded array
+    :param out: optional preallocated matrix the values are written to
+    :param dtype: numpy complex type of the matrix (if out is not given)
+    :return: complex numpy matrix
+    """
+    if isinstance(data, np.ndarray):
+        return decode_array(data, out=out, dtype=dtype)
+
+    if out is None:
+        out = np.empty((len(data), len(data[0]) if len(data) > 0 else 0), dtype=dtype)
+
+    for i, row in enumerate(data):
+        out[i] = decode_array(row, dtype=out.dtype)
+    return out
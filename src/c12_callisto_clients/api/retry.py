@@ -0,0 +1,155 @@
+"""
+  Retry policy of the API requests.
+
+  Transient failures are retried with an exponential backoff. The failures are split into
+  three kinds with separate budgets: rate limiting (429), server errors (5xx) and connection
+  errors (refused or reset connections). The delay requested by the server in the
+  Retry-After header is honored. Retried job submissions carry the same idempotency key, so
+  the server does not create duplicate jobs.
+"""
+
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional, Sequence
+
+from c12_callisto_clients.api.configs import (
+    RETRY_RATE_LIMITED,
+    RETRY_SERVER_ERRORS,
+    RETRY_CONNECTION_ERRORS,
+    RETRY_BACKOFF,
+    RETRY_MAX_BACKOFF,
+)
+
+
+# Kinds of the transient failures
+RATE_LIMITED = "rate_limited"
+SERVER_ERROR = "server_error"
+CONNECTION_ERROR = "connection_error"
+
+# Server errors that are worth repeating (the others are caused by the request itself)
+RETRY_STATUSES = (500, 502, 503, 504)
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """
+    Parse the value of the Retry-After header.
+
+    :param value: number of seconds or an HTTP date
+    :param now: current time (seconds since the epoch), now if None
+    :return: seconds to wait or None if the value is missing or malformed
+    """
+    if value is None:
+        return None
+    value = value.strip()
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if date is None or date.tzinfo is None:
+        return None
+    now = time.time() if now is None else now
+    return max(date.timestamp() - now, 0.0)
+
+
+class RetryPolicy:
+    """Decides if and when a failed request is repeated."""
+
+    def __init__(
+        self,
+        rate_limited: Optional[int] = None,
+        server_errors: Optional[int] = None,
+        connection_errors: Optional[int] = None,
+        backoff: Optional[float] = None,
+        max_backoff: Optional[float] = None,
+        jitter: float = 0.1,
+        statuses: Sequence[int] = RETRY_STATUSES,
+    ):
+        """
+        :param rate_limited: retries of the rate limited requests (429),
+                             C12_RETRY_RATE_LIMITED if None
+        :param server_errors: retries of the requests that failed with a 5xx status,
+                              C12_RETRY_SERVER_ERRORS if None
+        :param connection_errors: retries of the requests whose connection failed,
+                                  C12_RETRY_CONNECTION_ERRORS if None
+        :param backoff: delay before the first retry (doubled with each retry),
+                        C12_RETRY_BACKOFF if None
+        :param max_backoff: maximum delay between the retries (also the maximum Retry-After
+                            that is honored, a longer one fails the request),
+                            C12_RETRY_MAX_BACKOFF if None
+        :param jitter: relative random spread of the backoff delays
+        :param statuses: server error statuses that are retried
+        """
+        self._budgets = {
+            RATE_LIMITED: RETRY_RATE_LIMITED if rate_limited is None else rate_limited,
+            SERVER_ERROR: RETRY_SERVER_ERRORS if server_errors is None else server_errors,
+            CONNECTION_ERROR: (
+                RETRY_CONNECTION_ERRORS if connection_errors is None else connection_errors
+            ),
+        }
+        if any(budget < 0 for budget in self._budgets.values()):
+            raise ValueError(f"Number of retries cannot be negative ({self._budgets})")
+
+        self.backoff = RETRY_BACKOFF if backoff is None else backoff
+        self.max_backoff = RETRY_MAX_BACKOFF if max_backoff is None else max_backoff
+        self.jitter = jitter
+        self.statuses = tuple(statuses)
+
+    @classmethod
+    def disabled(cls) -> "RetryPolicy":
+        """
+        Policy that never repeats a request.
+
+        :return: RetryPolicy instance
+        """
+        return cls(rate_limited=0, server_errors=0, connection_errors=0)
+
+    def budget(self, kind: str) -> int:
+        """
+        Number of retries of a failure kind.
+
+        :param kind: RATE_LIMITED, SERVER_ERROR or CONNECTION_ERROR
+        :return: number of retries
+        """
+        return self._budgets[kind]
+
+    def classify(self, status: int) -> Optional[str]:
+        """
+        Get the kind of the failure of a response status.
+
+        :param status: http status of the response
+        :return: RATE_LIMITED, SERVER_ERROR or None if the status is not retried
+        """
+        if status == 429:
+            return RATE_LIMITED
+        if status in self.statuses:
+            return SERVER_ERROR
+        return None
+
+    def delay(self, kind: str, attempt: int, retry_after: Optional[str] = None) -> Optional[float]:
+        """
+        Get the delay before the next retry.
+
+        :param kind: RATE_LIMITED, SERVER_ERROR or CONNECTION_ERROR
+        :param attempt: number of the retries of this kind done so far
+        :param retry_after: value of the Retry-After header of the response
+        :return: seconds to wait or None if the request should not be repeated
+        """
+        if attempt >= self._budgets[kind]:
+            return None
+
+        requested = parse_retry_after(retry_after)
+        if requested is not None:
+            return requested if requested <= self.max_backoff else None
+
+        delay = min(self.backoff * 2**attempt, self.max_backoff)
+        return delay * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def __repr__(self):
+        budgets = ", ".join(f"{kind}={budget}" for kind, budget in self._budgets.items())
+        return f"RetryPolicy({budgets}, backoff={self.backoff}, max_backoff={self.max_backoff})"
@@ -0,0 +1,265 @@
+"""
+  Sparse representation of the statevectors returned by the C12 sim APIs.
+
+  The sparse payload of a statevector is a dictionary
+  {"dim": 2**n, "indices": [i, ...], "values": ["(re+imj)", ...]}
+  with the indices and the values of the nonzero amplitudes.
+"""
+
+from typing import Dict, Optional, Sequence, Union
+import numpy as np
+
+
+# Amplitudes with absolute value below this tolerance are treated as zero
+SPARSE_ATOL = 1e-12
+
+
+def is_sparse_payload(data) -> bool:
+    """
+    Check if the statevector payload is in the sparse format.
+
+    :param data: statevector payload
+    :return: True if the payload is sparse
+    """
+    return isinstance(data, dict) and "indices" in data and "values" in data
+
+
+class SparseState:
+    """Statevector stored as the indices and the values of its nonzero amplitudes."""
+
+    def __init__(self, indices, values, dim: int):
+        """
+        :param indices: sorted indices of the nonzero amplitudes
+        :param values: values of the nonzero amplitudes
+        :param dim: dimension of the statevector (2**n)
+        """
+        self._indices = np.asarray(indices, dtype=np.int64)
+        self._values = np.asarray(values)
+        if not np.iscomplexobj(self._values):
+            self._values = self._values.astype(np.complex128)
+        self._dim = int(dim)
+
+        if self._indices.shape != self._values.shape:
+            raise ValueError("Indices and values of a sparse state must have the same length")
+
+    @property
+    def indices(self) -> np.ndarray:
+        """
+        Getter for the indices of the nonzero amplitudes.
+
+        :return: array of indices
+        """
+        return self._indices
+
+    @property
+    def values(self) -> np.ndarray:
+        """
+        Getter for the nonzero amplitudes.
+
+        :return: array of complex amplitudes
+        """
+        return self._values
+
+    @property
+    def dim(self) -> int:
+        """
+        Getter for the dimension of the statevector.
+
+        :return: dimension
+        """
+        return self._dim
+
+    @property
+    def num_qubits(self) -> int:
+        """
+        Number of qubits of the state.
+
+        :return: number of qubits
+        """
+        return self._dim.bit_length() - 1
+
+    @property
+    def nnz(self) -> int:
+        """
+        Number of stored (nonzero) amplitudes.
+
+        :return: number of amplitudes
+        """
+        return len(self._indices)
+
+    @property
+    def dtype(self):
+        """
+        Numpy type of the amplitudes.
+
+        :return: numpy dtype
+        """
+        return self._values.dtype
+
+    def to_dense(self) -> np.ndarray:
+        """
+        Convert the state into the dense statevector.
+
+        :return: complex numpy array of length dim
+        """
+        dense = np.zeros(self._dim, dtype=self._values.dtype)
+        dense[self._indices] = self._values
+        return dense
+
+    def __array__(self, dtype=None, copy=None):
+        dense = self.to_dense()
+        return dense if dtype is None else dense.astype(dtype)
+
+    def __len__(self):
+        return self._dim
+
+    def __getitem__(self, index: int) -> complex:
+        """
+        Amplitude of a basis state, so that the state can be used as a dense sequence.
+
+        :param index: index of the basis state
+        :return: amplitude (0 for the basis states that are not stored)
+        :raises IndexError: if the index is out of range
+        """
+        index = int(index)
+        if index < 0:
+            index += self._dim
+        if not 0 <= index < self._dim:
+            raise IndexError(f"Index {index} out of range of the state of dimension {self._dim}")
+        position = int(np.searchsorted(self._indices, index))
+        if position < len(self._indices) and self._indices[position] == index:
+            return complex(self._values[position])
+        return 0j
+
+    def probabilities(self) -> np.ndarray:
+        """
+        Probabilities of the stored basis states (in the order of the indices).
+
+        :return: array of probabilities
+        """
+        return np.abs(self._values) ** 2
+
+    def probabilities_dict(self, decimals: Optional[int] = None) -> Dict[str, float]:
+        """
+        Probabilities of the nonzero basis states as a dictionary of bitstrings
+        (Qiskit's little-endian ordering, the qubit 0 is the rightmost bit).
+
+        :param decimals: number of decimal places to round the probabilities to
+        :return: dictionary bitstring -> probability
+        """
+        probabilities = self.probabilities()
+        if decimals is not None:
+            probabilities = np.round(probabilities, decimals)
+        width = self.num_qubits
+        return {
+            format(int(index), f"0{width}b"): float(probability)
+            for index, probability in zip(self._indices, probabilities)
+            if probability != 0
+        }
+
+    def marginal(self, qargs: Sequence[int]) -> Dict[str, float]:
+        """
+        Marginal probabilities of a subset of qubits.
+
+        :param qargs: qubits to keep (qargs[0] is the rightmost bit of the keys)
+        :return: dictionary bitstring -> probability
+        """
+        probabilities = self.probabilities()
+        outcomes = np.zeros(len(self._indices), dtype=np.int64)
+        for position, qubit in enumerate(qargs):
+            outcomes |= ((self._indices >> qubit) & 1) << position
+
+        keys, inverse = np.unique(outcomes, return_inverse=True)
+        sums = np.bincount(inverse, weights=probabilities, minlength=len(keys))
+        width = len(qargs)
+        return {format(int(key), f"0{width}b"): float(value) for key, value in zip(keys, sums)}
+
+    def inner(self, other: Union["SparseState", np.ndarray]) -> complex:
+        """
+        Overlap <self|other> of two states.
+
+        :param other: SparseState or dense statevector
+        :return: complex overlap
+        """
+        if isinstance(other, SparseState):
+            if other.dim != self._dim:
+                raise ValueError("States have different dimensions")
+            _, mine, theirs = np.intersect1d(
+                self._indices, other.indices, assume_unique=True, return_indices=True
+            )
+            return complex(np.vdot(self._values[mine], other.values[theirs]))
+
+        other = np.asarray(other)
+        if other.shape != (self._dim,):
+            raise ValueError("States have different dimensions")
+        return complex(np.vdot(self._values, other[self._indices]))
+
+    def fidelity(self, other: Union["SparseState", np.ndarray]) -> float:
+        """
+        State fidelity |<self|other>|^2 of two pure states.
+
+        :param other: SparseState or dense statevector
+        :return: fidelity
+        """
+        return abs(self.inner(other)) ** 2
+
+    @classmethod
+    def from_dense(cls, array: np.ndarray, atol: float = SPARSE_ATOL) -> "SparseState":
+        """
+        Create the sparse state from the dense statevector.
+
+        :param array: dense statevector
+        :param atol: amplitudes with smaller absolute value are dropped
+        :return: SparseState
+        """
+        array = np.asarray(array)
+        indices = np.flatnonzero(np.abs(array) > atol)
+        return cls(indices, array[indices], len(array))
+
+    @classmethod
+    def from_json(
+        cls, data, dtype: type = np.complex128, atol: float = SPARSE_ATOL
+    ) -> "SparseState":
+        """
+        Decode the statevector payload (sparse or dense) into the sparse state without
+        creating the dense array.
+
+        :param data: sparse payload, list of complex number strings or a decoded dense array
+        :param dtype: numpy complex type of the amplitudes
+        :param atol: amplitudes of the dense payload with smaller absolute value are dropped
+        :return: SparseState
+        """
+        if isinstance(data, np.ndarray):
+            return cls.from_dense(data.astype(dtype, copy=False), atol)
+
+        if is_sparse_payload(data):
+            values = np.fromiter(
+                (complex(item) for item in data["values"]), dtype=dtype, count=len(data["values"])
+            )
+            indices = np.asarray(data["indices"], dtype=np.int64)
+            order = np.argsort(indices, kind="stable")
+            return cls(indices[order], values[order], data["dim"])
+
+        indices = []
+        values = []
+        for index, item in enumerate(data):
+            value = complex(item)
+            if abs(value) > atol:
+                indices.append(index)
+                values.append(value)
+        return cls(indices, np.asarray(values, dtype=dtype), len(data))
+
+    def to_json(self) -> dict:
+        """
+        Encode the state into the sparse payload.
+
+        :return: dictionary with dim, indices and values
+        """
+        return {
+            "dim": self._dim,
+            "indices": self._indices.tolist(),
+            "values": [str(complex(value)) for value in self._values],
+        }
+
+    def __repr__(self):
+        return f"SparseState(num_qubits={self.num_qubits}, nnz={self.nnz}, dtype={self.dtype})"
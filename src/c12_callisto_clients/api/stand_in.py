@@ -0,0 +1,569 @@
+"""
+  Offline stand-in of the C12 API for benchmarking and testing.
+
+  The server implements all the endpoints of the configs module. The jobs are queued and run
+  for configurable times, the responses can be delayed and failures can be injected. The
+  results are either synthetic (random states of a given number of qubits) or computed by
+  the local Qiskit simulation of the submitted circuit. The received requests and the sizes
+  of the sent bodies are recorded and any endpoint can be given a fixed response, so the
+  server also serves as the foundation of the client tests.
+
+  Usage: python -m c12_callisto_clients.api.stand_in [--port 8080] [--qubits 10]
+  and point the clients to it with the printed C12_HOST_URL, C12_PORT and C12_PROTOCOL
+  variables (or use StandInServer.patch_urls() in the same process).
+"""
+
+import argparse
+import contextlib
+import gzip
+import json
+import re
+import threading
+import time
+import uuid
+import zlib
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from c12_callisto_clients.api import client, configs
+from c12_callisto_clients.api.sparse import SparseState
+
+
+# Ways the results of the jobs are generated
+SYNTHETIC = "synthetic"
+SIMULATE = "simulate"
+
+DEFAULT_BACKENDS = [
+    {
+        "backend_name": "c12sim-iswap",
+        "n_qubits": 20,
+        "basis_gates": ["rx", "ry", "rz", "iswap", "cx"],
+        "max-circuits": 1,
+    }
+]
+
+_QREG = re.compile(r"^\s*qreg\s+\w+\s*\[\s*(\d+)\s*\]", re.MULTILINE)
+_BARRIER = re.compile(r"^\s*barrier\b", re.MULTILINE)
+
+
+def _encode_array(array: np.ndarray) -> List[str]:
+    return list(map(str, array.tolist()))
+
+
+def _encode_matrix(matrix: np.ndarray) -> List[List[str]]:
+    return [list(map(str, row)) for row in matrix.tolist()]
+
+
+class _Job:
+    """Job kept by the stand-in server."""
+
+    def __init__(self, params: dict, created: float):
+        self.uuid = str(uuid.uuid4())
+        self.params = params
+        self.created = created
+        self.outputs = [output.strip() for output in params["result"].split(",")]
+        self.results: Optional[dict] = None
+        self.errors = ""
+
+    @property
+    def shots(self) -> int:
+        return int(self.params["num_shots"])
+
+
+class StandInServer(ThreadingHTTPServer):
+    """Local HTTP server standing in for the C12 API."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        results: str = SYNTHETIC,
+        qubits: Optional[int] = None,
+        queue_delay: float = 0.0,
+        run_delay: float = 0.0,
+        latency: float = 0.0,
+        faults: Optional[list] = None,
+        failure_rate: float = 0.0,
+        job_failure_rate: float = 0.0,
+        sparse: bool = False,
+        token: Optional[str] = None,
+        max_jobs: int = 10,
+        backends: Optional[List[dict]] = None,
+        seed: Optional[int] = None,
+        accept_compressed: bool = True,
+        responses: Optional[Dict[str, dict]] = None,
+    ):
+        """
+        :param host: address the server listens on
+        :param port: port the server listens on (a free one if 0)
+        :param results: SYNTHETIC (random states) or SIMULATE (local Qiskit simulation of the
+                        circuits, requires Qiskit)
+        :param qubits: number of qubits of the synthetic results (the number of qubits of the
+                       circuit if None)
+        :param queue_delay: seconds the jobs stay queued
+        :param run_delay: seconds the jobs are running
+        :param latency: seconds every response is delayed
+        :param faults: faults injected into the next responses, each is a status, a tuple
+                       (status, Retry-After) or "reset" (the request is processed but the
+                       connection is dropped without a response)
+        :param failure_rate: probability a response fails with the 503 status
+        :param job_failure_rate: probability a job finishes with the ERROR status
+        :param sparse: if the statevectors are returned in the sparse payload
+        :param token: the only accepted token (any bearer token if None)
+        :param max_jobs: maximum number of jobs of a user (maxjobs endpoint)
+        :param backends: available backends (a single c12sim-iswap backend if None)
+        :param seed: seed of the synthetic results and the random failures
+        :param accept_compressed: if the compressed request bodies are accepted (415 otherwise)
+        :param responses: fixed responses of the endpoints by the names of the URL constants of
+                          the configs (e.g. API_JOB_STATUS_URL), sent instead of the job data
+        """
+        if results not in (SYNTHETIC, SIMULATE):
+            raise ValueError(f"Wrong parameter for results argument: {results}")
+        super().__init__((host, port), _Handler)
+        self.results = results
+        self.qubits = qubits
+        self.queue_delay = queue_delay
+        self.run_delay = run_delay
+        self.latency = latency
+        self.faults = list(faults or [])
+        self.failure_rate = failure_rate
+        self.job_failure_rate = job_failure_rate
+        self.sparse = sparse
+        self.token = token
+        self.max_jobs = max_jobs
+        self.backends = DEFAULT_BACKENDS if backends is None else backends
+        self.accept_compressed = accept_compressed
+        self.responses = dict(responses or {})
+        self.physical_params = {"t1": 50e-6, "t2": 70e-6, "gate_time": 35e-9}
+        self.calls = Counter()  # requests by the endpoint path
+        self.received: List[dict] = []  # method, path, encoding, size and key of the requests
+        self.sent: List[int] = []  # sizes of the sent response bodies
+        self._rng = np.random.default_rng(seed)
+        self._jobs: Dict[str, _Job] = {}
+        self._keys: Dict[str, str] = {}  # job uuids by the idempotency keys
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self.serve_forever, args=(0.05,), daemon=True)
+
+    @property
+    def url(self) -> str:
+        """
+        Getter for the URL of the simulator endpoints.
+
+        :return: URL (same as API_SIMULATOR_URL of the clients pointed to the server)
+        """
+        return self.urls["API_SIMULATOR_URL"]
+
+    @property
+    def urls(self) -> Dict[str, str]:
+        """
+        Getter for the URLs of all the endpoints of the server.
+
+        :return: dictionary with the names of the URL constants of the configs and the URLs
+        """
+        host, port = self.server_address[:2]
+        return configs.api_urls("http", host, port)
+
+    @property
+    def environ(self) -> Dict[str, str]:
+        """
+        Getter for the environment variables that point the clients to the server.
+
+        :return: dictionary with C12_HOST_URL, C12_PORT and C12_PROTOCOL
+        """
+        host, port = self.server_address[:2]
+        return {"C12_HOST_URL": host, "C12_PORT": str(port), "C12_PROTOCOL": "http"}
+
+    @contextlib.contextmanager
+    def patch_urls(self):
+        """
+        Point the API clients of this process to the server (the URLs are restored on exit).
+
+        :return: context manager
+        """
+        original = {}
+        for module in (configs, client):
+            for name, url in self.urls.items():
+                if hasattr(module, name):
+                    original[module, name] = getattr(module, name)
+                    setattr(module, name, url)
+        try:
+            yield self
+        finally:
+            for (module, name), url in original.items():
+                setattr(module, name, url)
+
+    def start(self) -> "StandInServer":
+        """
+        Serve the requests in a background thread.
+
+        :return: the server
+        """
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """
+        Stop serving the requests and close the socket.
+
+        :return: None
+        """
+        if self._thread.is_alive():
+            self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def submit(self, params: dict, key: Optional[str] = None) -> _Job:
+        """
+        Create a job (the submissions with the same idempotency key create a single job).
+
+        :param params: parameters of the job (body of the POST request)
+        :param key: idempotency key of the submission
+        :return: created (or the already existing) job
+        """
+        with self._lock:
+            if key is not None and key in self._keys:
+                return self._jobs[self._keys[key]]
+            job = _Job(params, time.time())
+            self._jobs[job.uuid] = job
+            if key is not None:
+                self._keys[key] = job.uuid
+            return job
+
+    def next_fault(self):
+        """
+        Get the fault injected into the next response.
+
+        :return: status, tuple (status, Retry-After), "reset" or None if the response is sent
+        """
+        with self._lock:
+            if self.faults:
+                return self.faults.pop(0)
+            if self._rng.random() < self.failure_rate:
+                return 503
+            return None
+
+    def find_job(self, job_uuid: Optional[str]) -> Optional[_Job]:
+        """
+        Find a job by its uuid.
+
+        :param job_uuid: uuid of the job
+        :return: job or None
+        """
+        with self._lock:
+            return self._jobs.get(job_uuid)
+
+    @property
+    def jobs(self) -> List[_Job]:
+        """
+        Getter for the jobs of the server.
+
+        :return: list of the jobs from the newest one
+        """
+        with self._lock:
+            return sorted(self._jobs.values(), key=lambda job: job.created, reverse=True)
+
+    def status(self, job: _Job) -> str:
+        """
+        Get the status of a job (the results are generated when the job finishes).
+
+        :param job: job of the server
+        :return: QUEUED, RUNNING, FINISHED or ERROR
+        """
+        elapsed = time.time() - job.created
+        if elapsed < self.queue_delay:
+            return "QUEUED"
+        if elapsed < self.queue_delay + self.run_delay:
+            return "RUNNING"
+
+        with self._lock:
+            if job.results is None and not job.errors:
+                if self._rng.random() < self.job_failure_rate:
+                    job.errors = "Injected job failure"
+                else:
+                    try:
+                        job.results = self._generate(job)
+                    except Exception as err:  # pylint: disable=broad-except
+                        job.errors = f"Simulation failed: {err}"
+        return "ERROR" if job.errors else "FINISHED"
+
+    def _generate(self, job: _Job) -> dict:
+        """Generate the results of a finished job."""
+        qasm = job.params["qasm_str"]
+        if self.results == SIMULATE:
+            # pylint: disable=import-outside-toplevel
+            from qiskit import qasm2
+            from c12_callisto_clients.qiskit.c12sim_local import can_run_locally, simulate
+
+            circuit = qasm2.loads(qasm, custom_instructions=qasm2.LEGACY_CUSTOM_INSTRUCTIONS)
+            if not can_run_locally(circuit, circuit.num_qubits):
+                raise ValueError("the circuit is not supported by the local simulation")
+            counts, statevector, states = simulate(circuit, job.shots)
+        else:
+            n_qubits = self.qubits or sum(int(size) for size in _QREG.findall(qasm)) or 1
+            counts, statevector, states = self._synthetic(
+                n_qubits, job.shots, len(_BARRIER.findall(qasm))
+            )
+
+        results = {"counts": counts}
+        if "statevector" in job.outputs:
+            results["statevector"] = self._encode_state(statevector)
+        if "density_matrix" in job.outputs:
+            results["density_matrix"] = _encode_matrix(np.outer(statevector, statevector.conj()))
+        if "states" in job.outputs:
+            results["states"] = {
+                "statevector": {
+                    key: self._encode_state(value)
+                    for key, value in states.items()
+                    if key[:2] == "sv"
+                },
+                "density_matrix": {
+                    key: _encode_matrix(value) for key, value in states.items() if key[:2] == "dm"
+                },
+            }
+        return results
+
+    def _encode_state(self, state: np.ndarray):
+        if self.sparse:
+            return SparseState.from_dense(state).to_json()
+        return _encode_array(state)
+
+    def _synthetic(self, n_qubits: int, shots: int, n_barriers: int):
+        """Random normalized states and the counts sampled from the final one."""
+        random_states = []
+        for _ in range(n_barriers + 1):
+            state = self._rng.normal(size=2**n_qubits) + 1j * self._rng.normal(size=2**n_qubits)
+            random_states.append(state / np.linalg.norm(state))
+        statevector = random_states[-1]
+
+        probabilities = np.abs(statevector) ** 2
+        outcomes = self._rng.multinomial(shots, probabilities / probabilities.sum())
+        counts = {
+            format(int(index), f"0{n_qubits}b"): int(outcomes[index])
+            for index in np.flatnonzero(outcomes)
+        }
+
+        states = {}
+        for barrier, state in enumerate(random_states[:-1], start=1):
+            states[f"sv{barrier}"] = state
+            states[f"dm{barrier}"] = np.outer(state, state.conj())
+        return counts, statevector, states
+
+    def job_data(self, job: _Job) -> dict:
+        """
+        Get the data of a job as returned by the job endpoints.
+
+        :param job: job of the server
+        :return: dictionary with the uuid, status, options, task, errors and results
+        """
+        status = self.status(job)
+        return {
+            "uuid": job.uuid,
+            "status": status.lower(),
+            "options": {"shots": job.shots, "result": job.params["result"]},
+            "task": job.params["qasm_str"],
+            "task_orig": job.params["qasm_str"],
+            "errors": job.errors,
+            "result": job.results if status == "FINISHED" else None,
+        }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: StandInServer
+    dropped = False  # the response of the request is not sent (injected reset)
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status: int, data: dict, headers: Optional[dict] = None):
+        if self.dropped:
+            self.close_connection = True
+            return
+
+        body = json.dumps(data).encode()
+        headers = {"Content-Type": "application/json", **(headers or {})}
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body, compresslevel=1)
+            headers["Content-Encoding"] = "gzip"
+
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.sent.append(len(body))
+
+    def _fail(self) -> bool:
+        """Respond with an injected fault or a random failure, if there is one."""
+        fault = self.server.next_fault()
+        if fault is None:
+            return False
+        if fault == "reset":
+            # The request is still processed, only its response is lost
+            self.dropped = True
+            return False
+        status, retry_after = fault if isinstance(fault, tuple) else (fault, None)
+        headers = {} if retry_after is None else {"Retry-After": str(retry_after)}
+        self._send(status, {"error": "Injected fault"}, headers)
+        return True
+
+    def _authorized(self) -> bool:
+        authorization = self.headers.get("Authorization", "")
+        if not authorization.startswith("Bearer "):
+            return False
+        return self.server.token is None or authorization[7:] == self.server.token
+
+    def _handle(self, method: str):
+        parts = urlsplit(self.path)
+        path = parts.path.rstrip("/")
+        self.server.calls[f"{method} {path}"] += 1
+        time.sleep(self.server.latency)
+
+        body = None
+        if method == "POST":
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.server.received.append(
+            {
+                "method": method,
+                "path": path,
+                "encoding": self.headers.get("Content-Encoding"),
+                "size": 0 if body is None else len(body),
+                "key": self.headers.get("Idempotency-Key"),
+            }
+        )
+        if self._fail():
+            return
+        if not self._authorized():
+            self._send(401, {"error": "Unauthorized"})
+            return
+
+        urls = {name: urlsplit(url).path for name, url in self.server.urls.items()}
+        query = {key: values[0] for key, values in parse_qs(parts.query).items()}
+        names = [name for name in self.server.responses if urls.get(name) == path]
+
+        if names:
+            self._send(200, self.server.responses[names[0]])
+        elif method == "POST" and path == urls["API_QUERY_URL"]:
+            self._start_job(body)
+        elif method != "GET":
+            self._send(405, {"error": "Method not allowed"})
+        elif path == urls["API_HEALTH_URL"]:
+            self._send(200, {"status": "ok"})
+        elif path == urls["API_BACKENDS_URL"]:
+            self._send(200, {"backends": self.server.backends})
+        elif path == urls["API_PARAMS_URL"]:
+            self._send(200, {"physical_params": self.server.physical_params})
+        elif path == urls["API_MAXJOBS_URL"]:
+            self._send(200, {"maxjobs": self.server.max_jobs})
+        elif path == urls["API_USER_JOBS"]:
+            offset = int(query.get("offset", 0))
+            jobs = self.server.jobs[offset : offset + int(query.get("limit", 50))]
+            self._send(200, {"jobs": [self.server.job_data(job) for job in jobs]})
+        elif path in (urls["API_QUERY_URL"], urls["API_JOB_STATUS_URL"], urls["API_GET_JOB"]):
+            job = self.server.find_job(query.get("job_uuid"))
+            if job is None:
+                self._send(404, {"error": "Job not found"})
+            elif path == urls["API_JOB_STATUS_URL"]:
+                self._send(200, {"status": self.server.status(job)})
+            elif path == urls["API_GET_JOB"]:
+                self._send(200, {"job": self.server.job_data(job)})
+            else:
+                self._query_result(job, query.get("output_data"))
+        else:
+            self._send(404, {"error": "Not found"})
+
+    def _start_job(self, body: bytes):
+        encoding = self.headers.get("Content-Encoding")
+        if encoding is not None and not self.server.accept_compressed:
+            self._send(415, {"error": "Unsupported content encoding"})
+            return
+        if encoding == "gzip":
+            body = gzip.decompress(body)
+        elif encoding == "deflate":
+            body = zlib.decompress(body)
+
+        try:
+            params = json.loads(body)
+            if not {"qasm_str", "num_shots", "result"} <= params.keys():
+                raise ValueError("missing parameters")
+        except ValueError as err:
+            self._send(422, {"error": f"Wrong job parameters: {err}"})
+            return
+
+        job = self.server.submit(params, self.headers.get("Idempotency-Key"))
+        self._send(200, {"job_uuid": job.uuid, "transpiled": params["qasm_str"]})
+
+    def _query_result(self, job: _Job, output_data: Optional[str]):
+        status = self.server.status(job)
+        results = None
+        if status == "FINISHED":
+            results = job.results
+            if output_data:
+                outputs = [output.strip() for output in output_data.split(",")]
+                results = {key: value for key, value in results.items() if key in outputs}
+        self._send(200, {"status": status, "results": results, "errors": job.errors})
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_PUT(self):
+        self._handle("PUT")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline stand-in of the C12 API")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    parser.add_argument("--port", type=int, default=8080, help="port to listen on (0 for any)")
+    parser.add_argument("--results", choices=(SYNTHETIC, SIMULATE), default=SYNTHETIC)
+    parser.add_argument("--qubits", type=int, default=None, help="qubits of synthetic results")
+    parser.add_argument("--queue-delay", type=float, default=0.0, help="seconds jobs are queued")
+    parser.add_argument("--run-delay", type=float, default=0.0, help="seconds jobs are running")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds of response delay")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="rate of 503 responses")
+    parser.add_argument("--job-failure-rate", type=float, default=0.0, help="rate of job errors")
+    parser.add_argument("--sparse", action="store_true", help="sparse statevector payloads")
+    parser.add_argument("--seed", type=int, default=None, help="seed of the random results")
+    args = parser.parse_args()
+
+    server = StandInServer(
+        host=args.host,
+        port=args.port,
+        results=args.results,
+        qubits=args.qubits,
+        queue_delay=args.queue_delay,
+        run_delay=args.run_delay,
+        latency=args.latency,
+        failure_rate=args.failure_rate,
+        job_failure_rate=args.job_failure_rate,
+        sparse=args.sparse,
+        seed=args.seed,
+    )
+    for name, value in server.environ.items():
+        print(f"export {name}={value}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+  Storage of the decoded job results in memory-mapped files.
+"""
+
+import os
+import shutil
+from typing import List, Optional, Tuple
+import numpy as np
+
+
+class ArrayStore:
+    """
+    Store of the result arrays of a single job in a job-scoped directory. Each array is
+    kept in a .npy file and returned as a read-only memory-mapped view, so the data is paged
+    in by the OS on demand instead of being held in RAM.
+    """
+
+    def __init__(self, directory: str):
+        """
+        :param directory: job-scoped directory where the arrays are stored
+        """
+        self._directory = directory
+        os.makedirs(self._directory, exist_ok=True)
+
+    @property
+    def directory(self) -> str:
+        """
+        Getter for the directory of the store.
+
+        :return: path of the directory
+        """
+        return self._directory
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self._directory, f"{name}.npy")
+
+    def allocate(self, name: str, shape: Tuple[int, ...], dtype=np.complex128) -> np.memmap:
+        """
+        Create a writable memory-mapped array.
+
+        :param name: name of the array (e.g. statevector, sv1, dm1)
+        :param shape: shape of the array
+        :param dtype: type of the array elements
+        :return: writable memory-mapped array
+        """
+        return np.lib.format.open_memmap(self._path(name), mode="w+", dtype=dtype, shape=shape)
+
+    def load(self, name: str) -> Optional[np.ndarray]:
+        """
+        Load a stored array as a read-only memory-mapped view.
+
+        :param name: name of the array
+        :return: memory-mapped array or None if it does not exist
+        """
+        path = self._path(name)
+        if not os.path.exists(path):
+            return None
+        return np.load(path, mmap_mode="r")
+
+    def save(self, name: str, array: np.ndarray) -> np.ndarray:
+        """
+        Store an array and return a read-only memory-mapped view of it.
+
+        :param name: name of the array
+        :param array: array to store
+        :return: memory-mapped array
+        """
+        stored = self.allocate(name, array.shape, array.dtype)
+        stored[...] = array
+        stored.flush()
+        del stored
+        return self.load(name)
+
+    def names(self) -> List[str]:
+        """
+        Names of all stored arrays.
+
+        :return: list of names
+        """
+        return sorted(item[:-4] for item in os.listdir(self._directory) if item.endswith(".npy"))
+
+    def remove(self) -> None:
+        """
+        Remove the directory of the store with all the arrays.
+
+        :return: None
+        """
+        shutil.rmtree(self._directory, ignore_errors=True)
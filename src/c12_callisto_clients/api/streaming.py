@@ -0,0 +1,301 @@
+"""
+  Incremental parsing of the JSON responses of the C12 sim APIs.
+
+  The amplitude arrays (statevectors and density matrices) are decoded directly into
+  numpy buffers while the response body is read, so neither the whole body nor the
+  intermediate lists of complex number strings are held in memory.
+"""
+
+import codecs
+import json
+import re
+from typing import Callable, Iterable, Optional, Tuple
+import numpy as np
+
+from c12_callisto_clients.api.exceptions import ApiError
+
+
+# Keys of the amplitude arrays in the results (mid-circuit states are under "states")
+AMPLITUDE_KEYS = ("statevector", "density_matrix")
+
+# Initial length of the buffer of a vector whose length is not known in advance
+_INITIAL_LENGTH = 1024
+# Longest accepted text of a single amplitude, anything longer is treated as malformed
+_MAX_AMPLITUDE_LENGTH = 1024
+
+_STRING, _NUMBER, _LITERAL, _PUNCTUATION = 1, 2, 3, 4
+
+_TOKEN = re.compile(
+    r'\s*(?:"([^"\\]*(?:\\.[^"\\]*)*)"|(-?[0-9][0-9.eE+-]*)|(true|false|null)|([{}\[\],:]))'
+)
+_AMPLITUDE = re.compile(r'\s*(?:"([^"\\]*)"|(-?[0-9][0-9.eE+-]*))\s*([,\]])')
+# Run of consecutive amplitudes that are each followed by a comma
+_AMPLITUDE_RUN = re.compile(r'(?:\s*(?:"[^"\\,]*"|-?[0-9][0-9.eE+-]*)\s*,)*')
+_LITERALS = {"true": True, "false": False, "null": None}
+
+
+class _Tokens:
+    """Pull tokenizer over an iterable of byte chunks."""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> None:
+        text = ""
+        while not text and not self._eof:
+            try:
+                chunk = next(self._chunks)
+            except StopIteration:
+                text = self._decoder.decode(b"", final=True)
+                self._eof = True
+            else:
+                text = self._decoder.decode(chunk)
+
+        self._buffer = self._buffer[self._pos :] + text
+        self._pos = 0
+
+    def _match(self, pattern: re.Pattern, limit: Optional[int] = None) -> re.Match:
+        while True:
+            match = pattern.match(self._buffer, self._pos)
+            # A match touching the end of the buffer may continue in the next chunk
+            if match is not None and (match.end() < len(self._buffer) or self._eof):
+                return match
+            if self._eof or (limit is not None and len(self._buffer) - self._pos > limit):
+                raise ApiError(f"Malformed JSON response at: {self._buffer[self._pos:][:50]!r}")
+            self._fill()
+
+    def token(self, peek: bool = False) -> Tuple[int, str]:
+        """
+        Read the next token.
+
+        :param peek: if True the token is not consumed
+        :return: tuple (kind of the token, text of the token)
+        """
+        match = self._match(_TOKEN)
+        if not peek:
+            self._pos = match.end()
+        return match.lastindex, match.group(match.lastindex)
+
+    def amplitude(self) -> Tuple[str, str]:
+        """
+        Read an element of an amplitude array together with the following separator.
+
+        :return: tuple (text of the amplitude, "," or "]")
+        """
+        match = self._match(_AMPLITUDE, limit=_MAX_AMPLITUDE_LENGTH)
+        self._pos = match.end()
+        value = match.group(1)
+        return (match.group(2) if value is None else value), match.group(3)
+
+    def amplitude_run(self) -> list:
+        """
+        Read all the complete amplitudes in the buffer that are followed by a comma.
+
+        :return: list of texts of the amplitudes (possibly empty)
+        """
+        match = _AMPLITUDE_RUN.match(self._buffer, self._pos)
+        if match.end() == self._pos:
+            return []
+        text = self._buffer[self._pos : match.end()]
+        self._pos = match.end()
+        return text.replace('"', "").split(",")[:-1]
+
+
+class StreamingDecoder:
+    """
+    Decoder of a JSON response body that is read in chunks. The result is the same
+    as of json.loads, except that the amplitude arrays are numpy arrays instead of lists
+    of strings.
+    """
+
+    def __init__(
+        self,
+        dtype: type = np.complex128,
+        allocate: Optional[Callable[[str, Tuple[int, ...], type], np.ndarray]] = None,
+    ):
+        """
+        :param dtype: numpy complex type of the decoded amplitudes
+        :param allocate: optional function (name, shape, dtype) -> array used to allocate the
+                         amplitude arrays (e.g. ArrayStore.allocate), the name is the key of the
+                         array (statevector, density_matrix, sv{n}, dm{n})
+        """
+        self._dtype = dtype
+        self._allocate = allocate
+        self._tokens = None
+
+    @property
+    def key(self) -> Optional[tuple]:
+        """
+        Key of the decoders that produce interchangeable results.
+
+        :return: tuple or None if the arrays are allocated by a custom function (the results
+                 of such decoders cannot be shared)
+        """
+        if self._allocate is not None:
+            return None
+        return ("stream", np.dtype(self._dtype).str)
+
+    def decode(self, chunks: Iterable[bytes]) -> object:
+        """
+        Parse the response body.
+
+        :param chunks: iterable of byte chunks of the body (e.g. response.iter_content())
+        :return: decoded JSON object
+        :raises ApiError: if the body is not valid JSON
+        """
+        self._tokens = _Tokens(chunks)
+        try:
+            return self._value(())
+        finally:
+            self._tokens = None
+
+    @staticmethod
+    def is_amplitude_path(path: Tuple[str, ...]) -> bool:
+        """
+        Check if the value at the path in the response is an amplitude array.
+
+        :param path: keys leading to the value
+        :return: True for the final and mid-circuit statevectors and density matrices
+        """
+        if not path:
+            return False
+        if path[-1] in AMPLITUDE_KEYS:
+            return True
+        return len(path) >= 3 and path[-3] == "states" and path[-2] in AMPLITUDE_KEYS
+
+    def _value(self, path: Tuple[str, ...]) -> object:
+        kind, text = self._tokens.token()
+        return self._parse(kind, text, path)
+
+    def _parse(self, kind: int, text: str, path: Tuple[str, ...]) -> object:
+        if kind == _STRING:
+            return json.loads(f'"{text}"') if "\\" in text else text
+        if kind == _NUMBER:
+            return json.loads(text)
+        if kind == _LITERAL:
+            return _LITERALS[text]
+        if text == "{":
+            return self._object(path)
+        if text == "[":
+            if self.is_amplitude_path(path):
+                return self._amplitudes(path)
+            return self._array(path)
+        raise ApiError(f"Malformed JSON response, unexpected {text!r}")
+
+    def _expect(self, expected: str) -> None:
+        kind, text = self._tokens.token()
+        if kind != _PUNCTUATION or text != expected:
+            raise ApiError(f"Malformed JSON response, expected {expected!r} instead of {text!r}")
+
+    def _object(self, path: Tuple[str, ...]) -> dict:
+        result = {}
+        kind, text = self._tokens.token()
+        if kind == _PUNCTUATION and text == "}":
+            return result
+
+        while True:
+            if kind != _STRING:
+                raise ApiError(f"Malformed JSON response, unexpected key {text!r}")
+            key = self._parse(kind, text, path)
+            self._expect(":")
+            result[key] = self._value(path + (key,))
+
+            kind, text = self._tokens.token()
+            if kind == _PUNCTUATION and text == "}":
+                return result
+            if kind != _PUNCTUATION or text != ",":
+                raise ApiError(f"Malformed JSON response, unexpected {text!r}")
+            kind, text = self._tokens.token()
+
+    def _array(self, path: Tuple[str, ...]) -> list:
+        result = []
+        kind, text = self._tokens.token()
+        if kind == _PUNCTUATION and text == "]":
+            return result
+
+        while True:
+            result.append(self._parse(kind, text, path))
+
+            kind, text = self._tokens.token()
+            if kind == _PUNCTUATION and text == "]":
+                return result
+            if kind != _PUNCTUATION or text != ",":
+                raise ApiError(f"Malformed JSON response, unexpected {text!r}")
+            kind, text = self._tokens.token()
+
+    def _new_array(self, path: Tuple[str, ...], shape: Tuple[int, ...]) -> np.ndarray:
+        if self._allocate is None:
+            return np.empty(shape, dtype=self._dtype)
+        return self._allocate(path[-1], shape, self._dtype)
+
+    def _vector(self, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Read the elements of a vector (after its opening bracket) into the buffer."""
+        kind, text = self._tokens.token(peek=True)
+        if kind == _PUNCTUATION and text == "]":
+            self._tokens.token()
+            buffer = np.empty(0, dtype=self._dtype) if out is None else out
+            length = 0
+        else:
+            buffer = np.empty(_INITIAL_LENGTH, dtype=self._dtype) if out is None else out
+            length = 0
+            separator = ","
+            while separator == ",":
+                # Amplitudes are converted in batches of the whole buffered runs, the one
+                # before the closing bracket (or split between chunks) is read separately
+                texts = self._tokens.amplitude_run()
+                if not texts:
+                    text, separator = self._tokens.amplitude()
+                    texts = [text]
+
+                if length + len(texts) > len(buffer):
+                    if out is not None:
+                        raise ApiError("Unexpected shape of the amplitude matrix")
+                    buffer = np.resize(buffer, max(2 * len(buffer), length + len(texts)))
+                buffer[length : length + len(texts)] = np.fromiter(
+                    map(complex, texts), dtype=self._dtype, count=len(texts)
+                )
+                length += len(texts)
+
+        if out is not None:
+            if length != len(out):
+                raise ApiError("Unexpected shape of the amplitude matrix")
+            return out
+        return buffer[:length] if length == len(buffer) else buffer[:length].copy()
+
+    def _amplitudes(self, path: Tuple[str, ...]) -> np.ndarray:
+        kind, text = self._tokens.token(peek=True)
+        if kind != _PUNCTUATION or text != "[":
+            vector = self._vector()
+            if self._allocate is None:
+                return vector
+            out = self._new_array(path, vector.shape)
+            out[...] = vector
+            return out
+
+        # Matrix: the first row determines the dimension of the (square) matrix
+        self._tokens.token()
+        row = self._vector()
+        matrix = self._new_array(path, (len(row), len(row)))
+        if len(row) > 0:
+            matrix[0] = row
+
+        rows = 1
+        while True:
+            kind, text = self._tokens.token()
+            if kind == _PUNCTUATION and text == "]":
+                break
+            if kind != _PUNCTUATION or text != ",":
+                raise ApiError(f"Malformed JSON response, unexpected {text!r}")
+            self._expect("[")
+            if rows >= len(matrix):
+                raise ApiError("Unexpected shape of the amplitude matrix")
+            self._vector(out=matrix[rows])
+            rows += 1
+
+        if rows != len(matrix) and len(row) > 0:
+            raise ApiError("Unexpected shape of the amplitude matrix")
+        return matrix
@@ -0,0 +1,181 @@
+"""
+  Timeline of the lifecycle of a job.
+
+  The phases of a job (client-side preparation, submission, waiting in the queue, running,
+  download and decoding of the results) are recorded as spans with wall-clock start and end
+  times. The QUEUED and RUNNING phases are derived from the statuses seen by the poller, so
+  their boundaries are only as precise as the polling interval.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+
+# Phases derived from the job statuses reported by the API
+_STATUS_PHASES = {"QUEUED": "queued", "RUNNING": "running"}
+
+
+class Span:
+    """Single phase of the job lifecycle."""
+
+    def __init__(self, name: str, start: float, end: Optional[float] = None, **attributes):
+        """
+        :param name: name of the phase (prepare, submit, queued, running, download, decode, ...)
+        :param start: start of the phase (seconds since the epoch)
+        :param end: end of the phase (None while the phase is in progress)
+        :param attributes: additional information (e.g. job_id, error)
+        """
+        self.name = name
+        self.start = start
+        self.end = end
+        self.attributes = attributes
+
+    @property
+    def duration(self) -> Optional[float]:
+        """
+        Duration of the phase.
+
+        :return: seconds or None if the phase is in progress
+        """
+        return None if self.end is None else self.end - self.start
+
+    def to_dict(self) -> dict:
+        """
+        Convert the span into a dictionary.
+
+        :return: dictionary with the name, start, end, duration and attributes
+        """
+        return {
+            "name": self.name,
+            "start": self.start,
+            "end": self.end,
+            "duration": self.duration,
+            **self.attributes,
+        }
+
+    def __repr__(self):
+        duration = "in progress" if self.end is None else f"{self.duration * 1e3:.1f}ms"
+        return f"Span({self.name}, {duration})"
+
+
+class Timeline:
+    """Spans of the lifecycle of one job (or of a group of jobs submitted together)."""
+
+    def __init__(self):
+        self._spans: List[Span] = []
+        self._status_spans: Dict[Optional[str], Span] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def spans(self) -> List[Span]:
+        """
+        Getter for the recorded spans.
+
+        :return: list of spans in the order they were started
+        """
+        with self._lock:
+            return sorted(self._spans, key=lambda span: span.start)
+
+    def add(self, name: str, start: float, end: Optional[float] = None, **attributes) -> Span:
+        """
+        Record a span.
+
+        :param name: name of the phase
+        :param start: start of the phase (seconds since the epoch)
+        :param end: end of the phase
+        :param attributes: additional information of the span
+        :return: the recorded span
+        """
+        span = Span(name, start, end, **attributes)
+        with self._lock:
+            self._spans.append(span)
+        return span
+
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator[Span]:
+        """
+        Record a span covering the execution of the with block.
+
+        :param name: name of the phase
+        :param attributes: additional information of the span
+        :return: context manager yielding the span (attributes can be added to it)
+        """
+        span = self.add(name, time.time(), **attributes)
+        try:
+            yield span
+        except BaseException as err:
+            span.attributes["error"] = type(err).__name__
+            raise
+        finally:
+            span.end = time.time()
+
+    def observe_status(
+        self, status: str, job_id: Optional[str] = None, at: Optional[float] = None
+    ) -> None:
+        """
+        Record a job status seen by the poller. A change of the status ends the span of the
+        previous status and starts the span of the new one (queued or running).
+
+        :param status: API status of the job (QUEUED, RUNNING, FINISHED, ERROR, CANCELLED)
+        :param job_id: id of the job (the timeline can be shared by several jobs)
+        :param at: time of the observation (now if None)
+        :return: None
+        """
+        at = time.time() if at is None else at
+        name = _STATUS_PHASES.get(status.upper().strip())
+
+        with self._lock:
+            current = self._status_spans.get(job_id)
+            if current is not None:
+                current.end = max(at, current.start)
+                if current.name == name:
+                    return
+                del self._status_spans[job_id]
+
+            if name is not None:
+                attributes = {} if job_id is None else {"job_id": job_id}
+                span = Span(name, at, at, **attributes)
+                self._spans.append(span)
+                self._status_spans[job_id] = span
+
+    def durations(self) -> Dict[str, float]:
+        """
+        Wall-clock time of each phase. Overlapping spans of the same phase (e.g. of the jobs
+        of a split or a sweep that run concurrently) are counted once.
+
+        :return: dictionary phase -> seconds
+        """
+        intervals: Dict[str, list] = {}
+        for span in self.spans:
+            if span.end is not None:
+                intervals.setdefault(span.name, []).append((span.start, span.end))
+
+        durations = {}
+        for name, items in intervals.items():
+            total = 0.0
+            current_start, current_end = items[0]
+            for start, end in items[1:]:
+                if start > current_end:
+                    total += current_end - current_start
+                    current_start, current_end = start, end
+                else:
+                    current_end = max(current_end, end)
+            durations[name] = total + current_end - current_start
+        return durations
+
+    def to_list(self) -> List[dict]:
+        """
+        Convert the timeline into a list of dictionaries.
+
+        :return: list of spans as dictionaries
+        """
+        return [span.to_dict() for span in self.spans]
+
+    def __len__(self):
+        return len(self._spans)
+
+    def __repr__(self):
+        durations = ", ".join(f"{name}={value:.3f}s" for name, value in self.durations().items())
+        return f"Timeline({durations})"
@@ -2,6 +2,7 @@
 
 # pylint: disable = no-name-in-module
 # pylint: disable = import-error
+import time
 from typing import Optional, List, Union, Sequence, Dict
 import numpy as np
 
@@ -16,6 +17,7 @@ from pytket.passes import (
     SynthesiseTket,
     auto_rebase_pass,
 )
+from pytket.unit_id import Qubit
 from pytket.predicates import (
     Predicate,
     MaxNQubitsPredicate,
@@ -29,11 +31,30 @@ from pytket.qasm import circuit_to_qasm_str
 from pytket.utils.results import KwargTypes
 from pytket.architecture import FullyConnected
 from pytket.backends import Backend, CircuitStatus, StatusEnum, CircuitNotRunError
-from pytket.backends.backendresult import BackendResult
+from pytket.backends.backendresult import BackendResult, BasisOrder
 from pytket.backends.backendinfo import BackendInfo
 from pytket.backends.resulthandle import _ResultIdTuple, ResultHandle
 
 from c12_callisto_clients.api.client import Request, ApiError
+from c12_callisto_clients.api.results import (
+    combine_statuses,
+    decode_array,
+    decode_matrix,
+    complex_dtype,
+)
+from c12_callisto_clients.api.estimator import JobEstimate
+from c12_callisto_clients.api.execution import (
+    DecodedResult,
+    Executor,
+    ResultDecoder,
+    merge_results,
+)
+from c12_callisto_clients.api.dispatch import DispatchQueue
+from c12_callisto_clients.api.journal import SubmissionJournal, get_journal
+from c12_callisto_clients.api.profiling import profiled, resolve_profile_dir
+from c12_callisto_clients.api.sparse import SparseState
+from c12_callisto_clients.api.tracing import Timeline
+from c12_callisto_clients.api.exceptions import JobTooLargeError
 
 
 # Mapping between our way of describing the basis gates and pytket's way
@@ -45,6 +66,9 @@ gate_mapping = {
     "iswap": OpType.SWAP,
 }
 
+# Outputs of the jobs started by the backend
+_RESULT_TYPE = "counts,statevector,density_matrix"
+
 
 class CallistoRunningException(Exception):
     """Callisto Exception"""
@@ -52,6 +76,47 @@ class CallistoRunningException(Exception):
     pass
 
 
+class SparseBackendResult(BackendResult):
+    """BackendResult whose statevector is kept as SparseState until get_state() is called."""
+
+    def __init__(self, *, sparse_state: SparseState, **kwargs):
+        """
+        :param sparse_state: final statevector in the sparse form
+        :param kwargs: arguments of BackendResult (without the state)
+        """
+        super().__init__(**kwargs)
+        self._sparse_state = sparse_state
+        if not self.q_bits:
+            self.q_bits = {Qubit(i): i for i in range(sparse_state.num_qubits)}
+
+    @property
+    def sparse_state(self) -> SparseState:
+        """
+        Getter for the final statevector in the sparse form.
+
+        :return: SparseState
+        """
+        return self._sparse_state
+
+    @property
+    def contains_state_results(self) -> bool:
+        return True
+
+    def get_state(
+        self, qbits: Optional[Sequence[Qubit]] = None, basis: BasisOrder = BasisOrder.ilo
+    ) -> np.ndarray:
+        """
+        Return the statevector, the dense array is created on the first call.
+
+        :param qbits: permutation of Qubits, defaults to None
+        :param basis: basis order if qbits is None
+        :return: Statevector, (complex 1-D numpy array)
+        """
+        if self._state is None:
+            self._state = self._sparse_state.to_dense()
+        return super().get_state(qbits, basis)
+
+
 class CallistoBackend(Backend):
     """A pytket Backing wrapper class for the C12 emulator"""
 
@@ -82,12 +147,85 @@ class CallistoBackend(Backend):
 
         return backends
 
-    def __init__(self, backend_name: str, token: str, verbose: bool = False):
+    def __init__(
+        self,
+        backend_name: str,
+        token: str,
+        verbose: bool = False,
+        precision: str = "double",
+        sparse: bool = False,
+        stream: bool = False,
+        timeouts: Optional[dict] = None,
+        profile_dir: Optional[str] = None,
+        journal: Union[str, SubmissionJournal, None] = None,
+        dispatch: Optional[DispatchQueue] = None,
+        tenant: Optional[str] = None,
+        priority: Union[str, int, None] = None,
+    ):
+        """
+        :param backend_name: name of the backend
+        :param token: token used to access the C12 API
+        :param verbose: if detailed printing is active
+        :param precision: precision of the decoded amplitudes, "double" (complex128) or
+                          "single" (complex64)
+        :param sparse: if the statevector is kept as SparseState (see get_sparse_state), the
+                       dense state is created only when get_state() of the result is called
+        :param stream: if the job results are streamed and their amplitudes are decoded while
+                       the response is read
+        :param timeouts: timeouts of the categories of the API calls (metadata, submit, status,
+                         result), seconds or tuples (connect, read), the missing ones are taken
+                         from the C12_*_TIMEOUT variables
+        :param profile_dir: directory the cProfile statistics of the process_circuits and
+                            get_result calls are written to, C12_PROFILE_DIR if None (the
+                            profiling is off if not set)
+        :param journal: journal the job submissions are recorded to and reattached from
+                        (instance or path of the file), C12_JOURNAL if None (no journal if
+                        not set)
+        :param dispatch: queue the job submissions wait in for a free job slot (it can be
+                         shared by several backends)
+        :param tenant: tenant the jobs are dispatched for (can be overridden by the tenant
+                       argument of process_circuits)
+        :param priority: priority class of the jobs, interactive, normal or batch (can be
+                         overridden by the priority argument of process_circuits)
+        """
         super().__init__()
 
         self._backend_name = backend_name
         self._access_token = token
-        self._request = Request(self._access_token, verbose)
+        self._request = Request(
+            self._access_token, verbose, timeouts=timeouts, journal=journal, dispatch=dispatch
+        )
+        self._dtype = complex_dtype(precision)
+        self._sparse = sparse
+        self._stream = stream
+        self._profile_dir = profile_dir
+        self._tenant = tenant
+        self._priority = priority
+
+    @property
+    def profile_dir(self) -> Optional[str]:
+        """
+        Getter for the directory the profiles of the process_circuits and get_result calls
+        are written to.
+
+        :return: directory or None if the profiling is off
+        """
+        return resolve_profile_dir(self._profile_dir)
+
+    @property
+    def _executor(self) -> Executor:
+        return self._executor_for({})
+
+    def _executor_for(self, kwargs: dict) -> Executor:
+        return Executor(
+            self._request,
+            self._backend_name,
+            tenant=kwargs.get("tenant", self._tenant),
+            priority=kwargs.get("priority", self._priority),
+        )
+
+    def _result_decoder(self) -> ResultDecoder:
+        return ResultDecoder.for_dtype(self._dtype, sparse=self._sparse, stream=self._stream)
 
     @property
     def backend_info(self) -> Optional[BackendInfo]:
@@ -250,7 +388,11 @@ class CallistoBackend(Backend):
         if self._request is None:
             raise RuntimeError(f"Unable to retrieve circuit status for handle {handle}")
 
-        status = self._request.get_job_status(job_uuid)
+        job_ids = self._cache.get(handle, {}).get("job_ids", None)
+        if job_ids is None:
+            status = self._request.get_job_status(job_uuid)
+        else:
+            status = combine_statuses([self._request.get_job_status(job_id) for job_id in job_ids])
 
         if status is None:
             raise CircuitNotRunError(handle)
@@ -267,6 +409,33 @@ class CallistoBackend(Backend):
 
         return CircuitStatus(status)
 
+    def estimate(
+        self,
+        circuit: Circuit,
+        n_shots: Optional[int] = None,
+        outputs: str = _RESULT_TYPE,
+    ) -> JobEstimate:
+        """
+        Pre-flight estimation of the response size, client decode memory and relative
+        simulation cost of running the circuit.
+
+        :param circuit: circuit to estimate
+        :param n_shots: number of shots
+        :param outputs: comma separated outputs (by default the ones requested by process_circuit)
+        :return: JobEstimate instance
+        """
+        return JobEstimate(
+            n_qubits=circuit.n_qubits,
+            shots=1024 if n_shots is None else n_shots,
+            outputs=outputs,
+            n_barriers=circuit.n_gates_of_type(OpType.Barrier),
+            n_operations=circuit.n_gates,
+        )
+
+    @profiled(
+        "process_circuits",
+        lambda backend, args, kwargs, handles: [handle[0] for handle in handles or []],
+    )
     def process_circuits(
         self,
         circuits: Sequence[Circuit],
@@ -283,7 +452,14 @@ class CallistoBackend(Backend):
         :param circuits: circuits to be run on the backend
         :param n_shots: number of shots for each circuit (it can be different)
         :param valid_check: if we are verifying the predicates
-        :param kwargs: additional arguments
+        :param kwargs: additional arguments (ininoise, physical_params, max_shots_per_job,
+                       preflight, max_response_bytes, max_decode_bytes, tenant, priority).
+                       With max_shots_per_job the shots of each circuit are split into
+                       several jobs that run concurrently and the counts are merged.
+                       With preflight set to "warn" or "error" the circuits whose estimated
+                       size exceeds the limits emit a warning or are refused.
+                       The tenant and priority set the tenant and the priority class
+                       (interactive, normal or batch) of the jobs in the dispatch queue.
         :return: ResultHandle list
         """
         circuits = list(circuits)
@@ -300,7 +476,9 @@ class CallistoBackend(Backend):
         count = 0
         for circuit in circuits:
             try:
-                handles.append(self.process_circuit(circuit, n_shots_list[count]))
+                handles.append(
+                    self.process_circuit(circuit, n_shots_list[count], valid_check=False, **kwargs)
+                )
             except CallistoRunningException as error:
                 print(f"The circuit {circuit} wasn't run successfully. {error}")
             count = count + 1
@@ -321,71 +499,115 @@ class CallistoBackend(Backend):
             self._check_all_circuits([circuit])
 
         n_shots = 1024 if n_shots is None else n_shots
-        result_type = "counts,statevector,density_matrix"
+        result_type = _RESULT_TYPE
         ini_noise = kwargs.get("ininoise", False)
         physical_params = kwargs.get("physical_params", None)
+        max_shots_per_job = kwargs.get("max_shots_per_job", None)
+        preflight = kwargs.get("preflight", None)
+        timeline = Timeline()
+
+        with timeline.span("prepare"):
+            if preflight is not None:
+                try:
+                    self.estimate(circuit, n_shots, result_type).check(
+                        preflight,
+                        max_response_bytes=kwargs.get("max_response_bytes", None),
+                        max_decode_bytes=kwargs.get("max_decode_bytes", None),
+                    )
+                except JobTooLargeError as err:
+                    raise CallistoRunningException(
+                        f"Job refused by the pre-flight check: {err}"
+                    ) from err
+
+            qasm_str = circuit_to_qasm_str(circuit)
 
         try:
-            job_uuid, _ = self._request.start_job(
-                qasm_str=circuit_to_qasm_str(circuit),
-                shots=n_shots,
-                result=result_type,
-                backend_name=self._backend_name,
+            submission = self._executor_for(kwargs).submit(
+                qasm_str,
+                n_shots,
+                result_type,
                 ini_noise=ini_noise,
                 physical_params=physical_params,
+                max_shots_per_job=max_shots_per_job,
+                timeline=timeline,
             )
-
         except ApiError as api_err:
             raise CallistoRunningException("Error starting a job") from api_err
 
-        handle = ResultHandle(job_uuid)
-        self._cache[handle] = dict()
+        # The handle of the first job represents the whole group of a split circuit
+        handle = ResultHandle(submission.job_id)
+        self._cache[handle] = {"timings": timeline}
+        if submission.is_split:
+            self._cache[handle].update(
+                {
+                    "job_ids": submission.job_ids,
+                    "shots": submission.shots,
+                    "outputs": submission.outputs,
+                }
+            )
 
         return handle
 
     @staticmethod
-    def _convert_json_to_np_matrix(data) -> np.ndarray:
+    def _convert_json_to_np_matrix(data, dtype: type = np.complex128) -> np.ndarray:
         """Function to convert json string data to numpy matrix"""
-        matrix = []
-        density_matrix = np.array(data)
-        for i in range(len(density_matrix)):
-            matrix.append(CallistoBackend._convert_json_to_np_array(density_matrix[i]))
-        return np.array(density_matrix)
+        return decode_matrix(data, dtype=dtype)
 
     @staticmethod
-    def _convert_json_to_np_array(data) -> np.ndarray:
+    def _convert_json_to_np_array(data, dtype: type = np.complex128) -> np.ndarray:
         """Function to convert json string data to numpy array"""
-        array = np.asarray(data)
-        array = np.array(list(map(lambda item: complex(item), array)))
-        return array
+        return decode_array(data, dtype=dtype)
+
+    def _decode_result(self, data: dict) -> DecodedResult:
+        """
+        Decode the results of a job into numpy arrays (the statevector into SparseState in the
+        sparse mode).
+
+        :param data: job data with the results
+        :return: DecodedResult instance
+        :raises CallistoRunningException: if the results are in a wrong format
+        """
+        try:
+            return self._result_decoder().decode_results(data["results"], density_matrix=True)
+        except ApiError as err:
+            raise CallistoRunningException("Result is in a wrong format") from err
+
+    @staticmethod
+    def _to_backend_result(decoded: DecodedResult) -> BackendResult:
+        """
+        Method to convert the decoded C12 results to the Tket BackendResult class.
+
+        :param decoded: decoded results
+        :return: BackendResult
+        """
+        counts = decoded.counts
+        # NOTE: the reverse is important as the order of the bits for the Qiskit (C12's emulator is based on
+        # the Qiskit library).
+        # State vector order is -> 00, 01, 10, 11 ->big-endian fashion BE, while Qiskit uses little-endian
+        # way -> 11, 10, 01, 00
+        readouts = np.array([[np.uint8(val) for val in reversed(key)] for key in counts])
+        repeats = np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
+
+        outcome_array = OutcomeArray.from_readouts(np.repeat(readouts, repeats, axis=0))
+        if decoded.is_sparse:
+            # The dense statevector is created only if get_state() is called
+            return SparseBackendResult(
+                sparse_state=decoded.statevector,
+                shots=outcome_array,
+                density_matrix=decoded.density_matrix,
+            )
+        return BackendResult(
+            state=decoded.statevector, shots=outcome_array, density_matrix=decoded.density_matrix
+        )
 
     def _convert_result(self, data: dict) -> BackendResult:
         """
         Method to convert the C12 results to the Tket BackendResult class.
 
-        :param data:
-        :return:
+        :param data: job data with the results
+        :return: BackendResult
         """
-        data = data["results"]
-        if "counts" not in data or "statevector" not in data:
-            raise CallistoRunningException("Result is in a wrong format")
-
-        counts = data["counts"]
-        statevector = self._convert_json_to_np_array(data["statevector"])
-        shots = []
-        for key, value in counts.items():
-            shot = [np.uint8(val) for val in key]
-            shot.reverse()
-            # NOTE: the reverse() is important as the order of the bits for the Qiskit (C12's emulator is based on
-            # the Qiskit library).
-            # State vector order is -> 00, 01, 10, 11 ->big-endian fashion BE, while Qiskit uses little-endian
-            # way -> 11, 10, 01, 00
-            for _ in range(value):
-                shots.append(shot)
-
-        outcome_array = OutcomeArray.from_readouts(np.array(shots))
-        density_matrix = self._convert_json_to_np_matrix(data["density_matrix"])
-        return BackendResult(state=statevector, shots=outcome_array, density_matrix=density_matrix)
+        return self._to_backend_result(self._decode_result(data))
 
     def get_error_message(self, handle: ResultHandle) -> Optional[str]:
         """
@@ -398,6 +620,7 @@ class CallistoBackend(Backend):
         data = self._request.get_job_result(job_id)
         return data["errors"] if "errors" in data else None
 
+    @profiled("get_result", lambda backend, args, kwargs, result: [args[0][0]])
     def get_result(self, handle: ResultHandle, **kwargs: KwargTypes) -> BackendResult:
         """
         Get the results of the job with a given handle.
@@ -407,37 +630,108 @@ class CallistoBackend(Backend):
         except CircuitNotRunError:  # if the job hasn't been started, run it
             timeout = kwargs.get("timeout", 60)
             wait = kwargs.get("wait", 5)
-            job_id = handle[0]
+            job_ids = self._cache.get(handle, {}).get("job_ids", [handle[0]])
+            chunk_shots = self._cache.get(handle, {}).get("shots", [None])
+            outputs = self._cache.get(handle, {}).get("outputs", [_RESULT_TYPE])
+            timeline = self.get_timings(handle)
+
+            # The timeout applies to the whole split job, each chunk gets the remaining time
+            deadline = None if timeout is None else time.monotonic() + timeout
+            chunks = []
+            for job_id, job_outputs in zip(job_ids, outputs):
+                remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+                # Only the first chunk returns the states, the others just the counts
+                data = self._retrieve_job(
+                    job_id, job_outputs, timeout=remaining, wait=wait, timeline=timeline
+                )
 
-            data = self._retrieve_job(job_id, timeout=timeout, wait=wait)
+                status = self.get_circuit_status(data["status"])
 
-            status = self.get_circuit_status(data["status"])
+                if status == StatusEnum.ERROR:
+                    raise CallistoRunningException(
+                        f"Error during the circuit execution {data['errors']}"
+                    )
+                chunks.append(data)
 
-            if status == StatusEnum.ERROR:
-                raise CallistoRunningException(
-                    f"Error during the circuit execution {data['errors']}"
+            data = chunks[0]
+            if len(chunks) > 1:
+                # Counts of the split job are merged, the states are taken from the first chunk
+                merged, chunk_counts = merge_results(
+                    [chunk["results"] for chunk in chunks], job_ids, chunk_shots
                 )
+                data = {**data, "results": merged}
+                self._update_cache_result(handle, {"chunks": chunk_counts})
 
-            backend_result = self._convert_result(data)
+            with timeline.span("decode", job_id=handle[0]):
+                decoded = self._decode_result(data)
+                backend_result = self._to_backend_result(decoded)
             self._update_cache_result(handle, {"result": backend_result})
             return backend_result
 
+    def get_sparse_state(self, handle: ResultHandle, **kwargs: KwargTypes) -> SparseState:
+        """
+        Get the final statevector of the job in the sparse form.
+
+        :param handle: job handle
+        :param kwargs: arguments of get_result (timeout, wait)
+        :return: SparseState
+        """
+        backend_result = self.get_result(handle, **kwargs)
+        if isinstance(backend_result, SparseBackendResult):
+            return backend_result.sparse_state
+        return SparseState.from_dense(backend_result.get_state())
+
+    def get_timings(self, handle: ResultHandle) -> Timeline:
+        """
+        Get the timeline of the lifecycle of the job with a given handle (prepare, submit,
+        queued, running and decode phases). The results are downloaded by the last status
+        query, so the download is part of the running phase.
+
+        :param handle: job handle
+        :return: Timeline instance (empty if the job was not started by this backend)
+        """
+        if handle not in self._cache:
+            self._cache[handle] = dict()
+        return self._cache[handle].setdefault("timings", Timeline())
+
+    def resume_handles(
+        self, journal: Union[str, SubmissionJournal, None] = None
+    ) -> List[ResultHandle]:
+        """
+        Reattach to the jobs recorded in a submission journal (e.g. by a process that
+        crashed), without submitting them again. The results of the handles are retrieved
+        with get_result. The jobs of a circuit whose shots were split get a handle each.
+
+        :param journal: journal (instance or path of the file), the journal of the backend if
+                        None
+        :return: handles of the started jobs of the backend in the order they were submitted
+        :raises CallistoRunningException: if there is no journal
+        """
+        journal = self._request.journal if journal is None else get_journal(journal)
+        if journal is None:
+            raise CallistoRunningException("There is no submission journal to resume from")
+        return [ResultHandle(job_id) for job_id in journal.job_ids(self._backend_name)]
+
     def _retrieve_job(
         self,
         jobid: str,
-        result_type: str = "counts,statevector,density_matrix",
+        result_type: str = _RESULT_TYPE,
         timeout: Optional[int] = None,
         wait: Optional[int] = None,
+        timeline: Optional[Timeline] = None,
     ) -> Dict:
         """Get the results from the server"""
         if self._request is None or self._backend_name is None:
             raise RuntimeError("Backend client is not set")
 
-        data = self._request.get_job_result(jobid, result_type, timeout, wait)
-        if data is None:
-            raise RuntimeError(f"Unable to retrieve job {jobid}")
-
-        return data
+        return self._executor.wait(
+            jobid,
+            timeout=timeout,
+            wait=wait,
+            output_data=result_type,
+            decoder=self._result_decoder().streaming_decoder(),
+            timeline=timeline,
+        )
 
     def rebase_pass(self) -> BasePass:
         """A single compilation pass that when run converts all gates in a Circuit to an OpType supported by the
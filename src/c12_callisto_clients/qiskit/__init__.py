@@ -1,3 +1,5 @@
 from . import c12sim_provider
 from . import c12sim_job
 from . import c12sim_backend
+from . import c12sim_sweep
+from . import c12sim_local
@@ -1,4 +1,5 @@
-from typing import Iterable, List, Optional, Dict, Tuple, Union, NewType
+from typing import Iterable, List, Optional, Dict, Tuple, Union, NewType, Sequence
+import numpy as np
 from numpy import pi
 from qiskit import qasm2
 from qiskit.circuit.equivalence_library import SessionEquivalenceLibrary
@@ -10,11 +11,17 @@ from qiskit.circuit.library import RXGate, RYGate, RZGate, iSwapGate, CRXGate, C
 
 
 from c12_callisto_clients.api.client import Request
-from c12_callisto_clients.api.exceptions import ApiError
+from c12_callisto_clients.api.exceptions import ApiError, JobTooLargeError
+from c12_callisto_clients.api.estimator import JobEstimate
 from c12_callisto_clients.qiskit.exceptions import C12SimJobError
 
-from c12_callisto_clients.qiskit.c12sim_job import C12SimJob
-
+from c12_callisto_clients.api.execution import Executor, Submission
+from c12_callisto_clients.api.journal import SubmissionJournal, get_journal
+from c12_callisto_clients.api.profiling import profiled, resolve_profile_dir
+from c12_callisto_clients.api.tracing import Timeline
+from c12_callisto_clients.qiskit.c12sim_job import C12SimJob, C12SimSplitJob
+from c12_callisto_clients.qiskit.c12sim_sweep import QasmTemplate, C12SimSweepJob
+from c12_callisto_clients.qiskit.c12sim_local import C12SimLocalJob, can_run_locally
 
 gate_name_to_instruction_mapper = {
     "rx": RXGate(Parameter("theta")),
@@ -31,6 +38,13 @@ InstOpsType = NewType(
 )
 
 
+def _job_ids(jobs) -> List[str]:
+    """Ids of the jobs returned by run()."""
+    if jobs is None:
+        return []
+    return [job.job_id() for job in (jobs if isinstance(jobs, list) else [jobs])]
+
+
 class C12SimBackend(BackendV2):
     """
     C12 simulator backend wrapper for Qiskit's BackendV2 class.
@@ -47,6 +61,11 @@ class C12SimBackend(BackendV2):
         request: Request,
         provider: Provider = None,
         properties: dict = None,
+        precision: str = "double",
+        timeouts: Optional[dict] = None,
+        profile_dir: Optional[str] = None,
+        tenant: Optional[str] = None,
+        priority: Union[str, int, None] = None,
         **fields,
     ):
         """
@@ -57,6 +76,19 @@ class C12SimBackend(BackendV2):
         :param name:name of a backend
         :param request: Request API object for making the api requests to the C12 sim backend
         :param properties: Dictionary of the backend properties
+        :param precision: default precision of the decoded amplitudes, "double" (complex128)
+                          or "single" (complex64)
+        :param timeouts: timeouts of the categories of the API calls (metadata, submit, status,
+                         result) overriding the ones of the request, seconds or tuples
+                         (connect, read)
+        :param profile_dir: directory the cProfile statistics of the run and result calls are
+                            written to, C12_PROFILE_DIR if None (the profiling is off if not
+                            set)
+        :param tenant: tenant the jobs are dispatched for when the request has a dispatch
+                       queue (can be overridden by the tenant option of run)
+        :param priority: priority class of the jobs (interactive, normal or batch) when the
+                         request has a dispatch queue (can be overridden by the priority
+                         option of run)
         :param fields: additional fields to set the backend as number of shots
         """
         super().__init__(
@@ -66,14 +98,50 @@ class C12SimBackend(BackendV2):
         )
 
         self._backend_name = name
-        self._request = request
+        self._request = request if not timeouts else request.with_timeouts(timeouts)
         self._properties = properties
         self._max_circuits = self._properties["max-circuits"]
+        self._precision = precision
+        self._profile_dir = profile_dir
+        self._tenant = tenant
+        self._priority = priority
 
     @property
     def request(self):
         return self._request
 
+    @property
+    def profile_dir(self) -> Optional[str]:
+        """
+        Getter for the directory the profiles of the run and result calls are written to.
+
+        :return: directory or None if the profiling is off
+        """
+        return resolve_profile_dir(self._profile_dir)
+
+    @property
+    def executor(self) -> Executor:
+        """
+        Getter for the execution core the jobs of the backend are started with.
+
+        :return: Executor instance
+        """
+        return self._executor_for({})
+
+    def _executor_for(self, options: dict) -> Executor:
+        """
+        Get the execution core of the jobs of a run.
+
+        :param options: run options (tenant and priority override the ones of the backend)
+        :return: Executor instance
+        """
+        return Executor(
+            self._request,
+            self._backend_name,
+            tenant=options["tenant"] if "tenant" in options else self._tenant,
+            priority=options["priority"] if "priority" in options else self._priority,
+        )
+
     @property
     def target(self):
         """
@@ -144,6 +212,7 @@ class C12SimBackend(BackendV2):
                 shots=item["options"]["shots"],
                 result=item["options"]["result"],
                 qasm_orig=item["task_orig"],
+                precision=self._precision,
             )
             for item in jobs
         ]
@@ -172,8 +241,37 @@ class C12SimBackend(BackendV2):
             shots=job["options"]["shots"],
             result=job["options"]["result"],
             qasm_orig=job["task_orig"],
+            precision=self._precision,
         )
 
+    def resume_jobs(self, journal: Union[str, SubmissionJournal, None] = None) -> List[C12SimJob]:
+        """
+        Reattach to the jobs recorded in a submission journal (e.g. by a process that
+        crashed), without submitting them again. The jobs of a circuit whose shots were split
+        are reattached one by one.
+
+        :param journal: journal (instance or path of the file), the journal of the request
+                        if None
+        :return: list of C12SimJob of the started jobs of the backend in the order they were
+                 submitted
+        :raises C12SimJobError: if there is no journal
+        """
+        journal = self._request.journal if journal is None else get_journal(journal)
+        if journal is None:
+            raise C12SimJobError("There is no submission journal to resume from")
+
+        return [
+            C12SimJob(
+                backend=self,
+                job_id=entry.job_uuid,
+                qasm=entry.transpiled,
+                shots=entry.info.get("shots"),
+                result=entry.info.get("result"),
+                precision=self._precision,
+            )
+            for entry in journal.entries(self._backend_name, started=True)
+        ]
+
     @property
     def max_circuits(self):
         return self._max_circuits
@@ -227,13 +325,194 @@ class C12SimBackend(BackendV2):
 
         return qasm2.dumps(tmp_qc)
 
+    def _validate_qasm(self, qasm: str) -> None:
+        """
+        Check that the QASM string produced from the circuit can be parsed back.
+
+        :param qasm: QASM string
+        :raises C12SimJobError: if the QASM string is not valid
+        """
+        try:
+            QuantumCircuit.from_qasm_str(qasm)
+        except Exception:
+            raise C12SimJobError(
+                "There has been a problem while converting the circuit for OpenQASM fmt"
+                " if possible try transpiling the circuit to more basic gate set. See documentation for more"
+                " information"
+            )
+
+    def prepare_sweep(
+        self, circuit: QuantumCircuit, parameters: Optional[Sequence[Parameter]] = None
+    ) -> Optional[QasmTemplate]:
+        """
+        Serialize a parameterized circuit into a QASM template that can be reused for
+        several sweeps.
+
+        :param circuit: parameterized circuit
+        :param parameters: order of the parameters (circuit.parameters if None)
+        :return: QasmTemplate or None if the circuit cannot be represented as a template
+        """
+        return QasmTemplate.from_circuit(circuit, self._prepare_qasm_file, parameters)
+
+    def run_sweep(
+        self,
+        circuit: Union[QuantumCircuit, QasmTemplate],
+        parameter_values,
+        parameters: Optional[Sequence[Parameter]] = None,
+        **options,
+    ) -> C12SimSweepJob:
+        """
+        Run a parameterized circuit for each row of the parameter values. The circuit is
+        serialized only once and the jobs for the sweep points are started in parallel.
+
+        :param circuit: parameterized QuantumCircuit or a template obtained from prepare_sweep()
+        :param parameter_values: 2-D array of values (points x parameters)
+        :param parameters: order of the parameters (columns of the parameter_values)
+        :param options: shots, ininoise, physical_params, max_workers (parallel submissions),
+                        tenant, priority and the result options storage_dir, precision,
+                        sparse and stream (see run())
+        :return: C12SimSweepJob instance
+        :raises C12SimJobError: if there is an error starting the jobs
+        :raises ValueError: if arguments are not proper type
+        """
+        parameter_values = np.atleast_2d(np.asarray(parameter_values, dtype=float))
+        if parameter_values.ndim != 2:
+            raise ValueError(f"Parameter values have to be 2-D array ({parameter_values.shape})")
+
+        shots = options["shots"] if "shots" in options else 1024
+        result_type = "counts,statevector"
+        ini_noise = options["ininoise"] if "ininoise" in options else False
+        physical_params = options["physical_params"] if "physical_params" in options else None
+        max_workers = options["max_workers"] if "max_workers" in options else None
+        result_options = self._result_options(options)
+
+        if isinstance(circuit, QasmTemplate):
+            template = circuit
+        elif isinstance(circuit, QuantumCircuit):
+            template = self.prepare_sweep(circuit, parameters)
+        else:
+            raise ValueError(f"Input type {type(circuit)}")
+
+        if template is not None:
+            sweep_parameters = template.parameters
+        else:
+            sweep_parameters = list(circuit.parameters if parameters is None else parameters)
+
+        if parameter_values.shape[1] != len(sweep_parameters):
+            raise ValueError(
+                f"Expected {len(sweep_parameters)} parameter values per point,"
+                f" but {parameter_values.shape[1]} given"
+            )
+
+        timeline = Timeline()
+        with timeline.span("prepare", points=len(parameter_values)):
+            if template is not None:
+                qasms = [template.bind(values) for values in parameter_values]
+                if len(qasms) > 0:
+                    self._validate_qasm(qasms[0])
+            else:
+                # The circuit cannot be represented as a template, so each point is bound
+                # separately
+                qasms = []
+                for values in parameter_values:
+                    qasm = self._prepare_qasm_file(
+                        circuit.assign_parameters(dict(zip(sweep_parameters, values)))
+                    )
+                    self._validate_qasm(qasm)
+                    qasms.append(qasm)
+
+        try:
+            submissions = self._executor_for(options).submit_batch(
+                qasms,
+                shots,
+                result_type,
+                ini_noise=ini_noise,
+                physical_params=physical_params,
+                max_workers=max_workers,
+                timeline=timeline,
+            )
+        except ApiError as err:
+            raise C12SimJobError("Error starting a sweep") from err
+
+        jobs = [
+            C12SimJob(
+                backend=self,
+                job_id=submission.job_id,
+                qasm=submission.transpiled[0],
+                qasm_orig=submission.qasm,
+                shots=shots,
+                result=result_type,
+                ini_noise=ini_noise,
+                timings=timeline,
+                **result_options,
+            )
+            for submission in submissions
+        ]
+
+        return C12SimSweepJob(jobs, sweep_parameters, parameter_values)
+
+    def estimate(self, circuit: QuantumCircuit, **options) -> JobEstimate:
+        """
+        Pre-flight estimation of the response size, client decode memory and relative
+        simulation cost of running the circuit.
+
+        :param circuit: QuantumCircuit to estimate
+        :param options: shots, outputs (comma separated, by default the outputs of run() with
+                        the mid-circuit states if the circuit has barriers) and ini
+        :return: JobEstimate instance
+        """
+        shots = options["shots"] if "shots" in options else 1024
+        n_barriers = circuit.count_ops().get("barrier", 0)
+
+        if "outputs" in options:
+            outputs = options["outputs"]
+        else:
+            outputs = "counts,statevector" + (",states" if n_barriers > 0 else "")
+
+        return JobEstimate(
+            n_qubits=circuit.num_qubits,
+            shots=shots,
+            outputs=outputs,
+            n_barriers=n_barriers,
+            n_operations=circuit.size(),
+            ini=options["ini"] if "ini" in options else None,
+        )
+
+    def _result_options(self, options: dict) -> dict:
+        """
+        Options that define how the results of the jobs are decoded and stored.
+
+        :param options: run options
+        :return: dictionary with storage_dir, precision, sparse and stream
+        """
+        return {
+            "storage_dir": options["storage_dir"] if "storage_dir" in options else None,
+            "precision": options["precision"] if "precision" in options else self._precision,
+            "sparse": options["sparse"] if "sparse" in options else False,
+            "stream": options["stream"] if "stream" in options else False,
+        }
+
+    @profiled("run", lambda backend, args, kwargs, jobs: _job_ids(jobs))
     def run(self, run_input, **options) -> Union[C12SimJob, List[C12SimJob]]:
         """
         This method returns a :class:`~qiskit.providers.Job` object that runs circuits.
 
         :param run_input: (QuantumCircuit) or list: object to run on the backend.
         :param options: Any kwarg options to pass to the backend for running the
-                        config.
+                        config. With max_shots_per_job the shots of each circuit are split
+                        into several jobs that run concurrently. With local_max_qubits the
+                        circuits with at most that many qubits are simulated locally
+                        (noiseless) and returned as C12SimLocalJob. With preflight set to
+                        "warn" or "error" the jobs whose estimated size exceeds
+                        max_response_bytes or max_decode_bytes emit a warning or are refused.
+                        With storage_dir the decoded arrays are kept in memory-mapped files.
+                        The precision option ("double" or "single") overrides the precision
+                        of the decoded amplitudes set on the backend. With sparse the
+                        statevectors are kept as SparseState (see C12SimJob). With stream the
+                        job data is parsed incrementally while it is downloaded. The tenant
+                        and priority options set the tenant and the priority class
+                        (interactive, normal or batch) of the jobs in the dispatch queue of
+                        the request.
         :return: C12SimJob instance
         :raises C12SimJobError: if there is an error starting a job
         :raises ValueError: if arguments are not proper type
@@ -247,6 +526,12 @@ class C12SimBackend(BackendV2):
 
         ini_noise = options["ininoise"] if "ininoise" in options else False
         physical_params = options["physical_params"] if "physical_params" in options else None
+        max_shots_per_job = options["max_shots_per_job"] if "max_shots_per_job" in options else None
+        local_max_qubits = options["local_max_qubits"] if "local_max_qubits" in options else None
+        seed_simulator = options["seed_simulator"] if "seed_simulator" in options else None
+        preflight = options["preflight"] if "preflight" in options else None
+        result_options = self._result_options(options)
+        executor = self._executor_for(options)
 
         if not isinstance(run_input, list):
             run_input = [run_input]
@@ -258,44 +543,115 @@ class C12SimBackend(BackendV2):
                 # Skip the elements that are not QuantumCircuit
                 continue
 
+            timeline = Timeline()
+
+            if local_max_qubits is not None and can_run_locally(circuit, local_max_qubits):
+                # Tiny circuits are simulated faster locally than with a round trip to the server
+                jobs.append(
+                    C12SimLocalJob(
+                        backend=self,
+                        circuit=circuit,
+                        shots=shots,
+                        seed=seed_simulator,
+                        result=result_type,
+                        timings=timeline,
+                        **result_options,
+                    )
+                )
+                continue
+
             # see: https://github.com/Qiskit/qiskit-terra/issues?q=is%3Aissue%20is%3Aopen%20Qasm%20%22Cannot%20find%20gate%20definition%22
             # It has been suggested that the best way is to transpile it to some basis gate set that is simpler
             # For some circuits Qiskit's qasm() function can return wrong qasm fmts.
 
-            qasm = self._prepare_qasm_file(circuit)
-            try:
-                QuantumCircuit.from_qasm_str(qasm)
-            except Exception:
-                raise C12SimJobError(
-                    "There has been a problem while converting the circuit for OpenQASM fmt"
-                    " if possible try transpiling the circuit to more basic gate set. See documentation for more"
-                    " information"
-                )
+            with timeline.span("prepare"):
+                if preflight is not None:
+                    try:
+                        self.estimate(circuit, shots=shots).check(
+                            preflight,
+                            max_response_bytes=options.get("max_response_bytes", None),
+                            max_decode_bytes=options.get("max_decode_bytes", None),
+                        )
+                    except JobTooLargeError as err:
+                        raise C12SimJobError(f"Job refused by the pre-flight check: {err}") from err
+
+                qasm = self._prepare_qasm_file(circuit)
+                self._validate_qasm(qasm)
 
             try:
-                job_uuid, transpiled_qasm = self._request.start_job(
-                    qasm_str=qasm,
-                    shots=shots,
-                    result=result_type,
-                    backend_name=self._backend_name,
+                submission = executor.submit(
+                    qasm,
+                    shots,
+                    result_type,
                     ini_noise=ini_noise,
                     physical_params=physical_params,
+                    max_shots_per_job=max_shots_per_job,
+                    timeline=timeline,
                 )
             except ApiError as err:
                 raise C12SimJobError("Error starting a job") from err
 
-            # Get the transpiled one
+            if submission.is_split:
+                jobs.append(self._split_job(submission, result_type, ini_noise, result_options))
+                continue
 
             jobs.append(
                 C12SimJob(
                     backend=self,
-                    job_id=job_uuid,
-                    qasm=transpiled_qasm,
+                    job_id=submission.job_id,
+                    qasm=submission.transpiled[0],
                     qasm_orig=qasm,
                     shots=shots,
                     result=result_type,
                     ini_noise=ini_noise,
+                    timings=timeline,
+                    **result_options,
                 )
             )
 
         return jobs if len(jobs) > 1 else jobs[0]
+
+    def _split_job(
+        self,
+        submission: Submission,
+        result_type: str,
+        ini_noise: bool,
+        result_options: dict,
+    ) -> C12SimSplitJob:
+        """
+        Create the job of a circuit whose shots were split into several concurrent jobs.
+
+        :param submission: jobs started for the circuit
+        :param result_type: outputs of the jobs
+        :param ini_noise: if the noise is applied to the initialisation of the circuit
+        :param result_options: options of the decoding of the results
+        :return: C12SimSplitJob instance
+        """
+        jobs = [
+            C12SimJob(
+                backend=self,
+                job_id=job_uuid,
+                qasm=transpiled_qasm,
+                qasm_orig=submission.qasm,
+                shots=chunk_shots,
+                result=chunk_outputs,
+                ini_noise=ini_noise,
+                timings=submission.timeline,
+                **result_options,
+            )
+            for job_uuid, transpiled_qasm, chunk_shots, chunk_outputs in zip(
+                submission.job_ids, submission.transpiled, submission.shots, submission.outputs
+            )
+        ]
+
+        return C12SimSplitJob(
+            backend=self,
+            jobs=jobs,
+            qasm=submission.transpiled[0],
+            qasm_orig=submission.qasm,
+            shots=sum(submission.shots),
+            result=result_type,
+            ini_noise=ini_noise,
+            timings=submission.timeline,
+            **result_options,
+        )
@@ -1,3 +1,5 @@
+import os
+import time
 from typing import Optional, Tuple, List
 from datetime import datetime
 import numpy as np
@@ -11,6 +13,17 @@ from c12_callisto_clients.qiskit.exceptions import C12SimApiError, C12SimJobErro
 
 
 from c12_callisto_clients.api.exceptions import ApiError
+from c12_callisto_clients.api.execution import Executor, ResultDecoder, merge_results
+from c12_callisto_clients.api.results import (
+    combine_statuses,
+    decode_array,
+    decode_matrix,
+    complex_dtype,
+)
+from c12_callisto_clients.api.profiling import profiled
+from c12_callisto_clients.api.storage import ArrayStore
+from c12_callisto_clients.api.sparse import SparseState
+from c12_callisto_clients.api.tracing import Timeline
 
 
 def get_qiskit_status(status: str) -> JobStatus:
@@ -53,7 +66,32 @@ def get_qiskit_status(status: str) -> JobStatus:
 class C12SimJob(JobV1):
     """Class representing the C12Sim Job"""
 
-    def __init__(self, backend: BackendV2, job_id: str, **metadata):
+    def __init__(
+        self,
+        backend: BackendV2,
+        job_id: str,
+        storage_dir: Optional[str] = None,
+        precision: str = "double",
+        sparse: bool = False,
+        stream: bool = False,
+        timings: Optional[Timeline] = None,
+        **metadata,
+    ):
+        """
+        :param backend: backend the job is run on
+        :param job_id: uuid of the job
+        :param storage_dir: if given, the decoded statevectors and density matrices are stored
+                            in memory-mapped .npy files in a job-scoped subdirectory
+        :param precision: precision of the decoded amplitudes, "double" (complex128) or
+                          "single" (complex64)
+        :param sparse: if the statevectors are kept as SparseState (indices and values of the
+                       nonzero amplitudes) until the dense access is requested
+        :param stream: if the job data is streamed from the server and its amplitudes are
+                       decoded while the response is read (lower peak memory for large results)
+        :param timings: timeline the lifecycle phases of the job are recorded to (a new one is
+                        created if None)
+        :param metadata: additional data of the job
+        """
         super().__init__(backend=backend, job_id=job_id, metadata=metadata)
         self._job_id = job_id  # uuid of the job
         self._backend = backend  # backend instance
@@ -64,6 +102,12 @@ class C12SimJob(JobV1):
         self._result_data = None  # row job result data
         self._error = None
         self._job_error_msg = None
+        self._storage_dir = storage_dir  # directory for the memory-mapped results
+        self._storage = None
+        self._dtype = complex_dtype(precision)  # type of the decoded amplitudes
+        self._sparse = sparse  # if the statevectors are decoded into SparseState
+        self._stream = stream  # if the job data is parsed incrementally
+        self._timings = timings if timings is not None else Timeline()
 
     def submit(self):
         """
@@ -82,21 +126,59 @@ class C12SimJob(JobV1):
         """
         return self.metadata["metadata"]["shots"] if "shots" in self.metadata["metadata"] else 0
 
+    @property
+    def timings(self) -> Timeline:
+        """
+        Getter for the timeline of the job lifecycle (prepare, submit, queued, running,
+        download and decode phases).
+
+        :return: Timeline instance
+        """
+        return self._timings
+
+    @property
+    def profile_dir(self) -> Optional[str]:
+        """
+        Getter for the directory the profiles of the result processing are written to.
+
+        :return: directory of the backend or None if the profiling is off
+        """
+        return getattr(self._backend, "profile_dir", None)
+
+    @property
+    def storage(self) -> Optional[ArrayStore]:
+        """
+        Getter for the store of the memory-mapped result arrays.
+
+        :return: ArrayStore or None if the results are kept in memory
+        """
+        if self._storage is None and self._storage_dir is not None:
+            self._storage = ArrayStore(os.path.join(self._storage_dir, self._job_id))
+        return self._storage
+
     @staticmethod
     def _convert_json_to_np_array(data) -> np.ndarray:
         """Function to convert json string data to numpy array"""
-        array = np.asarray(data)
-        array = np.array(list(map(lambda item: complex(item), array)))
-        return array
+        return decode_array(data)
 
     @staticmethod
     def _convert_json_to_np_matrix(data) -> np.ndarray:
         """Function to convert json string data to numpy matrix"""
-        matrix = []
-        dm = np.array(data)
-        for i in range(len(dm)):
-            matrix.append(C12SimJob._convert_json_to_np_array(dm[i]))
-        return np.array(matrix)
+        return decode_matrix(data)
+
+    @property
+    def _executor(self) -> Executor:
+        return Executor(self._backend.request, self._backend.name)
+
+    def _result_decoder(self) -> ResultDecoder:
+        """
+        Create the decoder of the job results.
+
+        :return: ResultDecoder with the precision, representation and storage of the job
+        """
+        return ResultDecoder.for_dtype(
+            self._dtype, sparse=self._sparse, stream=self._stream, storage=self.storage
+        )
 
     def refresh(self) -> None:
         """
@@ -108,7 +190,11 @@ class C12SimJob(JobV1):
 
         try:
             # Get job data
-            job = self._backend.request.get_job(self._job_id)
+            job = self._executor.fetch(
+                self._job_id,
+                decoder=self._result_decoder().streaming_decoder(),
+                timeline=self._timings,
+            )
         except ApiError as err:
             raise C12SimJobError("Error getting a job") from err
 
@@ -122,7 +208,8 @@ class C12SimJob(JobV1):
             "result": job["options"]["result"],
             "qasm_orig": job["task_orig"],
         }
-        self._result_data = job["result"]
+        # With a storage the arrays are kept in the memory-mapped files instead of the json data
+        self._result_data = self._result_decoder().spill(job["result"])
         self._error = job["errors"]
 
     def _wait_for_completion(
@@ -143,12 +230,14 @@ class C12SimJob(JobV1):
         if self._status in JOB_FINAL_STATES:
             return self._status in required_states
 
+        # Only the status is needed here, the whole job data is downloaded once by refresh()
         try:
-            result = self._backend.request.get_job_result(
+            result = self._executor.wait(
                 self._job_id,
-                output_data="counts,statevector,states,density_matrix",
                 timeout=timeout,
                 wait=wait,
+                output_data="counts",
+                timeline=self._timings,
             )
         except ApiError as err:
             raise C12SimApiError(
@@ -157,8 +246,7 @@ class C12SimJob(JobV1):
         except TimeoutError as err2:
             raise C12SimJobError("Timeout occurred while waiting for job execution") from err2
 
-        # Refresh the job params
-        self.refresh()
+        self._status = get_qiskit_status(result["status"])
 
         return self._status in required_states
 
@@ -189,39 +277,37 @@ class C12SimJob(JobV1):
 
         if self._result_data is None:
             return []
-        if "counts" not in self._result_data or "statevector" not in self._result_data:
-            raise C12SimJobError("Error getting the information from the system.")
-
-        # Getting the counts & statevector of the circuit after execution
-        counts = self._result_data["counts"]
-        statevector = self._convert_json_to_np_array(self._result_data["statevector"])
+        return [self._experiment_result(self._result_data, self.shots())]
 
-        # Additional mid-circuit data (if any)
-        additional_data = {}
-        if "states" in self._result_data:
-            states = self._result_data["states"]
-
-            if "density_matrix" in states and "statevector" in states:
-                dms = states["density_matrix"]
-                svs = states["statevector"]
-
-                for key in svs.keys():
-                    svs[key] = self._convert_json_to_np_array(svs[key])
-
-                for key in dms.keys():
-                    dms[key] = self._convert_json_to_np_matrix(dms[key])
+    def _experiment_result(self, result_data: dict, shots: int, **fields) -> ExperimentResult:
+        """
+        Decode the results of the job into an experiment result.
 
-                additional_data = {**dms, **svs}
+        :param result_data: results of the job as returned by the API
+        :param shots: number of shots of the experiment
+        :param fields: additional fields of the experiment result
+        :return: ExperimentResult instance
+        :raises C12SimJobError: if the results are in a wrong format
+        """
+        try:
+            decoded = self._result_decoder().decode_results(result_data)
+        except ApiError as err:
+            raise C12SimJobError("Error getting the information from the system.") from err
 
-        experiment = ExperimentResult(
-            shots=self.shots(),
+        # The mid-circuit statevectors (sv{n}) and density matrices (dm{n}) are additional data.
+        # In the sparse mode the statevector is a SparseState, get_statevector() of the result
+        # converts it into the dense array.
+        return ExperimentResult(
+            shots=shots,
             success=self.status() is JobStatus.DONE,
             status=self.status().name,
-            data=ExperimentResultData(counts=counts, statevector=statevector, **additional_data),
+            data=ExperimentResultData(
+                counts=decoded.counts, statevector=decoded.statevector, **decoded.states
+            ),
+            **fields,
         )
 
-        return [experiment]
-
+    @profiled("result", lambda job, args, kwargs, result: [job.job_id()])
     def result(self, timeout: Optional[float] = None, wait: float = 5):
         if not self._wait_for_completion(timeout, wait, required_states=(JobStatus.DONE,)):
             if self._status is JobStatus.CANCELLED:
@@ -238,13 +324,16 @@ class C12SimJob(JobV1):
 
         self.refresh()
 
+        with self._timings.span("decode", job_id=self._job_id):
+            results = self._parse_result_data()
+
         self._result = Result(
             backend_name=self._backend,
             backend_version=self._backend.version,
             job_id=self._job_id,
             qobj_id=0,
             success=self._status == JobStatus.DONE,
-            results=self._parse_result_data(),
+            results=results,
             status=self._status,
         )
 
@@ -266,7 +355,7 @@ class C12SimJob(JobV1):
             return self._status
 
         try:
-            status = self._backend.request.get_job_status(self._job_id)
+            status = self._executor.status(self._job_id, timeline=self._timings)
         except ApiError as err:
             raise C12SimApiError(
                 "Unexpected error happened during the accessing the remote server"
@@ -325,7 +414,35 @@ class C12SimJob(JobV1):
         if f"sv{barrier}" not in result_data:
             return None
 
-        return Statevector(result_data[f"sv{barrier}"])
+        # NOTE: Statevector always holds complex128 data, so the single precision results are
+        # converted only for the requested barrier
+        statevector = result_data[f"sv{barrier}"]
+        if isinstance(statevector, SparseState):
+            statevector = statevector.to_dense()
+        return Statevector(statevector)
+
+    def get_sparse_statevector(self, barrier: Optional[int] = None) -> Optional[SparseState]:
+        """
+        Function to get the final or the mid-circuit statevector in the sparse form.
+
+        :param barrier: ordinal number of barrier or None for the final statevector
+        :return: SparseState instance
+        """
+        if self._result is None:
+            raise RuntimeError(
+                f"There is no results stored in the job class. You should call result() "
+                f"method before calling {self.get_sparse_statevector.__name__}"
+            )
+
+        result_data = self._result.data()
+        key = "statevector" if barrier is None else f"sv{barrier}"
+        if key not in result_data:
+            return None
+
+        statevector = result_data[key]
+        if isinstance(statevector, SparseState):
+            return statevector
+        return SparseState.from_dense(statevector)
 
     def get_mid_density_matrix(self, barrier: int) -> Optional[DensityMatrix]:
         """
@@ -346,3 +463,110 @@ class C12SimJob(JobV1):
             return None
 
         return DensityMatrix(result_data[f"dm{barrier}"])
+
+
+# Mapping between Qiskit's JobStatus and the statuses of the API
+_API_STATUS = {
+    JobStatus.QUEUED: "QUEUED",
+    JobStatus.RUNNING: "RUNNING",
+    JobStatus.DONE: "FINISHED",
+    JobStatus.ERROR: "ERROR",
+    JobStatus.CANCELLED: "CANCELLED",
+}
+
+
+class C12SimSplitJob(C12SimJob):
+    """
+    Class representing a job whose shots are split into several C12Sim jobs that
+    are run concurrently. The counts of the jobs are merged into a single result.
+    """
+
+    def __init__(self, backend: BackendV2, jobs: List[C12SimJob], **metadata):
+        super().__init__(backend=backend, job_id=jobs[0].job_id(), **metadata)
+        self._dtype = jobs[0]._dtype
+        self._jobs = jobs
+
+    @property
+    def jobs(self) -> List[C12SimJob]:
+        """
+        Getter for the jobs the shots are split into.
+
+        :return: list of C12SimJob
+        """
+        return self._jobs
+
+    def _combine_status(self) -> JobStatus:
+        statuses = [_API_STATUS.get(job._status, "QUEUED") for job in self._jobs]
+        return get_qiskit_status(combine_statuses(statuses))
+
+    def refresh(self) -> None:
+        """
+        Obtain the latest information of all the chunk jobs from the server.
+
+        :return: None
+        """
+        for job in self._jobs:
+            job.refresh()
+
+        self._status = self._combine_status()
+        errors = [str(job._error) for job in self._jobs if job._error]
+        self._error = "; ".join(errors) if errors else None
+
+    def _wait_for_completion(
+        self,
+        timeout: Optional[float] = None,
+        wait: float = 5,
+        required_states: Tuple[JobStatus] = JOB_FINAL_STATES,
+    ) -> bool:
+        if self._status in JOB_FINAL_STATES:
+            return self._status in required_states
+
+        # The timeout applies to the whole split job, each chunk gets the remaining time
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for job in self._jobs:
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+            job._wait_for_completion(remaining, wait)
+            if job._status in (JobStatus.ERROR, JobStatus.CANCELLED):
+                # The result of the split job cannot be complete, the other chunks are not awaited
+                break
+
+        self._status = self._combine_status()
+
+        return self._status in required_states
+
+    def status(self) -> JobStatus:
+        """
+        Get the latest status of the job combined from the statuses of the chunk jobs.
+
+        :return: The status of the job.
+        """
+        if self._status in JOB_FINAL_STATES:
+            return self._status
+
+        for job in self._jobs:
+            job.status()
+
+        self._status = self._combine_status()
+
+        return self._status
+
+    def _parse_result_data(self) -> List[ExperimentResult]:
+        """
+        Merge the results of the chunk jobs. The counts are summed, while the statevector
+        and mid-circuit states are taken from the first chunk. Per-chunk job ids, shots and
+        counts are available in the chunks field of the experiment result.
+
+        :return: list with a single experiment result
+        """
+        if any(job._result_data is None for job in self._jobs):
+            return []
+
+        # Only the states of the first chunk are decoded
+        merged, chunks = merge_results(
+            [job._result_data for job in self._jobs],
+            [job.job_id() for job in self._jobs],
+            [job.shots() for job in self._jobs],
+        )
+        return [
+            self._experiment_result(merged, sum(chunk["shots"] for chunk in chunks), chunks=chunks)
+        ]
@@ -0,0 +1,181 @@
+import uuid
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from qiskit import QuantumCircuit
+from qiskit.providers import BackendV2
+from qiskit.providers.jobstatus import JobStatus, JOB_FINAL_STATES
+from qiskit.quantum_info import Statevector, DensityMatrix
+from qiskit.result.models import ExperimentResult, ExperimentResultData
+
+from c12_callisto_clients.api.sparse import SparseState
+from c12_callisto_clients.qiskit.c12sim_job import C12SimJob
+
+
+# Instructions that are supported by the local simulation, besides the unitary gates
+_NON_UNITARY_SUPPORTED = ("barrier", "measure", "initialize")
+
+
+def _final_measurements(circuit: QuantumCircuit) -> Optional[Dict[int, int]]:
+    """
+    Find the measurements at the end of the circuit.
+
+    :param circuit: quantum circuit
+    :return: mapping between the measured qubit and the classical bit or None if the circuit
+             contains mid-circuit measurements
+    """
+    measured: Dict[int, int] = {}
+    for instruction in circuit.data:
+        qubits = [circuit.find_bit(qubit).index for qubit in instruction.qubits]
+        if instruction.operation.name == "measure":
+            measured[qubits[0]] = circuit.find_bit(instruction.clbits[0]).index
+        elif instruction.operation.name != "barrier" and any(qubit in measured for qubit in qubits):
+            return None
+    return measured
+
+
+def can_run_locally(circuit: QuantumCircuit, max_qubits: int) -> bool:
+    """
+    Check if the circuit is small enough and simple enough to be simulated locally.
+    Only unitary gates, barriers, initialisation and final measurements are supported.
+
+    :param circuit: quantum circuit
+    :param max_qubits: maximum number of qubits of the circuit
+    :return: True if the circuit can be simulated locally
+    """
+    if circuit.num_qubits > max_qubits:
+        return False
+
+    for instruction in circuit.data:
+        operation = instruction.operation
+        if getattr(operation, "condition", None) is not None:
+            return False
+        if operation.name in _NON_UNITARY_SUPPORTED:
+            continue
+        if not hasattr(operation, "to_matrix") and operation.definition is None:
+            return False
+        if operation.name in ("reset", "delay") or operation.num_clbits > 0:
+            return False
+
+    return _final_measurements(circuit) is not None
+
+
+def simulate(
+    circuit: QuantumCircuit, shots: int, seed: Optional[int] = None
+) -> Tuple[Dict[str, int], np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Noiseless statevector simulation of the circuit. The mid-circuit states are stored
+    at each barrier the same way as in the results of the C12 emulator.
+
+    :param circuit: quantum circuit that satisfies can_run_locally()
+    :param shots: number of shots used for sampling the counts
+    :param seed: seed for the sampling
+    :return: tuple of counts, final statevector and mid-circuit states (sv{n} and dm{n})
+    """
+    measured = _final_measurements(circuit)
+    state = Statevector.from_int(0, 2**circuit.num_qubits)
+    states = {}
+    barrier = 0
+
+    for instruction in circuit.data:
+        name = instruction.operation.name
+        if name == "measure":
+            continue
+        if name == "barrier":
+            barrier += 1
+            states[f"sv{barrier}"] = state.data.copy()
+            states[f"dm{barrier}"] = DensityMatrix(state).data
+            continue
+        qargs = [circuit.find_bit(qubit).index for qubit in instruction.qubits]
+        state = state.evolve(instruction.operation, qargs=qargs)
+
+    counts = {}
+    if measured:
+        qubits = list(measured.keys())
+        probabilities = state.probabilities(qargs=qubits)
+        rng = np.random.default_rng(seed)
+        outcomes = rng.multinomial(shots, probabilities / probabilities.sum())
+
+        for index in np.flatnonzero(outcomes):
+            bits = ["0"] * circuit.num_clbits
+            for position, qubit in enumerate(qubits):
+                if (index >> position) & 1:
+                    bits[circuit.num_clbits - 1 - measured[qubit]] = "1"
+            counts["".join(bits)] = int(outcomes[index])
+
+    return counts, state.data, states
+
+
+class C12SimLocalJob(C12SimJob):
+    """
+    Class representing a job that has been simulated locally instead of being sent to the
+    C12 emulator. It has the same interface as C12SimJob and is finished on creation.
+    """
+
+    def __init__(
+        self,
+        backend: BackendV2,
+        circuit: QuantumCircuit,
+        shots: int,
+        seed: Optional[int] = None,
+        **metadata,
+    ):
+        super().__init__(
+            backend=backend, job_id=f"local-{uuid.uuid4()}", shots=shots, local=True, **metadata
+        )
+        self._circuit = circuit
+        with self._timings.span("simulate", job_id=self._job_id):
+            self._counts, self._statevector, self._states = simulate(circuit, shots, seed)
+        self._status = JobStatus.DONE
+
+    def refresh(self) -> None:
+        """
+        Local jobs are finished on creation, so there is nothing to refresh.
+
+        :return: None
+        """
+        return None
+
+    def _wait_for_completion(
+        self,
+        timeout: Optional[float] = None,
+        wait: float = 5,
+        required_states: Tuple[JobStatus] = JOB_FINAL_STATES,
+    ) -> bool:
+        return self._status in required_states
+
+    def _parse_result_data(self) -> List[ExperimentResult]:
+        states = {key: value.astype(self._dtype, copy=False) for key, value in self._states.items()}
+        statevector = self._statevector.astype(self._dtype, copy=False)
+
+        if self._sparse:
+            state_data = {"statevector": SparseState.from_dense(statevector)}
+            for key in states:
+                if key.startswith("sv"):
+                    states[key] = SparseState.from_dense(states[key])
+        else:
+            state_data = {"statevector": statevector}
+
+        experiment = ExperimentResult(
+            shots=self.shots(),
+            success=True,
+            status=self._status.name,
+            data=ExperimentResultData(counts=self._counts, **state_data, **states),
+        )
+        return [experiment]
+
+    def get_qasm(self, transpiled: bool = False) -> Optional[str]:
+        """
+        Method returns the qasm string of the locally simulated circuit.
+        Local jobs are not transpiled, so the original circuit is returned in both cases.
+
+        :return: qasm str
+        """
+        return self._backend._prepare_qasm_file(self._circuit)
+
+    def get_circuit(self, transpiled: bool = False) -> Optional[QuantumCircuit]:
+        """
+        Method return the locally simulated QuantumCircuit.
+
+        :return: QuantumCircuit
+        """
+        return self._circuit.copy()
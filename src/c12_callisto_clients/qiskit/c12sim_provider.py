@@ -1,7 +1,8 @@
-from typing import Union, List
+from typing import Optional, Union, List
 from qiskit.providers.provider import ProviderV1
 from qiskit.providers.exceptions import QiskitBackendNotFoundError
 from c12_callisto_clients.api.client import Request
+from c12_callisto_clients.api.dispatch import DispatchQueue
 from c12_callisto_clients.qiskit.c12sim_backend import C12SimBackend
 from c12_callisto_clients.qiskit.exceptions import C12SimApiError
 from c12_callisto_clients.api.exceptions import ApiError
@@ -17,9 +18,20 @@ class C12SimProvider(ProviderV1):
     _request: Request = None
     _user_configs: UserConfigs = None
 
-    def __init__(self, user_config: UserConfigs):
+    def __init__(self, user_config: UserConfigs, dispatch: Optional[DispatchQueue] = None):
+        """
+        :param user_config: configuration of the user (token, verbosity, timeouts, ...)
+        :param dispatch: queue the job submissions of all the backends of the provider wait
+                         in for a free job slot (by priority and tenant)
+        """
         self._user_configs = user_config
-        self._request = Request(self._user_configs.token, self._user_configs.verbose)
+        self._request = Request(
+            self._user_configs.token,
+            self._user_configs.verbose,
+            timeouts=self._user_configs.timeouts,
+            journal=self._user_configs.journal,
+            dispatch=dispatch,
+        )
 
     @property
     def user_configs(self):
@@ -52,7 +64,9 @@ class C12SimProvider(ProviderV1):
         Function to get a backend from a current provider.
 
         :param name: string representing the name of a backend
-        :param kwargs:
+        :param kwargs: precision of the decoded amplitudes ("double" or "single"), timeouts
+                       of the API calls, the profile directory, the tenant and the priority
+                       class of the backend (see C12SimBackend)
         :return: C12SIMBackend instance
         :raises QiskitBackendNotFoundError: if there is no backend available
         :raises C12SimApiError: if there is a problem in communication with remote server
@@ -78,7 +92,15 @@ class C12SimProvider(ProviderV1):
             print(f"Backend properties {properties}")
 
         backend = C12SimBackend(
-            provider=self, name=name, request=self._request, properties=properties[0]
+            provider=self,
+            name=name,
+            request=self._request,
+            properties=properties[0],
+            precision=kwargs.get("precision", "double"),
+            timeouts=kwargs.get("timeouts", None),
+            profile_dir=kwargs.get("profile_dir", self._user_configs.profile_dir),
+            tenant=kwargs.get("tenant", None),
+            priority=kwargs.get("priority", None),
         )
 
         return backend
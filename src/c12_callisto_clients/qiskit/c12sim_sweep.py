@@ -0,0 +1,329 @@
+import re
+from typing import Callable, Dict, List, Optional, Sequence
+import numpy as np
+from qiskit import QuantumCircuit
+from qiskit.result import Result
+from qiskit.circuit import Parameter, ParameterExpression
+from qiskit.circuit.tools import pi_check
+from qiskit.providers.jobstatus import JobStatus
+
+from c12_callisto_clients.api.tracing import Timeline
+from c12_callisto_clients.qiskit.c12sim_job import C12SimJob
+from c12_callisto_clients.qiskit.exceptions import C12SimJobError
+
+
+# Base value of the numbers that temporarily replace the circuit parameters while the template
+# is serialized. They are chosen so that they are not simplified to multiples of pi by the
+# OpenQASM exporter and are unlikely to collide with the angles of the circuit.
+_PLACEHOLDER_BASE = 7341917.0
+_PLACEHOLDER_FRACTION = 0.0271828
+
+# Values of the parameters at which a template is compared with the directly bound circuit
+_SAMPLE_BASE = 0.1234567
+_SAMPLE_STEP = 0.0731
+
+_NUMBER = re.compile(r"(\d+\.?\d*(?:[eE][-+]?\d+)?)")
+
+
+def format_real(value: float) -> str:
+    """
+    Function to format a real number as an OpenQASM 2 literal.
+
+    :param value: number to format
+    :return: string representation of the number
+    """
+    return repr(float(value))
+
+
+def same_qasm(qasm: str, other: str, rtol: float = 1e-9) -> bool:
+    """
+    Function to compare two QASM strings up to the formatting of the numbers.
+
+    :param qasm: QASM string
+    :param other: QASM string
+    :param rtol: relative tolerance of the numbers
+    :return: True if the strings differ only in the formatting of equal numbers
+    """
+    parts, other_parts = _NUMBER.split(qasm), _NUMBER.split(other)
+    if len(parts) != len(other_parts):
+        return False
+    for i, (part, other_part) in enumerate(zip(parts, other_parts)):
+        if i % 2 == 0:
+            if part != other_part:
+                return False
+        elif not np.isclose(float(part), float(other_part), rtol=rtol, atol=0):
+            return False
+    return True
+
+
+class QasmTemplate:
+    """
+    OpenQASM template of a parameterized circuit. The circuit is serialized only once and
+    the QASM string for each point of a sweep is produced by textual substitution of the
+    placeholders with the values of the parameter expressions.
+    """
+
+    def __init__(
+        self,
+        qasm: str,
+        parameters: Sequence[Parameter],
+        placeholders: Dict[str, ParameterExpression],
+    ):
+        """
+        :param qasm: QASM string with placeholders instead of the parameter expressions
+        :param parameters: ordered parameters of the circuit (order of the columns of the values)
+        :param placeholders: mapping between placeholder strings and parameter expressions
+        """
+        self._qasm = qasm
+        self._parameters = list(parameters)
+        self._placeholders = placeholders
+
+        index = {parameter: i for i, parameter in enumerate(self._parameters)}
+
+        # For each placeholder store the way it is evaluated: an index for the bare parameters
+        # and a list of (parameter, index) pairs for the general expressions.
+        self._evaluators = {}
+        for placeholder, expression in placeholders.items():
+            if isinstance(expression, Parameter):
+                self._evaluators[placeholder] = index[expression]
+            else:
+                self._evaluators[placeholder] = [
+                    (parameter, index[parameter]) for parameter in expression.parameters
+                ]
+
+        self._pattern = re.compile(
+            "|".join(re.escape(item) for item in sorted(placeholders, key=len, reverse=True))
+        )
+
+    @property
+    def qasm(self) -> str:
+        """
+        Getter for the QASM string with placeholders.
+
+        :return: QASM template string
+        """
+        return self._qasm
+
+    @property
+    def parameters(self) -> List[Parameter]:
+        """
+        Getter for the ordered list of the template parameters.
+
+        :return: list of parameters
+        """
+        return self._parameters
+
+    @property
+    def num_parameters(self) -> int:
+        """
+        Number of parameters of the template.
+
+        :return: number of parameters
+        """
+        return len(self._parameters)
+
+    def _evaluate(self, placeholder: str, values: Sequence[float]) -> str:
+        evaluator = self._evaluators[placeholder]
+        if isinstance(evaluator, int):
+            return format_real(values[evaluator])
+
+        expression = self._placeholders[placeholder].bind(
+            {parameter: values[i] for parameter, i in evaluator}
+        )
+        return format_real(float(expression))
+
+    def bind(self, values: Sequence[float]) -> str:
+        """
+        Produce the QASM string for a single point of the sweep.
+
+        :param values: values of the parameters in the order of the parameters property
+        :return: QASM string
+        :raises ValueError: if the number of values does not match the number of parameters
+        """
+        if len(values) != self.num_parameters:
+            raise ValueError(
+                f"Expected {self.num_parameters} parameter values, but {len(values)} given"
+            )
+        if not self._placeholders:
+            return self._qasm
+
+        values = [float(value) for value in values]
+        return self._pattern.sub(lambda match: self._evaluate(match.group(0), values), self._qasm)
+
+    @classmethod
+    def from_circuit(
+        cls,
+        circuit: QuantumCircuit,
+        serializer: Callable[[QuantumCircuit], str],
+        parameters: Optional[Sequence[Parameter]] = None,
+    ) -> Optional["QasmTemplate"]:
+        """
+        Serialize a parameterized circuit into a template.
+
+        :param circuit: parameterized circuit
+        :param serializer: function converting a bound circuit into a QASM string
+        :param parameters: order of the parameters (circuit.parameters if None)
+        :return: QasmTemplate instance or None if the circuit cannot be represented as a template
+        :raises ValueError: if the parameters do not match the circuit parameters
+        """
+        parameters = list(circuit.parameters if parameters is None else parameters)
+        if set(parameters) != set(circuit.parameters):
+            raise ValueError("Given parameters do not match the parameters of the circuit")
+
+        placeholders = {
+            parameter: _PLACEHOLDER_BASE + i + _PLACEHOLDER_FRACTION
+            for i, parameter in enumerate(parameters)
+        }
+
+        expressions = set()
+        for instruction in circuit.data:
+            for param in instruction.operation.params:
+                if isinstance(param, ParameterExpression) and param.parameters:
+                    expressions.add(param)
+
+        qasm = serializer(circuit.assign_parameters(placeholders))
+
+        # Rendering of each expression evaluated at the placeholder values
+        rendered = {}
+        for expression in expressions:
+            value = float(expression.bind({p: placeholders[p] for p in expression.parameters}))
+            text = pi_check(value, output="qasm", eps=1e-12)
+            if text in rendered and rendered[text] != expression:
+                return None
+            rendered[text] = expression
+
+        if any(text not in qasm for text in rendered):
+            return None
+
+        template = cls(qasm, parameters, rendered)
+
+        # The placeholders can also be baked into numbers that are derived from the parameters
+        # (e.g. the definitions of composite gates), so the template is checked against the
+        # circuit bound directly at a sample point.
+        sample = [_SAMPLE_BASE + _SAMPLE_STEP * i for i in range(len(parameters))]
+        try:
+            expected = serializer(circuit.assign_parameters(dict(zip(parameters, sample))))
+            if not same_qasm(template.bind(sample), expected):
+                return None
+        except (TypeError, ValueError, ZeroDivisionError):
+            return None
+
+        return template
+
+
+class C12SimSweepJob:
+    """Class grouping the jobs of a parameter sweep."""
+
+    def __init__(
+        self,
+        jobs: List[C12SimJob],
+        parameters: Sequence[Parameter],
+        parameter_values: np.ndarray,
+    ):
+        """
+        :param jobs: jobs in the order of the sweep points
+        :param parameters: ordered parameters of the sweep
+        :param parameter_values: 2-D array of the values (points x parameters)
+        """
+        self._jobs = jobs
+        self._parameters = list(parameters)
+        self._parameter_values = parameter_values
+        self._result = None
+
+    @property
+    def jobs(self) -> List[C12SimJob]:
+        """
+        Getter for the jobs of the sweep.
+
+        :return: list of C12SimJob in the order of the sweep points
+        """
+        return self._jobs
+
+    @property
+    def parameters(self) -> List[Parameter]:
+        """
+        Getter for the parameters of the sweep.
+
+        :return: list of parameters
+        """
+        return self._parameters
+
+    @property
+    def parameter_values(self) -> np.ndarray:
+        """
+        Getter for the parameter values of the sweep.
+
+        :return: 2-D array (points x parameters)
+        """
+        return self._parameter_values
+
+    @property
+    def timings(self) -> Optional[Timeline]:
+        """
+        Getter for the timeline shared by the jobs of the sweep.
+
+        :return: Timeline instance (None if the sweep has no jobs)
+        """
+        return self._jobs[0].timings if self._jobs else None
+
+    @property
+    def shape(self) -> tuple:
+        """
+        Shape of the sweep.
+
+        :return: tuple (number of points, number of parameters)
+        """
+        return self._parameter_values.shape
+
+    def __len__(self):
+        return len(self._jobs)
+
+    def job_ids(self) -> List[str]:
+        """
+        Return the job ids of the sweep points.
+
+        :return: list of job uuids
+        """
+        return [job.job_id() for job in self._jobs]
+
+    def status(self) -> List[JobStatus]:
+        """
+        Get the latest status of each sweep point.
+
+        :return: list of JobStatus
+        """
+        return [job.status() for job in self._jobs]
+
+    def result(self, timeout: Optional[float] = None, wait: float = 5) -> Result:
+        """
+        Wait for all the sweep points and combine their results. The experiment results are
+        in the order of the rows of the parameter values.
+
+        :param timeout: seconds to wait for each of the jobs (if None wait forever)
+        :param wait: seconds between queries
+        :return: Result object with one experiment result per sweep point
+        :raises C12SimJobError: if some of the jobs did not finish successfully
+        """
+        if self._result is not None:
+            return self._result
+
+        experiments = []
+        for job in self._jobs:
+            result = job.result(timeout=timeout, wait=wait)
+            if not result.success:
+                raise C12SimJobError(f"Sweep point job {job.job_id()} did not finish successfully")
+            experiments.extend(result.results)
+
+        backend = self._jobs[0].backend() if self._jobs else None
+
+        self._result = Result(
+            backend_name=backend,
+            backend_version=backend.version if backend is not None else None,
+            job_id=",".join(self.job_ids()),
+            qobj_id=0,
+            success=True,
+            results=experiments,
+            status=JobStatus.DONE,
+        )
+
+        return self._result
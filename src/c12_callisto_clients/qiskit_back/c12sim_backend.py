@@ -9,6 +9,7 @@ from qiskit.circuit.library import RXGate, RYGate, RZGate, iSwapGate, CRXGate, C
 
 from c12_callisto_clients.api.client import Request
 from c12_callisto_clients.api.exceptions import ApiError
+from c12_callisto_clients.api.execution import Executor
 from c12_callisto_clients.qiskit_back.exceptions import C12SimJobError
 
 
@@ -270,11 +271,10 @@ class C12SimBackend(BackendV2):
                 )
 
             try:
-                job_uuid, transpiled_qasm = self._request.start_job(
-                    qasm_str=qasm,
-                    shots=shots,
-                    result=result_type,
-                    backend_name=self._backend_name,
+                submission = Executor(self._request, self._backend_name).submit(
+                    qasm,
+                    shots,
+                    result_type,
                     ini_noise=ini_noise,
                     physical_params=physical_params,
                 )
@@ -286,8 +286,8 @@ class C12SimBackend(BackendV2):
             jobs.append(
                 C12SimJob(
                     backend=self,
-                    job_id=job_uuid,
-                    qasm=transpiled_qasm,
+                    job_id=submission.job_id,
+                    qasm=submission.transpiled[0],
                     qasm_orig=qasm,
                     shots=shots,
                     result=result_type,
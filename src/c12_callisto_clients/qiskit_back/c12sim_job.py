@@ -11,6 +11,7 @@ from c12_callisto_clients.qiskit_back.exceptions import C12SimApiError, C12SimJo
 
 
 from c12_callisto_clients.api.exceptions import ApiError
+from c12_callisto_clients.api.execution import Executor, ResultDecoder
 
 
 def get_qiskit_status(status: str) -> JobStatus:
@@ -98,6 +99,10 @@ class C12SimJob(JobV1):
             matrix.append(C12SimJob._convert_json_to_np_array(dm[i]))
         return np.array(matrix)
 
+    @property
+    def _executor(self) -> Executor:
+        return Executor(self._backend.request, self._backend.name)
+
     def refresh(self) -> None:
         """
         Obtain the latest job information from the server.
@@ -108,7 +113,7 @@ class C12SimJob(JobV1):
 
         try:
             # Get job data
-            job = self._backend.request.get_job(self._job_id)
+            job = self._executor.fetch(self._job_id)
         except ApiError as err:
             raise C12SimJobError("Error getting a job") from err
 
@@ -144,11 +149,11 @@ class C12SimJob(JobV1):
             return self._status in required_states
 
         try:
-            result = self._backend.request.get_job_result(
+            self._executor.wait(
                 self._job_id,
-                output_data="counts,statevector,states,density_matrix",
                 timeout=timeout,
                 wait=wait,
+                output_data="counts,statevector,states,density_matrix",
             )
         except ApiError as err:
             raise C12SimApiError(
@@ -189,35 +194,19 @@ class C12SimJob(JobV1):
 
         if self._result_data is None:
             return []
-        if "counts" not in self._result_data or "statevector" not in self._result_data:
-            raise C12SimJobError("Error getting the information from the system.")
-
-        # Getting the counts & statevector of the circuit after execution
-        counts = self._result_data["counts"]
-        statevector = self._convert_json_to_np_array(self._result_data["statevector"])
-
-        # Additional mid-circuit data (if any)
-        additional_data = {}
-        if "states" in self._result_data:
-            states = self._result_data["states"]
-
-            if "density_matrix" in states and "statevector" in states:
-                dms = states["density_matrix"]
-                svs = states["statevector"]
-
-                for key in svs.keys():
-                    svs[key] = self._convert_json_to_np_array(svs[key])
-
-                for key in dms.keys():
-                    dms[key] = self._convert_json_to_np_matrix(dms[key])
-
-                additional_data = {**dms, **svs}
+        try:
+            decoded = ResultDecoder().decode_results(self._result_data)
+        except ApiError as err:
+            raise C12SimJobError("Error getting the information from the system.") from err
 
+        # The mid-circuit statevectors (sv{n}) and density matrices (dm{n}) are additional data
         experiment = ExperimentResult(
             shots=self.shots(),
             success=self.status() is JobStatus.DONE,
             status=self.status().name,
-            data=ExperimentResultData(counts=counts, statevector=statevector, **additional_data),
+            data=ExperimentResultData(
+                counts=decoded.counts, statevector=decoded.statevector, **decoded.states
+            ),
         )
 
         return [experiment]
@@ -264,7 +253,7 @@ class C12SimJob(JobV1):
             return self._status
 
         try:
-            status = self._backend.request.get_job_status(self._job_id)
+            status = self._executor.status(self._job_id)
         except ApiError as err:
             raise C12SimApiError(
                 "Unexpected error happened during the accessing the remote server"
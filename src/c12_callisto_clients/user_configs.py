@@ -1,6 +1,16 @@
+from typing import Dict, Optional, Tuple, Union
 from pydantic_settings import BaseSettings
 
 
 class UserConfigs(BaseSettings):
     token: str
     verbose: bool = False
+    # Timeouts of the categories of the API calls (metadata, submit, status, result),
+    # seconds or [connect, read]
+    timeouts: Dict[str, Union[float, Tuple[float, float]]] = {}
+    # Directory the cProfile statistics of the submissions and the result processing are
+    # written to (C12_PROFILE_DIR if not set)
+    profile_dir: Optional[str] = None
+    # Path of the journal the job submissions are recorded to and reattached from
+    # (C12_JOURNAL if not set)
+    journal: Optional[str] = None
@@ -1,7 +1,11 @@
 from argparse import ArgumentParser, RawTextHelpFormatter
 import codecs
+import sys
+from contextlib import ExitStack
 from qiskit import QuantumCircuit
 
+from c12_callisto_clients.api.batch import BatchRunner, collect_items, open_output, read_done
+from c12_callisto_clients.api.loadtest import LoadTest, format_summary, job_mix, summarize
 from c12_callisto_clients.user_configs import UserConfigs
 from c12_callisto_clients.qiskit.c12sim_provider import C12SimProvider
 
@@ -23,6 +27,118 @@ def add_arguments():
     qasm_group = arg_parser.add_mutually_exclusive_group()
     qasm_group.add_argument("--qasmcircuit", help="String of the qasm circuit to simulate.")
     qasm_group.add_argument("--qasmfile", help="Path to file containing qasm circuit to simulate.")
+    qasm_group.add_argument(
+        "--batch",
+        nargs="+",
+        metavar="SOURCE",
+        help="QASM files, directories, glob patterns or manifests (.txt, .jsonl) to simulate.\n"
+        "Each finished job is written as a JSON line to the --output file.",
+    )
+
+    arg_parser.add_argument("--backend", help="Name of the backend", default="c12sim")
+    arg_parser.add_argument("--shots", help="Number of shots", type=int, default=1024)
+    arg_parser.add_argument(
+        "--outputs",
+        help="Comma separated outputs of the batch jobs (counts, statevector, density_matrix,"
+        " states)",
+        default="counts",
+    )
+    arg_parser.add_argument("--physical-params", help="JSON string with the physical parameters")
+    arg_parser.add_argument(
+        "--output", help="JSON lines file of the batch results", default="results.jsonl"
+    )
+    arg_parser.add_argument(
+        "--resume",
+        help="Append to the batch output and skip the files whose jobs are done",
+        action="store_true",
+    )
+    arg_parser.add_argument(
+        "--max-concurrent",
+        help="Maximum number of the batch jobs in flight (the user maximum by default)",
+        type=int,
+        default=None,
+    )
+    arg_parser.add_argument(
+        "--wait", help="Seconds between the job status queries", type=float, default=2
+    )
+
+    commands = arg_parser.add_subparsers(dest="command")
+    bench = commands.add_parser(
+        "bench",
+        formatter_class=RawTextHelpFormatter,
+        help="Load test: submit a mix of jobs at a target rate and report the percentiles of\n"
+        "the submission, queue, run, download and decode times and the throughput.",
+    )
+    bench.add_argument(
+        "--circuits",
+        nargs="+",
+        default=["ghz"],
+        help="Circuits of the mix: ghz, random or paths of QASM files",
+    )
+    bench.add_argument("--qubits", nargs="+", type=int, default=[2], help="Numbers of qubits")
+    bench.add_argument(
+        "--shots", dest="bench_shots", nargs="+", type=int, default=[1024], help="Numbers of shots"
+    )
+    bench.add_argument(
+        "--outputs",
+        dest="bench_outputs",
+        nargs="+",
+        default=["counts"],
+        help="Outputs of the jobs, e.g. counts counts,statevector",
+    )
+    bench.add_argument("--jobs", type=int, default=20, help="Number of jobs")
+    bench.add_argument("--rate", type=float, default=1, help="Submitted jobs per second")
+    bench.add_argument(
+        "--max-in-flight", type=int, default=64, help="Maximum number of jobs in flight"
+    )
+    bench.add_argument(
+        "--poll", type=float, default=0.5, help="Seconds between the job status queries"
+    )
+    bench.add_argument("--seed", type=int, default=None, help="Seed of the job mix")
+    bench.add_argument(
+        "--samples", default="bench_samples.jsonl", help="JSON lines file of the raw samples"
+    )
+    bench.add_argument(
+        "--stand-in", action="store_true", help="Run against the local stand-in of the API"
+    )
+    bench.add_argument(
+        "--queue-delay", type=float, default=0.0, help="Queue time of the stand-in jobs"
+    )
+    bench.add_argument("--run-delay", type=float, default=0.0, help="Run time of the stand-in jobs")
+
+
+def run_batch(backend, args, verbose: bool):
+    items = collect_items(args.batch, args.shots, args.outputs, args.physical_params)
+    if args.resume:
+        done = read_done(args.output)
+        items = [item for item in items if item.path not in done]
+        if verbose:
+            print(f"Skipping {len(done)} finished jobs of {args.output}")
+
+    def report(record: dict):
+        if verbose:
+            print(f"{record['status']:<9} {record['job_id']} {record['path']}")
+
+    if verbose:
+        print(f"Running {len(items)} jobs...")
+    with open_output(args.output, args.resume) as output:
+        summary = BatchRunner(backend.executor, args.max_concurrent, args.wait).run(
+            items, output, report
+        )
+    print(", ".join(f"{status}: {count}" for status, count in sorted(summary.items())) or "Done")
+    return 0 if set(summary) <= {"FINISHED"} else 1
+
+
+def run_bench(backend, args):
+    specs = job_mix(
+        args.jobs, args.circuits, args.qubits, args.bench_shots, args.bench_outputs, args.seed
+    )
+    test = LoadTest(backend.executor, args.rate, args.max_in_flight, args.poll)
+    with open(args.samples, "w", encoding="utf-8") as samples:
+        summary = summarize(test.run(specs, samples))
+    print(format_summary(summary))
+    print(f"Samples written to {args.samples}")
+    return 0 if set(summary["jobs"]["statuses"]) <= {"FINISHED"} else 1
 
 
 if __name__ == "__main__":
@@ -30,6 +146,11 @@ if __name__ == "__main__":
     add_arguments()
     args = arg_parser.parse_args()
 
+    stand_in = args.command == "bench" and args.stand_in
+    if stand_in and args.token is None:
+        # The stand-in accepts any token
+        args.token = "stand-in"
+
     if args.config is None and args.token is None:
         raise ValueError("Input parameters have to be given via command line or configs.json file")
 
@@ -48,8 +169,24 @@ if __name__ == "__main__":
             {"verbose": args.verbose if args.verbose is not None else False, "token": args.token}
         )
 
+    if args.command == "bench":
+        with ExitStack() as stack:
+            if stand_in:
+                from c12_callisto_clients.api.stand_in import StandInServer
+
+                server = stack.enter_context(
+                    StandInServer(queue_delay=args.queue_delay, run_delay=args.run_delay)
+                )
+                stack.enter_context(server.patch_urls())
+            backend = C12SimProvider(user_config=user_configs).get_backend(args.backend)
+            exit_code = run_bench(backend, args)
+        sys.exit(exit_code)
+
     provider = C12SimProvider(user_config=user_configs)
-    backend = provider.get_backend("c12sim")
+    backend = provider.get_backend(args.backend)
+
+    if args.batch is not None:
+        sys.exit(run_batch(backend, args, user_configs.verbose))
 
     circuit: QuantumCircuit = None
 
@@ -67,7 +204,7 @@ if __name__ == "__main__":
     if circuit is None:
         raise ValueError("There is a problem with qasm string or file (missing or wrong format")
 
-    job = backend.run(circuit, shots=1024)
+    job = backend.run(circuit, shots=args.shots)
     print(f"Job Id: {job.job_id()}")
     try:
         job_result = job.result()
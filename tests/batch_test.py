@@ -0,0 +1,101 @@
+import io
+import json
+import pytest
+
+from c12_callisto_clients.api.batch import (
+    BatchRunner,
+    collect_items,
+    open_output,
+    read_done,
+)
+from c12_callisto_clients.api.client import Request
+from c12_callisto_clients.api.execution import Executor
+from c12_callisto_clients.api.stand_in import StandInServer
+
+
+QASM = """OPENQASM 2.0;
+include "qelib1.inc";
+qreg q[2];
+creg c[2];
+h q[0];
+cx q[0],q[1];
+measure q -> c;
+"""
+
+
+@pytest.fixture
+def circuits(tmp_path):
+    directory = tmp_path / "circuits"
+    (directory / "nested").mkdir(parents=True)
+    for path in ("a.qasm", "b.qasm", "nested/c.qasm"):
+        (directory / path).write_text(QASM)
+    (directory / "notes.txt").write_text("not a circuit")
+    return directory
+
+
+def test_collect_items(circuits, tmp_path):
+    items = collect_items([str(circuits)], shots=10)
+    assert [item.path for item in items] == [
+        str(circuits / "a.qasm"),
+        str(circuits / "b.qasm"),
+        str(circuits / "nested" / "c.qasm"),
+    ]
+    assert all(item.shots == 10 for item in items)
+
+    items = collect_items([str(circuits / "*.qasm"), str(circuits / "a.qasm")])
+    assert len(items) == 2
+
+    manifest = circuits / "manifest.jsonl"
+    manifest.write_text(
+        '# circuits\n{"path": "a.qasm", "shots": 5, "physical_params": {"t1": 1}}\nb.qasm\n'
+    )
+    items = collect_items([str(manifest)], outputs="counts,statevector")
+    assert (items[0].shots, items[0].physical_params) == (5, '{"t1": 1}')
+    assert (items[1].shots, items[1].outputs) == (1024, "counts,statevector")
+
+    with pytest.raises(FileNotFoundError):
+        collect_items([str(tmp_path / "missing" / "*.qasm")])
+
+
+def test_run_streams_records(circuits):
+    items = collect_items([str(circuits)], shots=20, outputs="counts,statevector")
+    items.append(collect_items([str(circuits / "a.qasm")])[0])
+    items[-1].path = str(circuits / "missing.qasm")
+    output = io.StringIO()
+    records = []
+
+    with StandInServer(max_jobs=2, run_delay=0.1) as server, server.patch_urls():
+        runner = BatchRunner(Executor(Request("token"), "c12sim-iswap"), wait=0.5)
+        summary = runner.run(items, output, on_record=records.append)
+
+    assert summary == {"FINISHED": 3, "FAILED": 1}
+    lines = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert lines == records
+    finished = [line for line in lines if line["status"] == "FINISHED"]
+    assert all(sum(line["results"]["counts"].values()) == 20 for line in finished)
+    assert all(len(line["results"]["statevector"]) == 4 for line in finished)
+    failed = next(line for line in lines if line["status"] == "FAILED")
+    assert failed["job_id"] is None and "FileNotFoundError" in failed["errors"]
+
+
+def test_resume_skips_done_jobs(circuits, tmp_path):
+    output = tmp_path / "results.jsonl"
+    done = {"path": str(circuits / "a.qasm"), "status": "FINISHED"}
+    failed = {"path": str(circuits / "b.qasm"), "status": "FAILED"}
+    output.write_text(json.dumps(done) + "\n" + json.dumps(failed) + "\n" + '{"path": "tru')
+
+    assert read_done(str(output)) == {done["path"]}
+    assert read_done(str(tmp_path / "missing.jsonl")) == set()
+
+    items = [
+        item
+        for item in collect_items([str(circuits)], shots=10)
+        if item.path not in read_done(str(output))
+    ]
+    with StandInServer() as server, server.patch_urls():
+        with open_output(str(output), resume=True) as stream:
+            BatchRunner(Executor(Request("token"), "c12sim-iswap"), wait=0.5).run(items, stream)
+
+    lines = output.read_text().splitlines()
+    assert lines[2] == '{"path": "tru'
+    assert read_done(str(output)) == {item.path for item in collect_items([str(circuits)])}
@@ -0,0 +1,116 @@
+import time
+import pytest
+import requests
+
+from c12_callisto_clients.api.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from c12_callisto_clients.api.client import Request
+from c12_callisto_clients.api.exceptions import ApiError, CircuitOpenError
+from c12_callisto_clients.api.retry import RetryPolicy
+
+
+def test_breaker_states():
+    breaker = CircuitBreaker(window=4, min_requests=4, failure_rate=0.5, reset_timeout=0.05)
+
+    for failed in (False, True, False):
+        breaker.record("api/query", failed)
+    assert breaker.state("api/query") == CLOSED
+    breaker.record("api/query", True)
+    assert breaker.state("api/query") == OPEN and breaker.state("api/other") == CLOSED
+
+    with pytest.raises(CircuitOpenError) as err:
+        breaker.allow("api/query")
+    assert 0 < err.value.retry_in <= 0.05
+
+    time.sleep(0.06)
+    assert breaker.state("api/query") == HALF_OPEN
+    breaker.allow("api/query")
+    with pytest.raises(CircuitOpenError):
+        breaker.allow("api/query")  # only one probe at a time
+
+    breaker.record("api/query", True)
+    assert breaker.state("api/query") == OPEN
+
+    time.sleep(0.06)
+    breaker.allow("api/query")
+    breaker.record("api/query", False)
+    assert breaker.state("api/query") == CLOSED
+
+
+def test_probes_are_not_lost_on_other_errors(monkeypatch, stand_in_server):
+    breaker = CircuitBreaker(window=4, min_requests=1, reset_timeout=0)
+    request = Request("token", retry=RetryPolicy.disabled(), breaker=breaker)
+    url = stand_in_server.urls["API_HEALTH_URL"]
+    endpoint = url.split("//")[1]
+    breaker.record(endpoint, True)
+    send = request._send
+
+    def fail(error):
+        def _send(*args):
+            raise error
+
+        monkeypatch.setattr(request, "_send", _send)
+
+    # A broken response body is a failure of the probe, the endpoint is opened again
+    fail(requests.exceptions.ChunkedEncodingError("broken"))
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        request.do_request(url, "get")
+    assert breaker.state(endpoint) == HALF_OPEN
+
+    # Other errors give the probe back
+    fail(ValueError("interrupted"))
+    with pytest.raises(ValueError):
+        request.do_request(url, "get")
+    assert breaker.state(endpoint) == HALF_OPEN
+
+    monkeypatch.setattr(request, "_send", send)
+    assert request.do_request(url, "get") == {"status": "ok"}
+    assert breaker.state(endpoint) == CLOSED
+
+
+def test_requests_fail_fast_when_open(stand_in_server):
+    breaker = CircuitBreaker(window=4, min_requests=2, reset_timeout=60)
+    request = Request("token", retry=RetryPolicy.disabled(), breaker=breaker)
+    stand_in_server.faults = [503, 502]
+
+    for _ in range(2):
+        with pytest.raises(ApiError) as err:
+            request.do_request(stand_in_server.url + "/query", "get")
+        assert not isinstance(err.value, CircuitOpenError)
+
+    with pytest.raises(CircuitOpenError):
+        request.do_request(stand_in_server.url + "/query", "get")
+
+    assert len(stand_in_server.received) == 2
+    # The endpoints are tracked separately
+    assert "backends" in request.do_request(stand_in_server.url + "/backends", "get")
+
+
+def test_retries_stop_when_the_breaker_opens(stand_in_server):
+    breaker = CircuitBreaker(window=4, min_requests=2, reset_timeout=60)
+    request = Request("token", retry=RetryPolicy(backoff=0.01), breaker=breaker)
+    stand_in_server.faults = [503] * 4
+
+    with pytest.raises(CircuitOpenError):
+        request.do_request(stand_in_server.url + "/query", "get")
+
+    assert len(stand_in_server.received) == 2
+
+
+def test_poller_backs_off_while_open(stand_in_server):
+    breaker = CircuitBreaker(window=4, min_requests=2, reset_timeout=0.2)
+    request = Request("token", breaker=breaker)
+    stand_in_server.responses["API_QUERY_URL"] = {"status": "FINISHED"}
+    endpoint = stand_in_server.url.split("//")[1] + "/query"
+    breaker.record(endpoint, True)
+    breaker.record(endpoint, True)
+
+    start = time.time()
+    assert request.get_job_result("job", wait=0.5)["status"] == "FINISHED"
+    assert time.time() - start >= 0.5
+    assert len(stand_in_server.received) == 1 and breaker.state(endpoint) == CLOSED
+
+    breaker.record(endpoint, True)
+    breaker.record(endpoint, True)
+    breaker.reset_timeout = 60
+    with pytest.raises(TimeoutError):
+        request.get_job_result("job", wait=0.5, timeout=0.6)
@@ -0,0 +1,111 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+
+from c12_callisto_clients.api.client import Request
+from c12_callisto_clients.api.coalesce import SingleFlight
+from c12_callisto_clients.api.streaming import StreamingDecoder
+
+
+def test_concurrent_calls_share_one_flight():
+    flights = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(5)
+        return {"status": "RUNNING"}
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [executor.submit(flights.do, "job", fetch) for _ in range(8)]
+        time.sleep(0.1)
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert len(calls) == 1 and all(result is results[0] for result in results)
+    # Without a ttl the result is not kept
+    flights.do("job", fetch)
+    assert len(calls) == 2
+
+
+def test_errors_are_shared_and_not_cached():
+    flights = SingleFlight()
+
+    def fail():
+        raise ValueError("failed")
+
+    with pytest.raises(ValueError):
+        flights.do("job", fail, ttl=lambda _: 10)
+    assert flights.do("job", lambda: 1, ttl=lambda _: 10) == 1
+    assert flights.do("job", lambda: 2, ttl=lambda _: 10) == 1
+    flights.forget("job")
+    assert flights.do("job", lambda: 3) == 3
+
+
+def test_identical_status_queries_are_coalesced(stand_in_server):
+    request = Request("token", coalesce_ttl=0.2)
+    stand_in_server.responses["API_JOB_STATUS_URL"] = {"status": "RUNNING"}
+    stand_in_server.latency = 0.2
+
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        statuses = list(executor.map(request.get_job_status, ["job"] * 6))
+    assert statuses == ["RUNNING"] * 6 and len(stand_in_server.received) == 1
+
+    stand_in_server.latency = 0
+    request.get_job_status("job")
+    request.get_job_status("other")
+    assert len(stand_in_server.received) == 2
+
+    time.sleep(0.25)
+    request.get_job_status("job")
+    assert len(stand_in_server.received) == 3
+
+
+def test_final_statuses_are_not_reused(stand_in_server):
+    request = Request("token", coalesce_ttl=10)
+    stand_in_server.responses["API_GET_JOB"] = {"job": {"status": "finished"}}
+
+    request.get_job("job")
+    request.get_job("job")
+    assert len(stand_in_server.received) == 2
+
+    stand_in_server.responses["API_GET_JOB"] = {"job": {"status": "running"}}
+    request.get_job("job")
+    request.get_job("job", decoder=StreamingDecoder())
+    request.get_job("job")
+    assert len(stand_in_server.received) == 4
+
+    # The arrays of decoders with their own allocation cannot be shared
+    allocating = StreamingDecoder(allocate=lambda name, shape, dtype: None)
+    request.get_job("job", decoder=allocating)
+    assert len(stand_in_server.received) == 5
+
+
+def test_waiting_callers_get_the_error_of_the_ttl():
+    flights = SingleFlight()
+    release = threading.Event()
+
+    def fetch():
+        release.wait(5)
+        return {"job": None}
+
+    def ttl(data):
+        return data["job"]["status"]
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        leader = executor.submit(flights.do, "job", fetch, ttl)
+        time.sleep(0.05)
+        follower = executor.submit(flights.do, "job", fetch, ttl)
+        time.sleep(0.05)
+        release.set()
+        with pytest.raises(TypeError):
+            leader.result(timeout=5)
+        with pytest.raises(TypeError):
+            follower.result(timeout=5)
+
+
+def test_null_jobs_are_returned(stand_in_server):
+    stand_in_server.responses["API_GET_JOB"] = {"job": None}
+    assert Request("token", coalesce_ttl=10).get_job("job") is None
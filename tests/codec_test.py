@@ -0,0 +1,49 @@
+import json
+import pytest
+
+from c12_callisto_clients.api.client import Request
+from c12_callisto_clients.api.codec import CODECS, JsonCodec, get_codec
+
+
+PAYLOAD = {
+    "qasm_str": 'OPENQASM 2.0;\ninclude "qelib1.inc";\nqreg q[2];\nh q[0];',
+    "num_shots": 1024,
+    "results": {"statevector": ["(0.7071067811865475+0j)", "0j"], "counts": {"00": 3}},
+    "errors": None,
+}
+
+
+def test_auto_selects_preferred_codec():
+    assert get_codec("auto") is next(iter(CODECS.values()))
+    assert get_codec("json").name == "json"
+    with pytest.raises(ValueError):
+        get_codec("unknown")
+
+
+@pytest.mark.parametrize("name", list(CODECS))
+def test_codec_round_trip(name):
+    codec = get_codec(name)
+    body = codec.dumps(PAYLOAD)
+
+    assert codec.loads(body) == PAYLOAD
+    assert json.loads(body) == PAYLOAD
+
+
+@pytest.mark.parametrize("name", list(CODECS))
+def test_request_uses_codec(stand_in_server, name):
+    calls = []
+
+    class CountingCodec(JsonCodec):
+        def dumps(self, obj):
+            calls.append("dumps")
+            return get_codec(name).dumps(obj)
+
+        def loads(self, data):
+            calls.append("loads")
+            return get_codec(name).loads(data)
+
+    request = Request("token", codec=CountingCodec())
+    job_uuid, transpiled = request.start_job("qasm", 10, "counts", "c12sim-iswap")
+
+    assert (job_uuid, transpiled) == (stand_in_server.jobs[0].uuid, "qasm")
+    assert calls == ["dumps", "loads"]
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from c12_callisto_clients.api.client import Request
+from c12_callisto_clients.api.streaming import StreamingDecoder
+
+QASM = 'OPENQASM 2.0;\ninclude "qelib1.inc";\nqreg q[4];\n' + "rz(0.123456789) q[0];\n" * 2000
+JOB = {"qasm_str": QASM, "num_shots": 10, "result": "counts"}
+RESULT = {
+    "status": "FINISHED",
+    "results": {"statevector": ["(0.7071067811865475+0j)", "0j", "0j", "(0.7071067811865475+0j)"]},
+}
+
+
+@pytest.mark.parametrize("compression", ["gzip", "deflate"])
+def test_large_bodies_are_compressed(stand_in_server, compression):
+    request = Request("token", compression=compression, compress_min_bytes=1024)
+    url = stand_in_server.url + "/query"
+
+    large = request.do_request(url, "post", JOB)
+    small = request.do_request(url, "post", {**JOB, "qasm_str": "qreg q[1];"})
+
+    assert large["transpiled"] == QASM and small["transpiled"] == "qreg q[1];"
+    assert stand_in_server.received[0]["encoding"] == compression
+    assert stand_in_server.received[0]["size"] * 10 < len(QASM)
+    assert stand_in_server.received[1]["encoding"] is None
+
+
+def test_bodies_are_not_compressed_by_default(stand_in_server):
+    request = Request("token", compress_min_bytes=1024)
+
+    request.do_request(stand_in_server.url + "/query", "post", JOB)
+
+    assert request.compression is None
+    assert stand_in_server.received[0]["encoding"] is None
+
+
+def test_compression_falls_back_when_rejected(stand_in_server):
+    request = Request("token", compression="gzip", compress_min_bytes=1024)
+    stand_in_server.accept_compressed = False
+
+    data = request.do_request(stand_in_server.url + "/query", "post", JOB)
+    request.do_request(stand_in_server.url + "/query", "post", JOB)
+
+    assert data["transpiled"] == QASM
+    assert [item["encoding"] for item in stand_in_server.received] == ["gzip", None, None]
+    assert request.compression is None
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_compressed_responses(stand_in_server, stream):
+    decoder = StreamingDecoder() if stream else None
+    stand_in_server.responses["API_QUERY_URL"] = RESULT
+    url = stand_in_server.url + "/query"
+
+    data = Request("token").do_request(url, "get", decoder=decoder)
+    plain = Request("token", accept_encoding="identity").do_request(url, "get", decoder=decoder)
+
+    assert np.allclose(
+        np.abs(np.asarray(data["results"]["statevector"], dtype=complex)) ** 2, [0.5, 0, 0, 0.5]
+    )
+    assert data["status"] == plain["status"] == "FINISHED"
+    assert stand_in_server.sent[0] != stand_in_server.sent[1]
@@ -0,0 +1,137 @@
+import json
+import threading
+import uuid
+import pytest
+
+from c12_callisto_clients.api.client import Request
+from c12_callisto_clients.api.stand_in import StandInServer
+
+
+BACKEND_PROPERTIES = {
+    "backend_name": "c12sim-iswap",
+    "n_qubits": 5,
+    "basis_gates": ["rx", "ry", "rz", "iswap"],
+    "max-circuits": 1,
+}
+
+
+class StandInRequest(Request):
+    """Request that keeps the started jobs in memory instead of calling the remote API."""
+
+    def __init__(self):
+        super().__init__("token")
+        self.started = {}
+        self._lock = threading.Lock()
+
+    def start_job(self, qasm_str: str, shots: int, result: str, backend_name: str, **kwargs):
+        job_uuid = str(uuid.uuid4())
+        with self._lock:
+            self.started[job_uuid] = {
+                "qasm_str": qasm_str,
+                "shots": shots,
+                "result": result,
+                "backend_name": backend_name,
+                **kwargs,
+            }
+        return job_uuid, qasm_str
+
+    def get_maxjobs(self) -> int:
+        return 4
+
+    def _results(self, job_uuid: str) -> dict:
+        shots = self.started[job_uuid]["shots"]
+        return {
+            "counts": {"00": shots // 2, "11": shots - shots // 2},
+            "statevector": ["(0.7071067811865475+0j)", "0j", "0j", "(0.7071067811865475+0j)"],
+            "density_matrix": [
+                ["(0.5+0j)", "0j", "0j", "(0.5+0j)"],
+                ["0j", "0j", "0j", "0j"],
+                ["0j", "0j", "0j", "0j"],
+                ["(0.5+0j)", "0j", "0j", "(0.5+0j)"],
+            ],
+            "states": {
+                "statevector": {
+                    "sv1": ["(0.7071067811865475+0j)", "(0.7071067811865475+0j)", "0j", "0j"]
+                },
+                "density_matrix": {
+                    "dm1": [
+                        ["(0.5+0j)", "(0.5+0j)", "0j", "0j"],
+                        ["(0.5+0j)", "(0.5+0j)", "0j", "0j"],
+                        ["0j", "0j", "0j", "0j"],
+                        ["0j", "0j", "0j", "0j"],
+                    ]
+                },
+            },
+        }
+
+    def get_job_status(self, job_uuid: str) -> str:
+        return "finished"
+
+    @staticmethod
+    def _respond(data: dict, decoder=None):
+        if decoder is None:
+            return data
+        # Streamed responses are fed to the decoder in small chunks
+        body = json.dumps(data).encode()
+        return decoder.decode(body[i : i + 64] for i in range(0, len(body), 64))
+
+    def get_job_result(
+        self,
+        job_uuid: str,
+        output_data: str = None,
+        timeout=None,
+        wait=5,
+        decoder=None,
+        on_status=None,
+    ):
+        if on_status is not None:
+            on_status("RUNNING")
+            on_status("FINISHED")
+        data = {"status": "FINISHED", "results": self._results(job_uuid), "errors": ""}
+        return self._respond(data, decoder)
+
+    def get_job(self, job_uuid: str, decoder=None) -> dict:
+        job = self.started[job_uuid]
+        return self._respond(
+            {
+                "uuid": job_uuid,
+                "status": "finished",
+                "options": {"shots": job["shots"], "result": job["result"]},
+                "task": job["qasm_str"],
+                "task_orig": job["qasm_str"],
+                "errors": "",
+                "result": self._results(job_uuid),
+            },
+            decoder,
+        )
+
+
+@pytest.fixture
+def stand_in_server():
+    with StandInServer() as server, server.patch_urls():
+        yield server
+
+
+@pytest.fixture
+def stand_in_request():
+    return StandInRequest()
+
+
+@pytest.fixture
+def qiskit_backend(stand_in_request):
+    from c12_callisto_clients.qiskit.c12sim_backend import C12SimBackend
+
+    return C12SimBackend(
+        name=BACKEND_PROPERTIES["backend_name"],
+        request=stand_in_request,
+        properties=BACKEND_PROPERTIES,
+    )
+
+
+@pytest.fixture
+def pytket_backend(stand_in_request):
+    from c12_callisto_clients.pytket.extensions.callisto.backends.callisto import CallistoBackend
+
+    backend = CallistoBackend(BACKEND_PROPERTIES["backend_name"], "token")
+    backend._request = stand_in_request
+    return backend
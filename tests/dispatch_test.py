@@ -0,0 +1,252 @@
+import threading
+import time
+import pytest
+import requests
+from qiskit import QuantumCircuit
+from pytket import Circuit
+
+from c12_callisto_clients.api.client import Request
+from c12_callisto_clients.api.dispatch import DispatchQueue, priority_rank
+from c12_callisto_clients.api.exceptions import ApiError, CircuitOpenError, NotFoundError
+from c12_callisto_clients.api.stand_in import StandInServer
+from c12_callisto_clients.pytket.extensions.callisto.backends.callisto import CallistoBackend
+from c12_callisto_clients.qiskit.c12sim_backend import C12SimBackend
+
+
+class _Client:
+    """Client with a fixed maximum number of jobs and settable job statuses."""
+
+    def __init__(self, maxjobs: int = 1):
+        self.maxjobs = maxjobs
+        self.statuses = {}
+        self.queries = 0
+
+    def get_maxjobs(self) -> int:
+        return self.maxjobs
+
+    def get_job_status(self, job_uuid: str) -> str:
+        self.queries += 1
+        status = self.statuses.get(job_uuid, "RUNNING")
+        if status == "GONE":
+            raise NotFoundError("Error occurred during the execution of the request: 404")
+        if status == "FAILING":
+            raise ApiError("Error occurred during the execution of the request: 503")
+        if status == "OPEN":
+            raise CircuitOpenError("Endpoint is unavailable (circuit open)", retry_in=60)
+        if status == "DOWN":
+            raise requests.ConnectionError("Connection refused")
+        return status
+
+
+def _wait_until(condition, timeout: float = 5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met"
+        time.sleep(0.005)
+
+
+def _dispatch_order(queue: DispatchQueue, submissions: list) -> list:
+    """Queue the submissions (tenant, priority) behind a held slot and free the slots one by one."""
+    client = _Client()
+    holder = queue.acquire(client)
+    queue.started(holder, "holder")
+
+    order = []
+    lock = threading.Lock()
+
+    def submit(tenant, priority):
+        ticket = queue.acquire(client, tenant, priority)
+        with lock:
+            order.append(f"{tenant}:{priority}")
+            queue.started(ticket, str(len(order)))
+
+    threads = []
+    for count, (tenant, priority) in enumerate(submissions, start=1):
+        threads.append(threading.Thread(target=submit, args=(tenant, priority)))
+        threads[-1].start()
+        _wait_until(lambda: sum(queue.waiting().values()) == count)
+
+    queue.observe("holder", "FINISHED")
+    for index in range(len(submissions)):
+        _wait_until(lambda: len(order) > index)
+        queue.observe(str(index + 1), "FINISHED")
+    for thread in threads:
+        thread.join()
+    return order
+
+
+def test_priority_classes_are_dispatched_first():
+    order = _dispatch_order(
+        DispatchQueue(refresh_interval=60),
+        [("a", "batch"), ("a", "normal"), ("b", "batch"), ("b", "interactive")],
+    )
+
+    assert order == ["b:interactive", "a:normal", "a:batch", "b:batch"]
+    assert priority_rank(None) == priority_rank("normal") and priority_rank(5) == 5
+    with pytest.raises(ValueError):
+        priority_rank("urgent")
+
+
+def test_tenants_share_the_slots_by_weight():
+    sweep = [("sweep", "batch")] * 4 + [("quick", "batch")] * 2
+    assert _dispatch_order(DispatchQueue(refresh_interval=60), sweep) == [
+        "sweep:batch",
+        "quick:batch",
+        "sweep:batch",
+        "quick:batch",
+        "sweep:batch",
+        "sweep:batch",
+    ]
+
+    weighted = DispatchQueue(weights={"quick": 2}, refresh_interval=60)
+    assert _dispatch_order(weighted, sweep) == [
+        "sweep:batch",
+        "quick:batch",
+        "quick:batch",
+        "sweep:batch",
+        "sweep:batch",
+        "sweep:batch",
+    ]
+
+
+def test_slots_are_freed_by_polling_and_release():
+    client = _Client(maxjobs=1)
+    queue = DispatchQueue(refresh_interval=0.05)
+
+    first = queue.acquire(client)
+    assert queue.capacity == 1 and queue.in_flight == 1
+    queue.started(first, "job-1")
+
+    with pytest.raises(TimeoutError):
+        queue.acquire(client, timeout=0.2)
+    assert queue.waiting() == {}
+
+    # The waiting submission polls the job in flight until it finishes
+    threading.Timer(0.1, lambda: client.statuses.update({"job-1": "FINISHED"})).start()
+    second = queue.acquire(client, timeout=5)
+    assert second.granted and queue.in_flight == 1
+
+    # A submission that failed to start a job gives its slot back
+    queue.release(second)
+    assert queue.in_flight == 0
+
+
+def test_timed_out_submissions_keep_the_share_of_the_tenant():
+    queue = DispatchQueue(capacity=1, refresh_interval=60)
+    client = _Client()
+    holder = queue.acquire(client)
+    for _ in range(3):
+        with pytest.raises(TimeoutError):
+            queue.acquire(client, "quick", "batch", timeout=0.01)
+    queue.release(holder)
+
+    # The abandoned submissions do not push the later ones of the tenant back
+    sweep = [("sweep", "batch")] * 3 + [("quick", "batch")]
+    assert _dispatch_order(queue, sweep) == [
+        "sweep:batch",
+        "quick:batch",
+        "sweep:batch",
+        "sweep:batch",
+    ]
+
+
+def test_slots_of_jobs_that_cannot_be_queried_are_freed():
+    client = _Client(maxjobs=1)
+    queue = DispatchQueue(refresh_interval=0.01, max_status_failures=3)
+
+    first = queue.acquire(client)
+    queue.started(first, "job-1")
+    client.statuses["job-1"] = "GONE"
+
+    # The deleted job frees its slot after three failed status queries
+    second = queue.acquire(client, timeout=5)
+    assert second.granted and queue.in_flight == 1
+    queue.observe("job-1", "FINISHED")
+    assert queue.in_flight == 1
+
+
+def test_unknown_jobs_are_not_found():
+    with StandInServer() as server, server.patch_urls():
+        with pytest.raises(NotFoundError):
+            Request("token").get_job_status("missing")
+
+
+def test_jobs_keep_their_slots_during_outages():
+    client = _Client(maxjobs=1)
+    queue = DispatchQueue(refresh_interval=0.01, max_status_failures=1)
+
+    first = queue.acquire(client)
+    queue.started(first, "job-1")
+    client.statuses["job-1"] = "FAILING"
+    with pytest.raises(TimeoutError):
+        queue.acquire(client, timeout=0.2)
+    assert queue.in_flight == 1 and client.queries > 1
+
+    # The statuses are not queried again until the circuit breaker lets the requests through
+    client.statuses["job-1"] = "OPEN"
+    time.sleep(0.02)
+    client.queries = 0
+    with pytest.raises(TimeoutError):
+        queue.acquire(client, timeout=0.2)
+    assert queue.in_flight == 1 and client.queries == 1
+
+
+def test_failed_waits_do_not_keep_a_slot():
+    client = _Client(maxjobs=1)
+    queue = DispatchQueue(refresh_interval=0.01)
+
+    first = queue.acquire(client)
+    queue.started(first, "job-1")
+    client.statuses["job-1"] = "DOWN"
+
+    with pytest.raises(requests.ConnectionError):
+        queue.acquire(client, timeout=5)
+    assert queue.waiting() == {}
+
+    # The slot of the finished job is not given to the abandoned submission
+    queue.observe("job-1", "FINISHED")
+    assert queue.in_flight == 0
+
+
+def test_qiskit_jobs_wait_for_free_slots():
+    circuit = QuantumCircuit(2, 2)
+    circuit.h(0)
+    circuit.measure([0, 1], [0, 1])
+
+    with StandInServer(max_jobs=2, run_delay=0.3) as server, server.patch_urls():
+        queue = DispatchQueue(refresh_interval=0.05)
+        request = Request("token", dispatch=queue)
+        properties = request.get_backends()[0]
+        backend = C12SimBackend(
+            request=request,
+            name=properties["backend_name"],
+            properties=properties,
+            tenant="team",
+            priority="batch",
+        )
+
+        start = time.monotonic()
+        jobs = backend.run([circuit] * 4, shots=10, priority="interactive")
+        # The third job is started only after one of the first two finished
+        assert time.monotonic() - start >= 0.3
+        assert queue.capacity == 2 and queue.in_flight == 2
+
+        assert all(sum(job.result(wait=0.5).get_counts().values()) == 10 for job in jobs)
+        assert queue.in_flight == 0
+        assert server.calls["GET /api/c12sim/maxjobs"] == 1
+
+
+def test_pytket_jobs_use_the_dispatch_queue():
+    circuit = Circuit(2).H(0).CX(0, 1).measure_all()
+    queue = DispatchQueue(capacity=1, refresh_interval=0.05)
+
+    with StandInServer(run_delay=0.1) as server, server.patch_urls():
+        backend = CallistoBackend("c12sim-iswap", "token", dispatch=queue, tenant="team")
+        handles = backend.process_circuits(
+            [circuit] * 2, n_shots=10, valid_check=False, priority="interactive"
+        )
+
+        assert queue.in_flight == 1
+        results = backend.get_results(handles, wait=0.5)
+        assert [sum(result.get_counts().values()) for result in results] == [10, 10]
+        assert queue.in_flight == 0
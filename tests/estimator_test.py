@@ -0,0 +1,45 @@
+import warnings
+import pytest
+from qiskit import QuantumCircuit
+
+from c12_callisto_clients.api.estimator import JobEstimate
+from c12_callisto_clients.api.exceptions import JobTooLargeError
+from c12_callisto_clients.qiskit.exceptions import C12SimJobError
+
+
+def test_density_matrix_dominates_payload():
+    small = JobEstimate(22, 1024, "counts,statevector")
+    large = JobEstimate(22, 1024, "counts,statevector,density_matrix")
+
+    assert large.response_bytes > 2**22 * small.response_bytes / 100
+    assert large.decode_memory_bytes > large.response_bytes
+    assert large.relative_cost > small.relative_cost
+
+
+def test_check_suggests_cheaper_outputs():
+    estimate = JobEstimate(22, 1024, "counts,statevector,density_matrix")
+
+    with pytest.raises(JobTooLargeError, match="counts,statevector"):
+        estimate.check("error")
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        estimate.check("warn")
+    assert len(caught) == 1
+
+    assert JobEstimate(5, 1024, "counts,statevector,density_matrix").problems() == []
+
+
+def test_backend_refuses_large_jobs(qiskit_backend, stand_in_request):
+    circuit = QuantumCircuit(4)
+    circuit.h(0)
+    circuit.barrier()
+    circuit.cx(0, 1)
+
+    estimate = qiskit_backend.estimate(circuit, shots=100)
+    assert estimate.n_barriers == 1
+    assert "states" in estimate.outputs
+
+    with pytest.raises(C12SimJobError):
+        qiskit_backend.run(circuit, preflight="error", max_response_bytes=1000)
+    assert len(stand_in_request.started) == 0
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+from qiskit import QuantumCircuit
+
+from c12_callisto_clients.api.exceptions import ApiError
+from c12_callisto_clients.api.execution import Executor, ResultDecoder, merge_results
+from c12_callisto_clients.api.sparse import SparseState
+
+
+def test_submit_single_job(stand_in_request):
+    executor = Executor(stand_in_request, "c12sim-iswap")
+    submission = executor.submit("OPENQASM 2.0;", 100, "counts")
+
+    assert not submission.is_split
+    assert submission.shots == [100]
+    assert stand_in_request.started[submission.job_id]["backend_name"] == "c12sim-iswap"
+    assert [span.name for span in submission.timeline.spans] == ["submit", "queued"]
+
+
+def test_submit_split_job(stand_in_request):
+    submission = Executor(stand_in_request).submit(
+        "OPENQASM 2.0;", 250, "counts", max_shots_per_job=100
+    )
+
+    assert submission.is_split
+    assert submission.shots == [84, 83, 83]
+    assert [stand_in_request.started[job_id]["shots"] for job_id in submission.job_ids] == (
+        submission.shots
+    )
+
+
+def test_wait_and_fetch(stand_in_request):
+    executor = Executor(stand_in_request)
+    submission = executor.submit("OPENQASM 2.0;", 10, "counts")
+
+    data = executor.wait(submission.job_id, timeline=submission.timeline)
+    job = executor.fetch(submission.job_id, timeline=submission.timeline)
+
+    assert data["status"] == "FINISHED"
+    assert job["options"]["shots"] == 10
+    assert submission.timeline.durations().keys() >= {"submit", "queued", "running", "download"}
+
+
+def test_decode_results(stand_in_request):
+    job_uuid, _ = stand_in_request.start_job("", 10, "counts", "c12sim-iswap")
+    results = stand_in_request.get_job_result(job_uuid)["results"]
+
+    decoded = ResultDecoder("single").decode_results(results, density_matrix=True)
+
+    assert decoded.counts == {"00": 5, "11": 5}
+    assert decoded.statevector.dtype == np.complex64
+    assert np.allclose(decoded.density_matrix[0], [0.5, 0, 0, 0.5])
+    assert set(decoded.states) == {"sv1", "dm1"}
+
+    sparse = ResultDecoder(sparse=True).decode_results(results)
+    assert sparse.is_sparse and isinstance(sparse.states["sv1"], SparseState)
+
+    with pytest.raises(ApiError):
+        ResultDecoder().decode_results({"counts": {}})
+
+
+def test_merge_results():
+    results = [
+        {"counts": {"00": 3, "11": 2}, "statevector": [1]},
+        {"counts": {"00": 1, "01": 4}, "statevector": [2]},
+    ]
+    merged, chunks = merge_results(results, ["a", "b"], [5, 5])
+
+    assert merged == {"counts": {"00": 4, "11": 2, "01": 4}, "statevector": [1]}
+    assert [chunk["job_id"] for chunk in chunks] == ["a", "b"]
+
+
+def test_split_job_decodes_states_once(qiskit_backend, monkeypatch):
+    decoded = []
+    decode = ResultDecoder.decode_results
+    monkeypatch.setattr(
+        ResultDecoder,
+        "decode_results",
+        lambda self, *args, **kwargs: decoded.append(1) or decode(self, *args, **kwargs),
+    )
+
+    circuit = QuantumCircuit(2, 2)
+    circuit.h(0)
+    circuit.cx(0, 1)
+    result = qiskit_backend.run(circuit, shots=300, max_shots_per_job=100).result()
+
+    assert sum(result.get_counts().values()) == 300
+    assert len(decoded) == 1
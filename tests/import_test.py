@@ -0,0 +1,34 @@
+import os
+import subprocess
+import sys
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+
+def _loaded_modules(statement: str) -> set:
+    code = f"import sys\n{statement}\nprint(' '.join(name.split('.')[0] for name in sys.modules))"
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        check=True,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": SRC},
+    ).stdout
+    return set(output.split())
+
+
+def test_api_client_does_not_import_qiskit_or_pytket():
+    modules = _loaded_modules("from c12_callisto_clients.api.client import Request")
+    assert "c12_callisto_clients" in modules
+    assert not modules & {"qiskit", "pytket", "pydantic_settings"}
+
+
+def test_package_attributes_are_loaded_on_access():
+    modules = _loaded_modules(
+        "import c12_callisto_clients\n"
+        "assert c12_callisto_clients.client.Request\n"
+        "assert 'qiskit' not in sys.modules\n"
+        "assert c12_callisto_clients.c12sim_backend.C12SimBackend\n"
+        "assert c12_callisto_clients.CallistoBackend"
+    )
+    assert {"qiskit", "pytket"} <= modules
@@ -0,0 +1,135 @@
+import json
+import pytest
+from qiskit import QuantumCircuit
+from pytket import Circuit
+
+from c12_callisto_clients.api.client import Request
+from c12_callisto_clients.api.journal import SubmissionJournal, request_hash
+from c12_callisto_clients.api.stand_in import StandInServer
+from c12_callisto_clients.pytket.extensions.callisto.backends.callisto import (
+    CallistoBackend,
+    CallistoRunningException,
+)
+from c12_callisto_clients.qiskit.c12sim_backend import C12SimBackend
+from c12_callisto_clients.qiskit.exceptions import C12SimJobError
+
+QASM = """OPENQASM 2.0;
+include "qelib1.inc";
+qreg q[2];
+creg c[2];
+h q[0];
+cx q[0],q[1];
+measure q -> c;
+"""
+
+
+def _backend(request: Request) -> C12SimBackend:
+    properties = request.get_backends()[0]
+    return C12SimBackend(request=request, name=properties["backend_name"], properties=properties)
+
+
+def test_journal_records_and_reloads(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    journal = SubmissionJournal(path)
+    first = journal.claim("hash", backend_name="c12sim", shots=10, result="counts")
+    second = journal.claim("hash", key="key")
+    journal.started(first, "job-1", "qasm")
+
+    assert second.key == "key" and not second.is_started
+    assert journal.job_ids() == ["job-1"]
+
+    # An incomplete last line of a crashed process is skipped and the next record starts
+    # on a new line
+    with open(path, "a", encoding="utf-8") as file:
+        file.write('{"event": "started", "key": "ke')
+    reloaded = SubmissionJournal(path)
+    assert [entry.key for entry in reloaded.entries(started=False)] == ["key"]
+
+    # The identical submissions are matched in order, the next ones are new
+    assert reloaded.claim("hash").job_uuid == "job-1"
+    assert reloaded.claim("hash").key == "key"
+    assert reloaded.claim("hash").key not in (first.key, "key")
+    reloaded.started(reloaded.entries(started=False)[0], "job-2", "qasm")
+
+    assert SubmissionJournal(path).job_ids() == ["job-1", "job-2"]
+    assert SubmissionJournal(path).entries("c12sim")[0].info["shots"] == 10
+    with open(path, encoding="utf-8") as file:
+        lines = file.read().splitlines()
+    assert lines[3] == '{"event": "started", "key": "ke' and len(lines) == 6
+    assert all(json.loads(line) for line in lines[4:])
+
+
+def test_start_job_reattaches_after_restart(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    with StandInServer() as server, server.patch_urls():
+        request = Request("token", journal=path)
+        first = request.start_job(QASM, 10, "counts", "c12sim-iswap")
+        second = request.start_job(QASM, 10, "counts", "c12sim-iswap")
+        assert first[0] != second[0] and len(server.jobs) == 2
+
+        # A new process with the same journal reattaches to the recorded jobs
+        restarted = Request("token", journal=path)
+        assert restarted.start_job(QASM, 10, "counts", "c12sim-iswap") == first
+        assert restarted.start_job(QASM, 10, "counts", "c12sim-iswap") == second
+        third = restarted.start_job(QASM, 10, "counts", "c12sim-iswap")
+        assert third[0] not in (first[0], second[0]) and len(server.jobs) == 3
+
+
+def test_unrecorded_response_is_sent_with_the_same_key(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    params = {"qasm_str": QASM, "num_shots": 10, "result": "counts", "backend_name": "c12sim-iswap"}
+    with StandInServer() as server, server.patch_urls():
+        # The process crashed after the job was started but before its uuid was recorded
+        SubmissionJournal(path).claim(request_hash(params), "crashed")
+        job_uuid, _ = Request("token").start_job(
+            QASM, 10, "counts", "c12sim-iswap", idempotency_key="crashed"
+        )
+
+        request = Request("token", journal=path)
+        assert request.start_job(QASM, 10, "counts", "c12sim-iswap")[0] == job_uuid
+        assert len(server.jobs) == 1
+        assert request.journal.job_ids() == [job_uuid]
+
+
+def test_qiskit_resume_jobs(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    circuit = QuantumCircuit(2, 2)
+    circuit.h(0)
+    circuit.cx(0, 1)
+    circuit.measure([0, 1], [0, 1])
+
+    with StandInServer(results="simulate") as server, server.patch_urls():
+        with pytest.raises(C12SimJobError):
+            _backend(Request("token")).resume_jobs()
+
+        job = _backend(Request("token", journal=path)).run(circuit, shots=50)
+        with open(path, encoding="utf-8") as file:
+            assert json.loads(file.readlines()[-1])["job_uuid"] == job.job_id()
+
+        backend = _backend(Request("token", journal=path))
+        resumed = backend.resume_jobs()
+        assert [item.job_id() for item in resumed] == [job.job_id()]
+        assert resumed[0].shots() == 50
+        assert sum(resumed[0].result(wait=0.5).get_counts().values()) == 50
+
+        # Running the same circuit again reattaches to the job
+        assert backend.run(circuit, shots=50).job_id() == job.job_id()
+        assert len(server.jobs) == 1
+
+
+def test_pytket_resume_handles(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    circuit = Circuit(2).H(0).CX(0, 1).measure_all()
+
+    with StandInServer(results="simulate") as server, server.patch_urls():
+        with pytest.raises(CallistoRunningException):
+            CallistoBackend("c12sim-iswap", "token").resume_handles()
+
+        backend = CallistoBackend("c12sim-iswap", "token", journal=path)
+        handles = backend.process_circuits([circuit, circuit], n_shots=20, valid_check=False)
+
+        resumed = CallistoBackend("c12sim-iswap", "token").resume_handles(path)
+        assert resumed == handles
+        result = CallistoBackend("c12sim-iswap", "token").get_result(resumed[1], wait=0.5)
+        assert sum(result.get_counts().values()) == 20
+        assert len(server.jobs) == 2
@@ -0,0 +1,100 @@
+import io
+import json
+import pytest
+from qiskit import QuantumCircuit
+
+from c12_callisto_clients.api.client import Request
+from c12_callisto_clients.api.execution import Executor
+from c12_callisto_clients.api.loadtest import (
+    LoadTest,
+    circuit_qasm,
+    format_summary,
+    job_mix,
+    summarize,
+)
+from c12_callisto_clients.api.stand_in import StandInServer
+
+
+def test_circuit_qasm(tmp_path):
+    ghz = QuantumCircuit.from_qasm_str(circuit_qasm("ghz", 4))
+    assert ghz.num_qubits == 4 and ghz.count_ops()["cx"] == 3
+
+    random_circuit = circuit_qasm("random", 3, seed=1)
+    assert random_circuit == circuit_qasm("random", 3, seed=1)
+    assert QuantumCircuit.from_qasm_str(random_circuit).num_qubits == 3
+
+    path = tmp_path / "circuit.qasm"
+    path.write_text(circuit_qasm("ghz", 2))
+    assert circuit_qasm(str(path), 10) == circuit_qasm("ghz", 2)
+
+    with pytest.raises(ValueError):
+        circuit_qasm("unknown", 2)
+
+
+def test_job_mix_is_seeded():
+    mix = job_mix(20, ["ghz", "random"], [2, 5], [10, 100], ["counts", "counts,statevector"], 3)
+
+    assert [repr(spec) for spec in mix] == [
+        repr(spec)
+        for spec in job_mix(
+            20, ["ghz", "random"], [2, 5], [10, 100], ["counts", "counts,statevector"], 3
+        )
+    ]
+    assert {spec.qubits for spec in mix} == {2, 5}
+    assert [spec.index for spec in mix] == list(range(20))
+
+
+def test_load_test_against_stand_in():
+    specs = job_mix(6, ["ghz", "random"], [2, 4], [100], ["counts", "counts,statevector"], 1)
+    samples = io.StringIO()
+
+    with StandInServer(queue_delay=0.1, seed=1) as server, server.patch_urls():
+        test = LoadTest(Executor(Request("token"), "c12sim-iswap"), rate=20)
+        results = test.run(specs, samples)
+
+    assert [sample["index"] for sample in results] == list(range(6))
+    assert all(sample["status"] == "FINISHED" for sample in results)
+    assert all(sample["submit"] > 0 and sample["download"] > 0 for sample in results)
+    assert sorted(json.loads(line)["index"] for line in samples.getvalue().splitlines()) == list(
+        range(6)
+    )
+    assert results[-1]["scheduled"] - results[0]["scheduled"] == pytest.approx(5 / 20)
+
+    summary = summarize(results)
+    assert summary["jobs"]["statuses"] == {"FINISHED": 6}
+    assert summary["jobs"]["submission_rate"] == pytest.approx(20, rel=0.5)
+    assert summary["submit"]["n"] == 6
+    assert "throughput" in format_summary(summary)
+
+
+def test_summarize_percentiles_and_failures():
+    samples = [
+        {
+            "scheduled": float(index),
+            "lag": 0.0,
+            "status": "FINISHED",
+            "submit": (index + 1) / 100,
+            "queued": None,
+            "total": 0.5,
+        }
+        for index in range(100)
+    ]
+    samples.append({"scheduled": 100.0, "lag": 0.0, "status": None, "submit": None, "total": 0.5})
+
+    summary = summarize(samples)
+
+    assert summary["submit"]["p50"] == pytest.approx(0.505)
+    assert summary["submit"]["max"] == pytest.approx(1.0)
+    assert "queued" not in summary
+    assert summary["jobs"]["statuses"] == {"FINISHED": 100, "FAILED": 1}
+    assert summary["jobs"]["throughput"] == pytest.approx(100 / 100.5)
+
+
+def test_submission_rate_is_measured():
+    # The jobs fall behind the schedule of one job per second, they are submitted every 2 s
+    samples = [
+        {"scheduled": float(index), "lag": float(index), "status": "FINISHED", "total": 0.5}
+        for index in range(11)
+    ]
+
+    assert summarize(samples)["jobs"]["submission_rate"] == pytest.approx(0.5)
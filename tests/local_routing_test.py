@@ -0,0 +1,49 @@
+import numpy as np
+from qiskit import QuantumCircuit
+
+from c12_callisto_clients.qiskit.c12sim_job import C12SimJob
+from c12_callisto_clients.qiskit.c12sim_local import C12SimLocalJob, can_run_locally, simulate
+
+
+def _bell(n_qubits: int = 2) -> QuantumCircuit:
+    circuit = QuantumCircuit(n_qubits, 2)
+    circuit.h(0)
+    circuit.barrier()
+    circuit.cx(0, 1)
+    circuit.measure([0, 1], [0, 1])
+    return circuit
+
+
+def test_small_circuit_runs_locally(qiskit_backend, stand_in_request):
+    job = qiskit_backend.run(_bell(), shots=1000, local_max_qubits=4, seed_simulator=7)
+
+    assert isinstance(job, C12SimLocalJob)
+    assert len(stand_in_request.started) == 0
+
+    result = job.result()
+    counts = result.get_counts()
+    assert set(counts) <= {"00", "11"}
+    assert sum(counts.values()) == 1000
+    assert np.allclose(np.abs(result.get_statevector()) ** 2, [0.5, 0, 0, 0.5])
+    assert np.allclose(job.get_mid_statevector(1).probabilities(), [0.5, 0.5, 0, 0])
+    assert job.get_mid_density_matrix(1) is not None
+
+
+def test_clbit_mapping():
+    circuit = QuantumCircuit(3, 3)
+    circuit.x(2)
+    circuit.measure([0, 1, 2], [2, 0, 1])
+
+    counts, _, _ = simulate(circuit, 10)
+    assert counts == {"010": 10}
+
+
+def test_large_or_unsupported_circuits_run_remotely(qiskit_backend, stand_in_request):
+    job = qiskit_backend.run(_bell(5), shots=100, local_max_qubits=4)
+    assert not isinstance(job, C12SimLocalJob)
+    assert isinstance(job, C12SimJob)
+
+    circuit = QuantumCircuit(2, 2)
+    circuit.measure(0, 0)
+    circuit.x(0)
+    assert not can_run_locally(circuit, 4)
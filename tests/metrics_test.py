@@ -0,0 +1,95 @@
+import logging
+import requests
+
+from c12_callisto_clients.api.client import Request
+from c12_callisto_clients.api.metrics import (
+    InMemoryMetrics,
+    LoggingMetrics,
+    MetricsHook,
+    PrometheusMetrics,
+)
+from c12_callisto_clients.api.retry import CONNECTION_ERROR, RetryPolicy
+
+
+QASM = "rz(0.123456789) q[0];\n" * 2000
+JOB = {"qasm_str": QASM, "num_shots": 10, "result": "counts"}
+
+
+class FailingHook(MetricsHook):
+    def record(self, record):
+        raise RuntimeError("hook failure")
+
+
+def test_requests_are_recorded(caplog, stand_in_server):
+    metrics = InMemoryMetrics()
+    request = Request(
+        "token",
+        compression="gzip",
+        compress_min_bytes=1024,
+        hooks=[FailingHook(), metrics, LoggingMetrics(level=logging.INFO)],
+    )
+
+    stand_in_server.responses["API_JOB_STATUS_URL"] = {"status": "RUNNING"}
+    with caplog.at_level(logging.INFO):
+        request.do_request(stand_in_server.url + "/query", "post", JOB)
+        request.do_request(stand_in_server.url + "/query/status", "get", {"job_uuid": "1"})
+
+    post, get = metrics.records
+    assert (post.endpoint, post.method, post.status) == ("/api/c12sim/query", "post", 200)
+    assert 0 < post.bytes_sent < len(QASM)
+    assert post.bytes_received == stand_in_server.sent[0]
+    assert get.endpoint == "/api/c12sim/query/status" and get.bytes_sent == 0
+    assert post.timings["connect"] is not None and post.timings["tls"] is None
+    assert all(post.timings[phase] is not None for phase in ("wait", "transfer", "decode"))
+    assert post.timings["total"] >= post.timings["wait"] + post.timings["transfer"]
+
+    assert metrics.histogram("/api/c12sim/query", "post").count == 1
+    assert [row["count"] for row in metrics.summary()] == [1, 1]
+    assert "POST /api/c12sim/query status=200" in caplog.text
+    assert "hook failure" in caplog.text
+
+
+def test_failed_requests_and_retries_are_recorded(stand_in_server):
+    metrics = InMemoryMetrics()
+    request = Request(
+        "token",
+        compression="gzip",
+        compress_min_bytes=1024,
+        hooks=[metrics],
+        retry=RetryPolicy(backoff=0),
+    )
+
+    stand_in_server.accept_compressed = False
+    request.do_request(stand_in_server.url + "/query", "post", JOB)
+    stand_in_server.stop()
+    try:
+        request.do_request(stand_in_server.url + "/query", "get")
+    except requests.ConnectionError:
+        pass
+
+    retried, failed = metrics.records
+    assert retried.retries == 1 and retried.status == 200
+    assert failed.status is None and failed.error == "ConnectionError"
+    assert failed.retries == RetryPolicy().budget(CONNECTION_ERROR)
+
+
+def test_prometheus_export(stand_in_server):
+    exporter = PrometheusMetrics()
+    request = Request("token", hooks=[exporter])
+    stand_in_server.responses["API_JOB_STATUS_URL"] = {"status": "RUNNING"}
+
+    request.do_request(stand_in_server.url + "/query/status", "get")
+    request.do_request(stand_in_server.url + "/query/status", "get")
+
+    text = exporter.render()
+    labels = 'endpoint="/api/c12sim/query/status",method="get"'
+    assert f'c12_requests_total{{{labels},status="200"}} 2' in text
+    assert f'c12_request_duration_seconds_bucket{{{labels},phase="total",le="+Inf"}} 2' in text
+    assert f'c12_request_duration_seconds_count{{{labels},phase="total"}} 2' in text
+
+    metrics_server = exporter.serve(port=0)
+    try:
+        host, port = metrics_server.server_address
+        assert requests.get(f"http://{host}:{port}/metrics", timeout=5).text == exporter.render()
+    finally:
+        metrics_server.shutdown()
@@ -0,0 +1,26 @@
+import numpy as np
+from qiskit import QuantumCircuit
+
+
+def test_single_precision_results(qiskit_backend, tmp_path):
+    circuit = QuantumCircuit(2, 2)
+    circuit.h(0)
+    circuit.barrier()
+    circuit.cx(0, 1)
+
+    job = qiskit_backend.run(circuit, shots=10, precision="single", storage_dir=str(tmp_path))
+    data = job.result().data()
+
+    assert data["statevector"].dtype == np.complex64
+    assert data["dm1"].dtype == np.complex64
+    assert np.allclose(job.get_mid_statevector(1).probabilities(), [0.5, 0.5, 0, 0], atol=1e-6)
+
+
+def test_pytket_single_precision(pytket_backend):
+    pytket_backend._dtype = np.complex64
+    job_uuid, _ = pytket_backend._request.start_job("", 10, "counts", "c12sim-iswap")
+    data = pytket_backend._request.get_job_result(job_uuid)
+    result = pytket_backend._convert_result(data)
+
+    assert result.get_state().dtype == np.complex64
+    assert np.allclose(result.get_density_matrix(), np.outer([1, 0, 0, 1], [1, 0, 0, 1]) / 2)
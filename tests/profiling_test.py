@@ -0,0 +1,82 @@
+import os
+import pstats
+from qiskit import QuantumCircuit
+from pytket import Circuit
+
+from c12_callisto_clients.api.profiling import profile_path, profiled
+
+
+def _profiles(directory) -> list:
+    return sorted(os.listdir(directory)) if os.path.isdir(directory) else []
+
+
+def test_profiling_is_off_by_default(qiskit_backend, tmp_path):
+    assert qiskit_backend.profile_dir is None
+
+    circuit = QuantumCircuit(2, 2)
+    circuit.h(0)
+    qiskit_backend.run(circuit, shots=10).result()
+
+    assert _profiles(tmp_path) == []
+
+
+def test_qiskit_run_and_result_profiles(qiskit_backend, tmp_path):
+    qiskit_backend._profile_dir = str(tmp_path)
+    circuit = QuantumCircuit(2, 2)
+    circuit.h(0)
+
+    job = qiskit_backend.run(circuit, shots=10)
+    job.result()
+
+    profiles = _profiles(tmp_path)
+    assert len(profiles) == 2
+    assert any("-run-" + job.job_id() in name for name in profiles)
+    assert any("-result-" + job.job_id() in name for name in profiles)
+
+    stats = pstats.Stats(str(tmp_path / profiles[0]))
+    assert stats.total_calls > 0
+
+
+def test_pytket_profiles(pytket_backend, tmp_path):
+    pytket_backend._profile_dir = str(tmp_path)
+    circuit = Circuit(2).H(0).CX(0, 1)
+
+    handles = pytket_backend.process_circuits([circuit], n_shots=10, valid_check=False)
+    pytket_backend.get_result(handles[0])
+
+    profiles = _profiles(tmp_path)
+    assert len(profiles) == 2
+    assert all(handles[0][0] in name for name in profiles)
+
+
+def test_nested_calls_and_failures(tmp_path):
+    class Profiled:
+        profile_dir = str(tmp_path)
+
+        @profiled("outer", lambda obj, args, kwargs, result: ["outer-id"])
+        def outer(self):
+            return self.inner()
+
+        @profiled("inner", lambda obj, args, kwargs, result: ["inner-id"])
+        def inner(self):
+            return 1
+
+        @profiled("failing", lambda obj, args, kwargs, result: result.missing)
+        def failing(self):
+            raise ValueError("failed")
+
+    assert Profiled().outer() == 1
+    assert [name.split("-", 1)[1] for name in _profiles(tmp_path)] == ["outer-outer-id.prof"]
+
+    try:
+        Profiled().failing()
+    except ValueError:
+        pass
+    assert any(name.endswith("-failing-nojob.prof") for name in _profiles(tmp_path))
+
+
+def test_profile_path_limits_the_job_ids():
+    path = profile_path("profiles", "run", ["a", "b/c", "d", "e", "f"])
+
+    assert os.path.dirname(path) == "profiles"
+    assert path.endswith("-run-a-b_c-d-and2more.prof")
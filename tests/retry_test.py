@@ -0,0 +1,107 @@
+import pytest
+import requests
+
+from c12_callisto_clients.api.client import Request
+from c12_callisto_clients.api.exceptions import ApiError
+from c12_callisto_clients.api.metrics import InMemoryMetrics
+from c12_callisto_clients.api.retry import (
+    CONNECTION_ERROR,
+    RATE_LIMITED,
+    SERVER_ERROR,
+    RetryPolicy,
+    parse_retry_after,
+)
+from c12_callisto_clients.api.stand_in import StandInServer
+
+
+def _request(**kwargs) -> tuple:
+    metrics = InMemoryMetrics()
+    policy = RetryPolicy(backoff=0.01, **kwargs)
+    return Request("token", retry=policy, hooks=[metrics]), metrics
+
+
+def test_policy_backoff_and_budgets():
+    policy = RetryPolicy(
+        rate_limited=1, server_errors=2, connection_errors=0, backoff=1, max_backoff=3, jitter=0
+    )
+
+    assert policy.classify(429) == RATE_LIMITED
+    assert policy.classify(503) == SERVER_ERROR
+    assert policy.classify(404) is None and policy.classify(501) is None
+
+    assert [policy.delay(SERVER_ERROR, attempt) for attempt in range(3)] == [1, 2, None]
+    assert policy.delay(CONNECTION_ERROR, 0) is None
+    assert policy.delay(RATE_LIMITED, 0, retry_after="2") == 2
+    assert policy.delay(RATE_LIMITED, 0, retry_after="120") is None
+    assert policy.delay(RATE_LIMITED, 1, retry_after="2") is None
+    assert RetryPolicy(backoff=10, max_backoff=3, jitter=0).delay(SERVER_ERROR, 2) == 3
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3
+    assert parse_retry_after("-1") == 0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:10 GMT", now=1445412480) == 10
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_transient_failures_are_retried(stand_in_server):
+    request, metrics = _request()
+    stand_in_server.faults = [(429, "0.01"), 502, "reset", 503]
+    stand_in_server.responses["API_QUERY_URL"] = {"status": "RUNNING"}
+
+    assert request.do_request(stand_in_server.url + "/query", "get") == {"status": "RUNNING"}
+
+    (record,) = metrics.records
+    assert record.retries == 4 and record.status == 200 and record.error is None
+    assert len(stand_in_server.received) == 5
+
+
+def test_retries_are_limited_by_kind():
+    request, metrics = _request(server_errors=1)
+
+    with StandInServer(faults=[(429, "0"), 500, 500]) as server:
+        with pytest.raises(ApiError):
+            request.do_request(server.url + "/query", "get")
+
+    assert metrics.records[0].status == 500 and metrics.records[0].retries == 2
+
+    request, _ = _request(connection_errors=1)
+    with StandInServer(faults=["reset", "reset"]) as server:
+        with pytest.raises(requests.ConnectionError):
+            request.do_request(server.url + "/query", "get")
+
+
+def test_client_errors_are_not_retried(stand_in_server):
+    request, _ = _request()
+    stand_in_server.faults = [404, 404]
+
+    with pytest.raises(ApiError):
+        request.do_request(stand_in_server.url + "/query", "get")
+
+    assert len(stand_in_server.received) == 1
+
+
+def test_retried_submission_does_not_duplicate_the_job(stand_in_server):
+    request, _ = _request()
+    # The first submission is created but its response is lost
+    stand_in_server.faults = ["reset", 503]
+
+    job_uuid, transpiled = request.start_job("qasm", 10, "counts", "c12sim-iswap")
+    assert transpiled == "qasm" and stand_in_server.find_job(job_uuid) is not None
+    request.start_job("qasm", 10, "counts", "c12sim-iswap")
+
+    keys = [item["key"] for item in stand_in_server.received]
+    assert len(keys) == 4 and keys[0] == keys[1] == keys[2] != keys[3]
+    assert len(stand_in_server.jobs) == 2
+
+
+def test_job_result_survives_failed_polls(stand_in_server):
+    request, _ = _request()
+    statuses = []
+    job_uuid, _ = request.start_job("qasm", 10, "counts", "c12sim-iswap")
+    stand_in_server.faults = [502, "reset"]
+
+    data = request.get_job_result(job_uuid, on_status=statuses.append)
+
+    assert data["status"] == "FINISHED" and statuses == ["FINISHED"]
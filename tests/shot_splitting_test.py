@@ -0,0 +1,149 @@
+import threading
+import time
+
+import pytest
+from qiskit import QuantumCircuit
+from pytket import Circuit
+
+from c12_callisto_clients.api.results import split_shots, merge_counts
+from c12_callisto_clients.qiskit.c12sim_job import C12SimSplitJob
+from c12_callisto_clients.qiskit.exceptions import C12SimJobError
+
+
+def test_split_shots_is_balanced():
+    assert split_shots(10, 4) == [4, 3, 3]
+    assert split_shots(8, 4) == [4, 4]
+    assert split_shots(3, 10) == [3]
+    assert sum(split_shots(1_000_003, 100_000)) == 1_000_003
+
+
+def test_merge_counts():
+    assert merge_counts([{"00": 1, "11": 2}, {"11": 3, "01": 1}]) == {"00": 1, "11": 5, "01": 1}
+
+
+def test_qiskit_run_splits_shots(qiskit_backend, stand_in_request):
+    circuit = QuantumCircuit(2, 2)
+    circuit.h(0)
+    circuit.cx(0, 1)
+    circuit.measure([0, 1], [0, 1])
+
+    job = qiskit_backend.run(circuit, shots=1001, max_shots_per_job=250)
+
+    assert isinstance(job, C12SimSplitJob)
+    assert sorted(stand_in_request.started[j.job_id()]["shots"] for j in job.jobs) == [
+        200,
+        200,
+        200,
+        200,
+        201,
+    ]
+
+    # Only the first chunk returns the states
+    outputs = [stand_in_request.started[j.job_id()]["result"] for j in job.jobs]
+    assert outputs == ["counts,statevector"] + ["counts"] * 4
+
+    result = job.result()
+    assert sum(result.get_counts().values()) == 1001
+    assert result.get_statevector() is not None
+    assert result.results[0].shots == 1001
+    assert [chunk["shots"] for chunk in result.results[0].chunks] == [201, 200, 200, 200, 200]
+
+
+def test_pytket_process_circuits_splits_shots(pytket_backend, stand_in_request):
+    circuit = Circuit(2).H(0).CX(0, 1).measure_all()
+
+    handles = pytket_backend.process_circuits(
+        [circuit], n_shots=1000, valid_check=False, max_shots_per_job=300
+    )
+
+    assert len(handles) == 1
+    assert len(stand_in_request.started) == 4
+
+    get_job_result = stand_in_request.get_job_result
+    requested = []
+
+    def recording_get_job_result(job_uuid, output_data=None, *args, **kwargs):
+        requested.append(output_data)
+        return get_job_result(job_uuid, output_data, *args, **kwargs)
+
+    stand_in_request.get_job_result = recording_get_job_result
+
+    result = pytket_backend.get_result(handles[0])
+    assert sum(result.get_counts().values()) == 1000
+    assert result.get_state() is not None
+    # Only the states of the first chunk are downloaded
+    assert requested == ["counts,statevector,density_matrix"] + ["counts"] * 3
+
+
+def _bell():
+    circuit = QuantumCircuit(2, 2)
+    circuit.h(0)
+    circuit.cx(0, 1)
+    circuit.measure([0, 1], [0, 1])
+    return circuit
+
+
+def test_split_jobs_in_flight_within_maxjobs(qiskit_backend, stand_in_request):
+    lock = threading.Lock()
+    running = set()
+    peak = []
+    start_job = stand_in_request.start_job
+
+    def counting_start_job(*args, **kwargs):
+        job_uuid, qasm = start_job(*args, **kwargs)
+        with lock:
+            running.add(job_uuid)
+            peak.append(len(running))
+        return job_uuid, qasm
+
+    def get_job_status(job_uuid):
+        # Each job finishes once its status is queried
+        with lock:
+            running.discard(job_uuid)
+        return "finished"
+
+    stand_in_request.start_job = counting_start_job
+    stand_in_request.get_job_status = get_job_status
+
+    job = qiskit_backend.run(_bell(), shots=1000, max_shots_per_job=100)
+
+    assert len(job.jobs) == 10
+    assert max(peak) <= stand_in_request.get_maxjobs()
+    assert sum(job.result().get_counts().values()) == 1000
+
+
+def test_split_job_timeout_is_shared(qiskit_backend, stand_in_request):
+    timeouts = []
+
+    def get_job_result(job_uuid, output_data=None, timeout=None, wait=5, **kwargs):
+        # Each chunk finishes after 0.3 s
+        timeouts.append(timeout)
+        if timeout is not None and timeout < 0.3:
+            time.sleep(timeout)
+            raise TimeoutError(f"Timeout while waiting for job {job_uuid}")
+        time.sleep(0.3)
+        return {"status": "FINISHED", "results": None, "errors": ""}
+
+    job = qiskit_backend.run(_bell(), shots=400, max_shots_per_job=100)
+    stand_in_request.get_job_result = get_job_result
+
+    start = time.monotonic()
+    with pytest.raises(C12SimJobError):
+        job.result(timeout=0.5)
+    assert time.monotonic() - start < 1
+    assert len(timeouts) == 2 and timeouts[1] < 0.3
+
+
+def test_split_job_stops_at_failed_chunk(qiskit_backend, stand_in_request):
+    calls = []
+
+    def get_job_result(job_uuid, *args, **kwargs):
+        calls.append(job_uuid)
+        return {"status": "ERROR", "results": None, "errors": "failed"}
+
+    job = qiskit_backend.run(_bell(), shots=400, max_shots_per_job=100)
+    stand_in_request.get_job_result = get_job_result
+
+    with pytest.raises(C12SimJobError):
+        job.result(timeout=5)
+    assert calls == [job.jobs[0].job_id()]
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+from pytket import Circuit
+from qiskit import QuantumCircuit
+
+from c12_callisto_clients.api.results import decode_array
+from c12_callisto_clients.api.sparse import SparseState
+
+
+SPARSE_PAYLOAD = {
+    "dim": 8,
+    "indices": [7, 0],
+    "values": ["(0.7071067811865475+0j)", "(0.7071067811865475+0j)"],
+}
+
+
+def test_sparse_from_json():
+    dense = ["0j"] * 8
+    dense[0] = dense[7] = "(0.7071067811865475+0j)"
+
+    from_dense = SparseState.from_json(dense)
+    from_sparse = SparseState.from_json(SPARSE_PAYLOAD)
+
+    assert from_dense.nnz == 2 and from_dense.num_qubits == 3
+    assert np.array_equal(from_sparse.indices, [0, 7])
+    assert np.allclose(from_sparse.to_dense(), decode_array(dense))
+    assert np.allclose(decode_array(SPARSE_PAYLOAD), decode_array(dense))
+    assert SparseState.from_json(from_sparse.to_json()).nnz == 2
+    assert len(from_sparse) == 8 and from_sparse[7] == from_sparse[-1] != 0 and from_sparse[3] == 0
+
+
+def test_sparse_operations():
+    ghz = SparseState.from_json(SPARSE_PAYLOAD)
+    plus = SparseState.from_dense(np.full(8, 1 / np.sqrt(8)))
+
+    assert ghz.probabilities_dict(decimals=6) == {"000": 0.5, "111": 0.5}
+    assert ghz.marginal([0]) == pytest.approx({"0": 0.5, "1": 0.5})
+    assert np.isclose(ghz.marginal([0, 2])["11"], 0.5)
+    assert np.isclose(ghz.fidelity(ghz), 1)
+    assert np.isclose(ghz.inner(plus), ghz.inner(plus.to_dense()))
+    assert np.isclose(ghz.fidelity(plus), 0.25)
+
+
+def test_sparse_backend_results(qiskit_backend):
+    circuit = QuantumCircuit(2, 2)
+    circuit.h(0)
+    circuit.barrier()
+    circuit.cx(0, 1)
+
+    for local_max_qubits in (0, 2):
+        job = qiskit_backend.run(circuit, shots=10, sparse=True, local_max_qubits=local_max_qubits)
+        data = job.result().data()
+
+        # The state is kept sparse until the dense statevector is requested
+        assert isinstance(data["statevector"], SparseState)
+        assert np.allclose(job.result().get_statevector(), data["statevector"].to_dense())
+        assert job.get_sparse_statevector().nnz == 2
+        assert job.get_sparse_statevector(1).probabilities_dict() == pytest.approx(
+            {"00": 0.5, "01": 0.5}
+        )
+        assert np.allclose(job.get_mid_statevector(1).probabilities(), [0.5, 0.5, 0, 0])
+
+
+def test_pytket_sparse_state(pytket_backend):
+    pytket_backend._sparse = True
+    circuit = Circuit(2).H(0).CX(0, 1).measure_all()
+    handle = pytket_backend.process_circuits([circuit], n_shots=10, valid_check=False)[0]
+
+    assert sum(pytket_backend.get_result(handle).get_counts().values()) == 10
+    state = pytket_backend.get_sparse_state(handle)
+    assert state.probabilities_dict(decimals=6) == {"00": 0.5, "11": 0.5}
+    assert np.allclose(pytket_backend.get_result(handle).get_state(), state.to_dense())
@@ -0,0 +1,122 @@
+import numpy as np
+import pytest
+from qiskit import QuantumCircuit
+
+from c12_callisto_clients.api import client, configs
+from c12_callisto_clients.api.client import Request
+from c12_callisto_clients.api.exceptions import ApiError
+from c12_callisto_clients.api.retry import RetryPolicy
+from c12_callisto_clients.api.stand_in import StandInServer
+from c12_callisto_clients.api.sparse import SparseState
+from c12_callisto_clients.qiskit.c12sim_backend import C12SimBackend
+
+
+QASM = """OPENQASM 2.0;
+include "qelib1.inc";
+qreg q[3];
+creg c[3];
+h q[0];
+barrier q[0],q[1],q[2];
+cx q[0],q[1];
+measure q -> c;
+"""
+
+
+def test_patch_urls():
+    with StandInServer() as server:
+        with server.patch_urls():
+            assert client.API_QUERY_URL == server.url + "/query"
+            assert configs.API_HEALTH_URL.endswith(f":{server.environ['C12_PORT']}/api/health")
+        assert (
+            client.API_QUERY_URL
+            == configs.api_urls(configs.PROTOCOL, configs.HOST_URL, configs.PORT)["API_QUERY_URL"]
+        )
+
+
+def test_metadata_endpoints():
+    with StandInServer(max_jobs=3) as server, server.patch_urls():
+        request = Request("token")
+
+        assert request.get_maxjobs() == 3
+        assert request.get_backends()[0]["backend_name"] == "c12sim-iswap"
+        assert "t1" in request.get_params()
+        assert server.calls["GET /api/c12sim/maxjobs"] == 1
+
+
+def test_job_lifecycle_with_synthetic_results():
+    with StandInServer(queue_delay=0.3, run_delay=0.3, seed=1) as server, server.patch_urls():
+        request = Request("token", coalesce_ttl=0)
+        job_uuid, transpiled = request.start_job(QASM, 100, "counts,statevector,states", "")
+
+        assert transpiled == QASM
+        assert request.get_job_status(job_uuid) == "QUEUED"
+
+        statuses = []
+        data = request.get_job_result(job_uuid, wait=0.5, timeout=5, on_status=statuses.append)
+        assert statuses[-1] == "FINISHED" and len(statuses) >= 2
+        assert sum(data["results"]["counts"].values()) == 100
+        assert len(data["results"]["statevector"]) == 8
+        assert set(data["results"]["states"]["density_matrix"]) == {"dm1"}
+
+        counts_only = request.get_job_result(job_uuid, output_data="counts")
+        assert set(counts_only["results"]) == {"counts"}
+
+        job = request.get_job(job_uuid)
+        assert job["status"] == "finished" and job["options"]["shots"] == 100
+        assert request.get_user_jobs(10, 0)[0]["uuid"] == job_uuid
+
+
+def test_sparse_payloads_of_given_size():
+    with StandInServer(qubits=12, sparse=True) as server, server.patch_urls():
+        request = Request("token")
+        job_uuid, _ = request.start_job(QASM, 10, "counts,statevector", "")
+        data = request.get_job_result(job_uuid)
+
+        state = SparseState.from_json(data["results"]["statevector"])
+        assert state.num_qubits == 12
+        assert np.isclose(state.probabilities().sum(), 1)
+
+
+def test_faults_and_failures():
+    with StandInServer(faults=[503], token="secret") as server, server.patch_urls():
+        retrying = Request("secret", retry=RetryPolicy(backoff=0))
+        assert retrying.get_maxjobs() == 10
+
+        with pytest.raises(PermissionError):
+            Request("wrong").get_maxjobs()
+        with pytest.raises(ApiError):
+            retrying.get_job_status("missing")
+
+    with StandInServer(job_failure_rate=1) as server, server.patch_urls():
+        request = Request("token")
+        job_uuid, _ = request.start_job(QASM, 10, "counts", "")
+        data = request.get_job_result(job_uuid)
+        assert data["status"] == "ERROR" and data["errors"]
+
+
+def test_idempotent_submissions():
+    with StandInServer() as server, server.patch_urls():
+        request = Request("token")
+        first, _ = request.start_job(QASM, 10, "counts", "", idempotency_key="key")
+        second, _ = request.start_job(QASM, 10, "counts", "", idempotency_key="key")
+
+        assert first == second and len(server.jobs) == 1
+
+
+def test_simulated_results_with_qiskit_backend():
+    with StandInServer(results="simulate") as server, server.patch_urls():
+        request = Request("token")
+        properties = request.get_backends()[0]
+        backend = C12SimBackend(
+            request=request, name=properties["backend_name"], properties=properties
+        )
+
+        circuit = QuantumCircuit(2, 2)
+        circuit.h(0)
+        circuit.cx(0, 1)
+        circuit.measure([0, 1], [0, 1])
+        job = backend.run(circuit, shots=200)
+
+        result = job.result(wait=0.5)
+        assert set(result.get_counts()) == {"00", "11"}
+        assert np.allclose(np.abs(result.data()["statevector"]) ** 2, [0.5, 0, 0, 0.5])
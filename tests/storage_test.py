@@ -0,0 +1,47 @@
+import os
+import numpy as np
+from qiskit import QuantumCircuit
+
+from c12_callisto_clients.api.storage import ArrayStore
+
+
+def test_array_store_roundtrip(tmp_path):
+    store = ArrayStore(str(tmp_path / "job"))
+    stored = store.save("sv1", np.arange(4, dtype=np.complex128))
+
+    assert isinstance(stored, np.memmap)
+    assert np.array_equal(stored, np.arange(4))
+    assert store.names() == ["sv1"]
+    assert store.load("missing") is None
+
+    store.remove()
+    assert not os.path.exists(store.directory)
+
+
+def test_job_results_are_memory_mapped(qiskit_backend, tmp_path):
+    circuit = QuantumCircuit(2, 2)
+    circuit.h(0)
+    circuit.barrier()
+    circuit.cx(0, 1)
+    circuit.measure([0, 1], [0, 1])
+
+    job = qiskit_backend.run(circuit, shots=10, storage_dir=str(tmp_path))
+    result = job.result()
+
+    assert isinstance(result.data()["statevector"], np.memmap)
+    assert sorted(job.storage.names()) == ["dm1", "statevector", "sv1"]
+    assert os.path.dirname(job.storage.directory) == str(tmp_path)
+
+    statevector = job.get_mid_statevector(1)
+    assert np.allclose(statevector.probabilities(), [0.5, 0.5, 0, 0])
+    assert isinstance(job.get_mid_density_matrix(1).data.base, np.memmap)
+
+
+    # Only the memory-mapped arrays are kept, not the json data of the amplitudes
+    assert isinstance(job._result_data["statevector"], np.memmap)
+    assert all(
+        isinstance(value, np.memmap)
+        for states in job._result_data["states"].values()
+        for value in states.values()
+    )
+    assert "density_matrix" not in job._result_data
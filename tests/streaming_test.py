@@ -0,0 +1,111 @@
+import json
+import numpy as np
+import pytest
+from pytket import Circuit
+from qiskit import QuantumCircuit
+
+from c12_callisto_clients.api.client import Request
+from c12_callisto_clients.api.exceptions import ApiError
+from c12_callisto_clients.api.results import decode_array, decode_matrix
+from c12_callisto_clients.api.storage import ArrayStore
+from c12_callisto_clients.api.streaming import StreamingDecoder
+
+
+def _chunks(body: bytes, size: int):
+    return [body[i : i + size] for i in range(0, len(body), size)]
+
+
+def _payload(n_qubits: int = 3) -> dict:
+    rng = np.random.default_rng(7)
+    dim = 2**n_qubits
+    statevector = [str(complex(x, -y)) for x, y in rng.random((dim, 2))]
+    density_matrix = [[str(complex(x)) for x in row] for row in rng.random((dim, dim))]
+    return {
+        "status": "FINISHED",
+        "errors": None,
+        "results": {
+            "counts": {"000": 7, "111": 3},
+            "statevector": statevector,
+            "density_matrix": density_matrix,
+            "states": {
+                "statevector": {"sv1": statevector},
+                "density_matrix": {"dm1": density_matrix},
+            },
+        },
+        "other": [1, 2.5, 'quoted "é"', True, None, {}, []],
+    }
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 4096])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_streaming_decoder_matches_json(chunk_size, indent):
+    payload = _payload()
+    body = json.dumps(payload, indent=indent).encode()
+
+    data = StreamingDecoder().decode(_chunks(body, chunk_size))
+    results = data["results"]
+
+    assert data["status"] == "FINISHED" and data["errors"] is None
+    assert data["other"] == payload["other"]
+    assert results["counts"] == payload["results"]["counts"]
+    assert np.array_equal(results["statevector"], decode_array(payload["results"]["statevector"]))
+    assert np.array_equal(
+        results["states"]["density_matrix"]["dm1"],
+        decode_matrix(payload["results"]["density_matrix"]),
+    )
+
+
+def test_streaming_decoder_into_store(tmp_path):
+    store = ArrayStore(str(tmp_path))
+    body = json.dumps(_payload()).encode()
+
+    data = StreamingDecoder(np.complex64, allocate=store.allocate).decode(_chunks(body, 100))
+
+    assert isinstance(data["results"]["states"]["density_matrix"]["dm1"], np.memmap)
+    assert data["results"]["statevector"].dtype == np.complex64
+    assert {"statevector", "density_matrix", "sv1", "dm1"} <= set(store.names())
+
+
+@pytest.mark.parametrize(
+    "body", [b'{"results": {"statevector": ["(1+0j)", ', b'{"a": 1 "b": 2}', b'{"dm": [1,]']
+)
+def test_streaming_decoder_malformed(body):
+    with pytest.raises(ApiError):
+        StreamingDecoder().decode(_chunks(body, 3))
+
+
+def test_request_streams_job(stand_in_server):
+    stand_in_server.responses["API_GET_JOB"] = {
+        "job": {"uuid": "1", "result": _payload()["results"]}
+    }
+
+    job = Request("token").get_job("1", decoder=StreamingDecoder())
+
+    assert job["result"]["statevector"].shape == (8,)
+    assert job["result"]["density_matrix"].shape == (8, 8)
+
+
+def test_streamed_backend_results(qiskit_backend, tmp_path):
+    circuit = QuantumCircuit(2, 2)
+    circuit.h(0)
+    circuit.barrier()
+    circuit.cx(0, 1)
+
+    expected = qiskit_backend.run(circuit, shots=10).result().data()
+    for options in ({}, {"storage_dir": str(tmp_path), "precision": "single"}):
+        job = qiskit_backend.run(circuit, shots=10, stream=True, **options)
+        data = job.result().data()
+
+        assert data["counts"] == expected["counts"]
+        assert np.allclose(data["statevector"], expected["statevector"])
+        assert np.allclose(data["dm1"], expected["dm1"])
+
+
+def test_pytket_streamed_results(pytket_backend):
+    pytket_backend._stream = True
+    circuit = Circuit(2).H(0).CX(0, 1).measure_all()
+    handle = pytket_backend.process_circuits([circuit], n_shots=10, valid_check=False)[0]
+
+    result = pytket_backend.get_result(handle)
+    assert sum(result.get_counts().values()) == 10
+    assert np.allclose(np.abs(result.get_state()) ** 2, [0.5, 0, 0, 0.5])
@@ -0,0 +1,121 @@
+import threading
+import numpy as np
+import pytest
+from qiskit import QuantumCircuit
+from qiskit.circuit import Parameter, ParameterVector
+
+from c12_callisto_clients.api.exceptions import ApiError, SubmissionError
+from c12_callisto_clients.qiskit.exceptions import C12SimJobError
+
+
+def _circuit():
+    theta = Parameter("theta")
+    phi = ParameterVector("phi", 2)
+    circuit = QuantumCircuit(2, 2)
+    circuit.rx(theta, 0)
+    circuit.ry(2 * phi[0] + phi[1], 1)
+    circuit.rz(theta * phi[1] - 1, 0)
+    circuit.cx(0, 1)
+    circuit.measure([0, 1], [0, 1])
+    return circuit
+
+
+def test_template_matches_bound_circuit(qiskit_backend):
+    circuit = _circuit()
+    template = qiskit_backend.prepare_sweep(circuit)
+    assert template is not None
+
+    values = [0.3, -1.25, 2e-5]
+    qasm = template.bind(values)
+    expected = circuit.assign_parameters(dict(zip(template.parameters, values)))
+
+    parsed = QuantumCircuit.from_qasm_str(qasm)
+    for inst, exp_inst in zip(parsed.data, expected.data):
+        assert inst.operation.name == exp_inst.operation.name
+        assert np.allclose([float(p) for p in inst.operation.params], exp_inst.operation.params)
+
+
+def test_run_sweep_submits_each_point(qiskit_backend, stand_in_request):
+    circuit = _circuit()
+    values = np.linspace(0, 1, 30).reshape(10, 3)
+
+    sweep = qiskit_backend.run_sweep(circuit, values, shots=100, max_workers=4)
+
+    assert len(sweep) == 10
+    assert sweep.shape == (10, 3)
+    assert len(stand_in_request.started) == 10
+    for job in sweep.jobs:
+        assert stand_in_request.started[job.job_id()]["shots"] == 100
+
+
+def test_sweep_jobs_in_flight_within_maxjobs(qiskit_backend, stand_in_request):
+    lock = threading.Lock()
+    running = set()
+    peak = []
+    start_job = stand_in_request.start_job
+
+    def counting_start_job(*args, **kwargs):
+        job_uuid, qasm = start_job(*args, **kwargs)
+        with lock:
+            running.add(job_uuid)
+            peak.append(len(running))
+        return job_uuid, qasm
+
+    def get_job_status(job_uuid):
+        # Each job finishes once its status is queried
+        with lock:
+            running.discard(job_uuid)
+        return "finished"
+
+    stand_in_request.start_job = counting_start_job
+    stand_in_request.get_job_status = get_job_status
+
+    sweep = qiskit_backend.run_sweep(_circuit(), np.zeros((10, 3)), shots=10, max_workers=8)
+
+    assert len(sweep) == 10 and len(stand_in_request.started) == 10
+    assert max(peak) <= stand_in_request.get_maxjobs()
+
+
+def test_failed_sweep_keeps_the_started_jobs(qiskit_backend, stand_in_request):
+    start_job = stand_in_request.start_job
+    calls = []
+
+    def failing_start_job(*args, **kwargs):
+        calls.append(1)
+        if len(calls) == 3:
+            raise ApiError("Unexpected error when starting a job")
+        return start_job(*args, **kwargs)
+
+    stand_in_request.start_job = failing_start_job
+
+    with pytest.raises(C12SimJobError) as err:
+        qiskit_backend.run_sweep(_circuit(), np.zeros((4, 3)), shots=10, max_workers=1)
+
+    error = err.value.__cause__
+    assert isinstance(error, SubmissionError)
+    assert [item is None for item in error.started] == [False, False, True, True]
+    assert {job_uuid for job_uuid, _ in error.started[:2]} == set(stand_in_request.started)
+
+
+def test_run_sweep_wrong_shape(qiskit_backend):
+    with pytest.raises(ValueError):
+        qiskit_backend.run_sweep(_circuit(), np.zeros((4, 2)))
+
+
+def test_composite_gate_is_bound_per_point(qiskit_backend, stand_in_request):
+    from qiskit.circuit.library import PauliEvolutionGate
+    from qiskit.quantum_info import SparsePauliOp
+
+    theta = Parameter("theta")
+    circuit = QuantumCircuit(2, 2)
+    circuit.append(PauliEvolutionGate(SparsePauliOp("XY"), theta), [0, 1])
+    circuit.rx(theta, 0)
+    circuit.measure([0, 1], [0, 1])
+
+    # The definition of the gate depends on the parameter, so no template is made
+    assert qiskit_backend.prepare_sweep(circuit) is None
+
+    sweep = qiskit_backend.run_sweep(circuit, [[0.3], [0.5]], shots=10)
+    for job, value in zip(sweep.jobs, (0.3, 0.5)):
+        expected = qiskit_backend._prepare_qasm_file(circuit.assign_parameters([value]))
+        assert stand_in_request.started[job.job_id()]["qasm_str"] == expected
@@ -0,0 +1,49 @@
+import time
+import pytest
+import requests
+
+from c12_callisto_clients.api.client import Request
+from c12_callisto_clients.api.configs import TIMEOUTS
+from c12_callisto_clients.pytket.extensions.callisto.backends.callisto import CallistoBackend
+from c12_callisto_clients.qiskit.c12sim_provider import C12SimProvider
+from c12_callisto_clients.user_configs import UserConfigs
+
+
+def test_timeouts_per_category():
+    request = Request("token", timeouts={"status": 1, "result": (2, 600)})
+
+    assert request.timeouts["status"] == (1.0, 1.0)
+    assert request.timeouts["result"] == (2.0, 600.0)
+    assert request.timeouts["submit"] == TIMEOUTS["submit"]
+
+    faster = request.with_timeouts({"status": (0.5, 0.5)})
+    assert faster.timeouts["status"] == (0.5, 0.5) and request.timeouts["status"] == (1.0, 1.0)
+    assert faster.breaker is request.breaker and faster.hooks is request.hooks
+
+    with pytest.raises(ValueError):
+        Request("token", timeouts={"download": 10})
+    with pytest.raises(ValueError):
+        Request("token", timeouts={"status": (1, 0)})
+
+
+def test_timeouts_from_the_user_configs_and_backends():
+    provider = C12SimProvider(UserConfigs(token="token", timeouts={"status": [1, 2]}))
+    assert provider._request.timeouts["status"] == (1.0, 2.0)
+
+    backend = CallistoBackend("c12sim-iswap", "token", timeouts={"submit": 30})
+    assert backend._request.timeouts["submit"] == (30.0, 30.0)
+
+
+def test_hung_status_check_times_out(stand_in_server):
+    request = Request("token", timeouts={"status": (1, 0.1)})
+    stand_in_server.run_delay = 60
+    job_uuid, _ = request.start_job("qasm", 10, "counts", "c12sim-iswap")
+    stand_in_server.latency = 0.5
+
+    start = time.time()
+    with pytest.raises(requests.Timeout):
+        request.get_job_status(job_uuid)
+    assert time.time() - start < 0.5
+
+    # The timeout can be overridden per call
+    assert request.get_job_status(job_uuid, request_timeout=(1, 2)) == "RUNNING"
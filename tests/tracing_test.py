@@ -0,0 +1,98 @@
+import numpy as np
+from qiskit import QuantumCircuit
+from qiskit.circuit import Parameter
+from pytket import Circuit
+
+from c12_callisto_clients.api.tracing import Timeline
+
+
+def _bell(n_qubits: int = 2) -> QuantumCircuit:
+    circuit = QuantumCircuit(n_qubits, n_qubits)
+    circuit.h(0)
+    circuit.cx(0, 1)
+    circuit.measure(range(n_qubits), range(n_qubits))
+    return circuit
+
+
+def test_status_transitions():
+    timeline = Timeline()
+    timeline.observe_status("QUEUED", job_id="a", at=10.0)
+    timeline.observe_status("QUEUED", job_id="a", at=12.0)
+    timeline.observe_status("RUNNING", job_id="a", at=13.0)
+    timeline.observe_status("FINISHED", job_id="a", at=15.0)
+    timeline.observe_status("FINISHED", job_id="a", at=20.0)
+
+    assert [(span.name, span.start, span.end) for span in timeline.spans] == [
+        ("queued", 10.0, 13.0),
+        ("running", 13.0, 15.0),
+    ]
+    assert timeline.durations() == {"queued": 3.0, "running": 2.0}
+
+
+def test_overlapping_spans_are_counted_once():
+    timeline = Timeline()
+    timeline.add("running", 0.0, 4.0, job_id="a")
+    timeline.add("running", 1.0, 3.0, job_id="b")
+    timeline.add("running", 6.0, 7.0, job_id="c")
+    timeline.add("decode", 7.0)
+
+    assert timeline.durations() == {"running": 5.0}
+    assert timeline.to_list()[-1] == {
+        "name": "decode",
+        "start": 7.0,
+        "end": None,
+        "duration": None,
+    }
+
+
+def test_failed_span_records_the_error():
+    timeline = Timeline()
+    try:
+        with timeline.span("submit"):
+            raise ValueError("refused")
+    except ValueError:
+        pass
+
+    (span,) = timeline.spans
+    assert span.attributes["error"] == "ValueError" and span.end is not None
+
+
+def test_qiskit_job_timings(qiskit_backend):
+    job = qiskit_backend.run(_bell(), shots=100)
+    job.result()
+
+    phases = [span.name for span in job.timings.spans]
+    assert phases[:2] == ["prepare", "submit"]
+    assert {"queued", "running", "download", "decode"} <= set(phases)
+    assert all(span.end is not None for span in job.timings.spans)
+    assert job.timings.spans[1].attributes["job_id"] == job.job_id()
+
+
+def test_split_and_sweep_jobs_share_the_timeline(qiskit_backend):
+    job = qiskit_backend.run(_bell(), shots=1000, max_shots_per_job=250)
+    job.result()
+    assert all(chunk.timings is job.timings for chunk in job.jobs)
+    queued = {span.attributes["job_id"] for span in job.timings.spans if span.name == "queued"}
+    assert queued == {chunk.job_id() for chunk in job.jobs}
+
+    theta = Parameter("theta")
+    circuit = QuantumCircuit(1, 1)
+    circuit.rx(theta, 0)
+    circuit.measure(0, 0)
+    sweep = qiskit_backend.run_sweep(circuit, np.linspace(0, 1, 4).reshape(4, 1), shots=10)
+    assert [span.name for span in sweep.timings.spans][:2] == ["prepare", "submit"]
+
+
+def test_local_job_timings(qiskit_backend):
+    job = qiskit_backend.run(_bell(), shots=100, local_max_qubits=4)
+
+    assert [span.name for span in job.timings.spans] == ["simulate"]
+
+
+def test_pytket_timings(pytket_backend):
+    circuit = Circuit(2).H(0).CX(0, 1).measure_all()
+    handle = pytket_backend.process_circuit(circuit, n_shots=100, valid_check=False)
+    pytket_backend.get_result(handle)
+
+    phases = [span.name for span in pytket_backend.get_timings(handle).spans]
+    assert phases == ["prepare", "submit", "queued", "running", "decode"]